@@ -0,0 +1,205 @@
+"""
+Módulo de pool de páginas do browser.
+
+Este módulo mantém um Chromium headless aquecido entre verificações, com
+páginas pré-abertas que são alugadas e devolvidas a cada uso.
+"""
+import logging
+import shutil
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Optional
+
+from playwright.sync_api import (
+    sync_playwright,
+    Playwright,
+    BrowserContext,
+    Page,
+)
+
+# Configuração de logging
+logger = logging.getLogger(__name__)
+
+# Constantes
+DEFAULT_POOL_SIZE = 2  # Páginas pré-abertas mantidas no pool
+DEFAULT_RECYCLE_AFTER_USES = 50  # Relança o browser após N aluguéis
+PROFILE_MARKER = ".created"
+PROFILE_MAX_AGE_SECONDS = 7 * 24 * 3600  # Perfil recriado semanalmente
+BROWSER_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-features=MojoVideoCapture,SurfaceSynchronization",
+]
+
+
+class BrowserPool:
+    """
+    Pool de páginas sobre um contexto persistente do Chromium.
+    
+    O contexto é criado com launch_persistent_context sobre um perfil em
+    disco, de modo que o cache HTTP e os cookies sobrevivem entre
+    verificações. Páginas são alugadas com rent() e devolvidas com
+    release(); a cada recycle_after_uses aluguéis o browser é relançado
+    para limitar o consumo de memória.
+    
+    A API síncrona do Playwright só pode ser usada pela thread que a
+    iniciou: todos os métodos devem ser chamados a partir da mesma thread.
+    """
+    
+    def __init__(
+        self,
+        profile_dir: Path,
+        size: int = DEFAULT_POOL_SIZE,
+        recycle_after_uses: int = DEFAULT_RECYCLE_AFTER_USES,
+        context_setup: Optional[Callable[[BrowserContext], None]] = None
+    ):
+        """
+        Inicializa o pool (o browser só é iniciado no primeiro aluguel).
+        
+        Args:
+            profile_dir: Diretório do perfil persistente do Chromium.
+            size: Número máximo de páginas ociosas mantidas abertas.
+            recycle_after_uses: Aluguéis antes de relançar o browser.
+            context_setup: Função chamada uma vez para cada contexto criado
+                          (rotas, scripts de inicialização, etc.).
+        """
+        self.profile_dir = profile_dir
+        self.size = size
+        self.recycle_after_uses = recycle_after_uses
+        self.context_setup = context_setup
+        
+        self._playwright: Optional[Playwright] = None
+        self._context: Optional[BrowserContext] = None
+        self._idle_pages: Deque[Page] = deque()
+        self._uses = 0
+        self._lock = threading.Lock()
+    
+    def rent(self) -> Page:
+        """
+        Aluga uma página, iniciando ou reciclando o browser se necessário.
+        
+        Returns:
+            Page: Página pronta para navegação.
+        """
+        with self._lock:
+            if self._context is not None and self._uses >= self.recycle_after_uses:
+                logger.info(f"Reciclando browser após {self._uses} usos")
+                self._close_context()
+            
+            context = self._get_context()
+            self._uses += 1
+            
+            while self._idle_pages:
+                page = self._idle_pages.popleft()
+                if not page.is_closed():
+                    return page
+            
+            return context.new_page()
+    
+    def release(self, page: Page) -> None:
+        """
+        Devolve uma página ao pool (ou a fecha, se o pool estiver cheio).
+        
+        Args:
+            page: Página obtida com rent().
+        """
+        with self._lock:
+            if page.is_closed() or self._context is None:
+                return
+            
+            if len(self._idle_pages) < self.size:
+                self._idle_pages.append(page)
+                return
+        
+        try:
+            page.close()
+        except Exception as e:
+            logger.warning(f"Erro ao fechar página do browser: {e}")
+    
+    def close(self) -> None:
+        """Fecha o browser e encerra o Playwright."""
+        with self._lock:
+            self._close_context()
+            
+            if self._playwright is not None:
+                try:
+                    self._playwright.stop()
+                    logger.debug("Playwright encerrado com sucesso")
+                except Exception as e:
+                    logger.warning(f"Erro ao encerrar Playwright: {e}")
+                self._playwright = None
+    
+    def _get_context(self) -> BrowserContext:
+        """Retorna o contexto persistente, iniciando-o se necessário."""
+        if self._context is not None:
+            return self._context
+        
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+            logger.debug("Playwright iniciado com sucesso")
+        
+        self._reset_stale_profile()
+        
+        context = self._playwright.chromium.launch_persistent_context(
+            user_data_dir=str(self.profile_dir),
+            headless=True,
+            args=BROWSER_ARGS
+        )
+        if self.context_setup is not None:
+            self.context_setup(context)
+        # Se o browser cair, o próximo aluguel relança o contexto
+        context.on("close", lambda _: self._forget_context(context))
+        
+        # Aproveita a aba inicial do contexto e completa o pool
+        self._idle_pages.extend(context.pages[:self.size])
+        while len(self._idle_pages) < self.size:
+            self._idle_pages.append(context.new_page())
+        
+        self._context = context
+        self._uses = 0
+        logger.debug("Browser iniciado com sucesso")
+        return context
+    
+    def _forget_context(self, context: BrowserContext) -> None:
+        """Descarta a referência a um contexto que foi fechado."""
+        if self._context is context:
+            self._context = None
+            self._idle_pages.clear()
+    
+    def _close_context(self) -> None:
+        """Fecha o contexto atual e descarta as páginas ociosas."""
+        context = self._context
+        self._context = None
+        self._idle_pages.clear()
+        if context is None:
+            return
+        
+        try:
+            context.close()
+            logger.debug("Browser fechado com sucesso")
+        except Exception as e:
+            logger.warning(f"Erro ao fechar browser: {e}")
+    
+    def _reset_stale_profile(self) -> None:
+        """
+        Remove o perfil do browser se ele for mais antigo que
+        PROFILE_MAX_AGE_SECONDS, limitando o crescimento em disco.
+        
+        A idade é medida por um arquivo marcador criado junto com o perfil,
+        já que o Chromium altera o diretório a cada execução.
+        """
+        marker = self.profile_dir / PROFILE_MARKER
+        try:
+            profile_age = time.time() - marker.stat().st_mtime
+        except FileNotFoundError:
+            profile_age = 0
+        
+        if profile_age >= PROFILE_MAX_AGE_SECONDS:
+            logger.info(f"Recriando perfil do browser: {self.profile_dir}")
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+        
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        if not marker.exists():
+            marker.touch()
@@ -4,19 +4,29 @@ Módulo de verificação de disponibilidade de sites.
 Este módulo implementa verificações HTTP e de interface usando Playwright
 para monitorar a disponibilidade e funcionalidade de sites.
 """
+import base64
+import hashlib
+import heapq
+import io
+import itertools
 import logging
+import queue
+import re
+import socket
+import ssl
+import threading
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
 from playwright.sync_api import (
-    sync_playwright,
-    Playwright,
-    Browser,
+    BrowserContext,
     Page,
     TimeoutError as PlaywrightTimeoutError,
 )
@@ -25,18 +35,26 @@ from requests.exceptions import (
     Timeout,
     ConnectionError as RequestsConnectionError,
 )
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    retry_if_result,
+    stop_after_attempt,
+    wait_exponential,
+)
 
+from browser_pool import BrowserPool
 from config import Settings
 from error_history import ErrorHistory, ErrorType, ErrorSeverity
-from ssl_check import SSLChecker
-from utils import now_str, append_log, send_slack
+from ssl_check import SSLChecker, SSL_PORT
+from utils import now_str, append_log, DEFAULT_SLACK_WEBHOOK_EXAMPLE
 
 # Configuração de logging
 logger = logging.getLogger(__name__)
 
 # Constantes de configuração
 DEFAULT_HTTP_TIMEOUT = 15
+DEFAULT_HTTP_POOL_SIZE = 4
 DEFAULT_PAGE_LOAD_TIMEOUT = 30000
 DEFAULT_ELEMENT_TIMEOUT = 10000
 DEFAULT_ORG_SELECT_TIMEOUT = 5000
@@ -44,13 +62,130 @@ DEFAULT_DOC_VIEWER_TIMEOUT = 10000
 DEFAULT_RETRY_ATTEMPTS = 3
 DEFAULT_RETRY_WAIT_MIN = 4
 DEFAULT_RETRY_WAIT_MAX = 10
+HTTP_BODY_SAMPLE_BYTES = 65536  # Corpos até este tamanho são lidos por inteiro
+SCREENSHOT_JPEG_QUALITY = 80
+SCREENSHOT_WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB
+_SCREENSHOT_COUNTER = itertools.count()  # Sufixo único dos screenshots
+PLAYWRIGHT_PROFILE_DIR_NAME = "pw_profile"
+SLACK_QUEUE_MAX_SIZE = 1024
+SLACK_MIN_INTERVAL_SECONDS = 1.0  # Limite do webhook do Slack: 1 mensagem/s
+SLACK_QUEUE_DRAIN_TIMEOUT = 30  # Espera máxima pelo envio pendente em close()
+SLACK_POST_TIMEOUT = 10
+SLACK_MAX_ATTEMPTS = 5  # Tentativas por notificação (429, 5xx e falhas de rede)
+SLACK_BACKOFF_BASE_SECONDS = 2.0
+SLACK_BACKOFF_MAX_SECONDS = 60.0  # Limite também aplicado ao Retry-After
+SSL_CACHE_TTL_SECONDS = 300  # Revalida a cadeia completa a cada 5 minutos
+SSL_CACHE_EXPIRY_MARGIN_SECONDS = 60  # Não usa cache perto do fim da validade
+
+# Exceções consideradas transitórias (repetidas pelo @retry de _run_check).
+# Os métodos _do_* as tratam e devolvem um resultado de falha com
+# "transient": True no detalhe, que também é repetido
+TRANSIENT_EXCEPTIONS = (RequestsConnectionError, Timeout, PlaywrightTimeoutError)
+
+# Cabeçalho fixo das notificações de falha (seções opcionais são anexadas)
+FAILURE_MESSAGE_HEADER = (
+    "🚨 Problema detectado em {site_url}\n"
+    "Timestamp: {timestamp}\n"
+    "HTTP OK: {ok_http}\n"
+    "SSL OK: {ok_ssl}\n"
+    "Playwright OK: {ok_playwright}"
+)
 
 # Seletores CSS
 SELECTOR_ORG_SELECT = '[data-testid="org-select"], select:has-text("Organização")'
 SELECTOR_DOC_LIST = '[data-testid="doc-list"], .documents-list'
-SELECTOR_DOC_LINK = '[data-testid="doc-link"], a:has-text("Visualizar")'
+SELECTOR_DOC_LINK = '[data-testid="doc-link"]'
+SELECTOR_DOC_LINK_FALLBACK = 'a:has-text("Visualizar")'
 SELECTOR_DOC_VIEWER = 'iframe[src*="pdf"], embed[type="application/pdf"]'
 
+# Requisições abortadas durante a verificação Playwright: terceiros (analytics,
+# anúncios, fontes) e imagens/mídia não influenciam o fluxo verificado e só
+# atrasam o carregamento. Apenas URLs que casam com o padrão são interceptadas.
+BLOCKED_REQUESTS_RE = re.compile(
+    r"(analytics|fonts\.|doubleclick|googletagmanager|hotjar|segment\.)"
+    r"|\.(png|jpe?g|gif|webp|ico|woff2?|ttf|otf|mp4|webm|mp3)(\?|$)",
+    re.IGNORECASE
+)
+
+# Script de coleta de métricas via Performance API. É instalado uma vez por
+# contexto com add_init_script, de modo que cada verificação só precisa
+# avaliar a chamada curta PERF_COLLECT_EXPRESSION.
+PERF_SCRIPT = """
+    window.__collectPerf = () => {
+        const perfData = window.performance.timing;
+        const navigation = window.performance.navigation;
+        const memory = window.performance.memory || {};
+
+        // Calcula métricas de navegação
+        const dns = perfData.domainLookupEnd - perfData.domainLookupStart;
+        const tcp = perfData.connectEnd - perfData.connectStart;
+        const ssl = perfData.secureConnectionStart > 0 
+            ? perfData.connectEnd - perfData.secureConnectionStart 
+            : 0;
+        const ttfb = perfData.responseStart - perfData.requestStart;
+        const download = perfData.responseEnd - perfData.responseStart;
+        // Eventos ainda não ocorridos têm valor 0 na Navigation Timing API
+        const domProcessing = perfData.domComplete > 0
+            ? perfData.domComplete - perfData.domInteractive
+            : 0;
+        const domContentLoaded = perfData.domContentLoadedEventEnd > 0
+            ? perfData.domContentLoadedEventEnd - perfData.navigationStart
+            : 0;
+        const loadComplete = perfData.loadEventEnd > 0
+            ? perfData.loadEventEnd - perfData.navigationStart
+            : 0;
+
+        // Resource timing
+        const resources = window.performance.getEntriesByType('resource');
+        const totalResources = resources.length;
+        const totalResourceSize = resources.reduce((sum, r) => {
+            return sum + (r.transferSize || 0);
+        }, 0);
+
+        return {
+            // Tempos de navegação
+            dns_time: dns,
+            tcp_time: tcp,
+            ssl_time: ssl,
+            ttfb: ttfb,
+            download_time: download,
+            dom_processing: domProcessing,
+            dom_content_loaded: domContentLoaded,
+            load_complete: loadComplete,
+
+            // Informações de navegação
+            redirect_count: navigation.redirectCount,
+            navigation_type: navigation.type,
+
+            // Recursos
+            total_resources: totalResources,
+            total_resource_size: totalResourceSize,
+
+            // Memória (se disponível)
+            memory_used: memory.usedJSHeapSize || 0,
+            memory_total: memory.totalJSHeapSize || 0,
+            memory_limit: memory.jsHeapSizeLimit || 0,
+        };
+    };
+"""
+PERF_COLLECT_EXPRESSION = "() => window.__collectPerf()"
+
+
+def _is_transient_failure(check_result: Dict[str, Any]) -> bool:
+    """
+    Indica se o resultado de uma verificação é uma falha transitória.
+    
+    Args:
+        check_result: Resultado de um dos métodos _do_*.
+    
+    Returns:
+        True se algum detalhe do resultado estiver marcado com "transient".
+    """
+    return any(
+        isinstance(detail, dict) and detail.get("transient")
+        for detail in check_result.values()
+    )
+
 
 class SiteChecker:
     """
@@ -75,9 +210,68 @@ class SiteChecker:
         self.settings = settings
         self._validate_settings()
         self.ssl_checker = SSLChecker(
-            expiration_warning_days=getattr(settings, 'SSL_EXPIRATION_WARNING_DAYS', 30)
+            expiration_warning_days=settings.SSL_EXPIRATION_WARNING_DAYS
         )
         self.error_history = ErrorHistory(settings)
+        
+        # Cache da última verificação SSL bem-sucedida:
+        # (hash SHA-256 do certificado, instante do cache, resultado)
+        self._ssl_cache: Optional[Tuple[bytes, float, Dict[str, Any]]] = None
+        # Contexto com verificação da cadeia e do hostname, criado uma única
+        # vez (carregar as CAs do sistema a cada verificação é caro)
+        self._ssl_context = ssl.create_default_context()
+        
+        # Sessão HTTP com pool de conexões (keep-alive entre verificações)
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=DEFAULT_HTTP_POOL_SIZE,
+            pool_maxsize=DEFAULT_HTTP_POOL_SIZE
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        
+        # Browser mantido aquecido entre verificações (iniciado sob demanda),
+        # com perfil persistente e páginas pré-abertas. A API síncrona do
+        # Playwright só pode ser usada pela thread que a iniciou, por isso
+        # todo acesso ao pool passa por uma thread dedicada.
+        self._browser_pool = BrowserPool(
+            settings.BASE_DIR / PLAYWRIGHT_PROFILE_DIR_NAME,
+            context_setup=self._setup_browser_context
+        )
+        self._playwright_executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="playwright"
+        )
+        
+        # Notificações do Slack enviadas em segundo plano por uma thread
+        # dedicada, fora do caminho da verificação, por uma sessão HTTP
+        # persistente (conexão TLS reaproveitada). Cada item da fila é
+        # (resultado ou mensagem já montada, tentativas já feitas)
+        self._slack_enabled = bool(settings.SLACK_WEBHOOK)
+        if self._slack_enabled and DEFAULT_SLACK_WEBHOOK_EXAMPLE in settings.SLACK_WEBHOOK:
+            logger.warning(
+                "Webhook do Slack ainda está com o valor de exemplo. "
+                "Notificações desabilitadas."
+            )
+            self._slack_enabled = False
+        self._slack_session = requests.Session()
+        self._slack_queue: "queue.Queue[Optional[Tuple[Union[Dict[str, Any], str], int]]]" = (
+            queue.Queue(maxsize=SLACK_QUEUE_MAX_SIZE)
+        )
+        self._slack_worker = threading.Thread(
+            target=self._run_slack_worker,
+            name="slack-notifier",
+            daemon=True
+        )
+        self._slack_worker.start()
+        
+        # Diretório de screenshots criado uma única vez (nova tentativa só
+        # se a criação falhar, p.ex. disco ainda não montado)
+        self._fail_dir_ready = False
+        self._ensure_fail_dir()
+        # (segundo, prefixo formatado) do último screenshot
+        self._screenshot_prefix: Tuple[int, str] = (0, "")
+        
         logger.info(
             f"SiteChecker inicializado para {settings.SITE_URL} "
             f"(portal: {settings.PORTAL_URL})"
@@ -98,14 +292,37 @@ class SiteChecker:
             multiplier=1,
             min=DEFAULT_RETRY_WAIT_MIN,
             max=DEFAULT_RETRY_WAIT_MAX
-        )
+        ),
+        # Só falhas transitórias justificam nova tentativa; as demais
+        # (configuração, erros de programação) propagam imediatamente
+        retry=(
+            retry_if_result(_is_transient_failure)
+            | retry_if_exception_type(TRANSIENT_EXCEPTIONS)
+        ),
+        # Esgotadas as tentativas, devolve o último resultado de falha (ou
+        # relança a última exceção)
+        retry_error_callback=lambda retry_state: retry_state.outcome.result()
     )
+    def _run_check(self, check: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Executa uma verificação, repetindo-a em caso de falha transitória.
+        
+        Args:
+            check: Um dos métodos _do_*.
+        
+        Returns:
+            Resultado da última tentativa.
+        """
+        return check()
+    
     def perform_check(self) -> Dict[str, Any]:
         """
         Executa todas as verificações do site.
         
-        Realiza verificações SSL/TLS, HTTP e com Playwright, registra os resultados
-        e notifica em caso de falhas.
+        Realiza verificações SSL/TLS, HTTP e com Playwright (concorrentemente),
+        registra os resultados e notifica em caso de falhas. Cada verificação
+        com falha transitória é repetida isoladamente (ver _run_check) antes
+        do registro e da notificação.
         
         Returns:
             Dict contendo os resultados das verificações com as chaves:
@@ -136,20 +353,27 @@ class SiteChecker:
             "screenshot": None,
         }
         
-        # Executa verificação SSL/TLS
-        ssl_result = self._do_ssl_check()
-        result.update(ssl_result)
-        logger.debug(f"Resultado verificação SSL: {ssl_result}")
+        # Executa as verificações SSL/TLS, HTTP e Playwright em paralelo:
+        # são independentes e passam a maior parte do tempo aguardando rede
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="check") as executor:
+            ssl_future = executor.submit(self._run_check, self._do_ssl_check)
+            http_future = executor.submit(self._run_check, self._do_http_check)
+            playwright_future = executor.submit(self._run_check, self._do_playwright_check)
+            
+            ssl_result = ssl_future.result()
+            http_result = http_future.result()
+            playwright_result = playwright_future.result()
         
-        # Executa verificação HTTP
-        http_result = self._do_http_check()
+        result.update(ssl_result)
         result.update(http_result)
-        logger.debug(f"Resultado verificação HTTP: {http_result}")
-        
-        # Executa verificação Playwright
-        playwright_result = self._do_playwright_check()
         result.update(playwright_result)
-        logger.debug(f"Resultado verificação Playwright: {playwright_result}")
+        
+        # Os dicts de resultado podem ser grandes: só são formatados se o
+        # nível DEBUG estiver ativo
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Resultado verificação SSL: %s", ssl_result)
+            logger.debug("Resultado verificação HTTP: %s", http_result)
+            logger.debug("Resultado verificação Playwright: %s", playwright_result)
         
         # Registra resultado no log
         try:
@@ -179,11 +403,24 @@ class SiteChecker:
         logger.info(f"Executando verificação SSL/TLS para {self.settings.SITE_URL}")
         
         try:
+            cert_hash = self._get_certificate_hash()
+            cached_result = self._get_cached_ssl_result(cert_hash)
+            if cached_result is not None:
+                logger.info("Certificado SSL inalterado, reutilizando validação em cache")
+                return cached_result
+            
             ssl_result = self.ssl_checker.check_ssl_certificate(self.settings.SITE_URL)
             
+            if ssl_result.get("ok_ssl") and cert_hash is not None:
+                self._ssl_cache = (cert_hash, time.time(), ssl_result)
+            else:
+                self._ssl_cache = None
+            
             # Registra erro no histórico se falhou
             if not ssl_result.get("ok_ssl"):
                 error_detail = ssl_result.get("ssl_detail", {})
+                if error_detail.get("error") == TimeoutError.__name__:
+                    error_detail["transient"] = True
                 error_message = error_detail.get("message", "SSL verification failed")
                 
                 self.error_history.record_error(
@@ -220,6 +457,105 @@ class SiteChecker:
                 }
             }
     
+    def _get_certificate_hash(self) -> Optional[bytes]:
+        """
+        Obtém o hash SHA-256 do certificado apresentado pelo servidor.
+        
+        O certificado vem de um handshake com verificação da cadeia e do
+        hostname: um certificado que não passa na verificação nunca
+        reaproveita a validação em cache.
+        
+        Returns:
+            Digest do certificado (DER) ou None se não for possível obtê-lo
+            (inclusive quando a verificação do certificado falha).
+        """
+        parsed_url = urlparse(self.settings.SITE_URL)
+        hostname = parsed_url.hostname
+        if not hostname or parsed_url.scheme.lower() != "https":
+            return None
+        
+        try:
+            with socket.create_connection(
+                (hostname, parsed_url.port or SSL_PORT),
+                timeout=self.ssl_checker.timeout
+            ) as sock:
+                with self._ssl_context.wrap_socket(sock, server_hostname=hostname) as ssock:
+                    cert_binary = ssock.getpeercert(binary_form=True)
+            return hashlib.sha256(cert_binary).digest() if cert_binary else None
+        except Exception as e:
+            logger.debug(f"Não foi possível obter o certificado para cache: {e}")
+            return None
+    
+    def _get_cached_ssl_result(self, cert_hash: Optional[bytes]) -> Optional[Dict[str, Any]]:
+        """
+        Retorna a validação SSL em cache se ela ainda puder ser reutilizada.
+        
+        O cache só é usado se o certificado não mudou, se foi validado há
+        menos de SSL_CACHE_TTL_SECONDS e se o certificado continua dentro
+        do período de validade.
+        
+        Args:
+            cert_hash: Hash do certificado atual do servidor.
+        
+        Returns:
+            Resultado da verificação SSL em cache ou None.
+        """
+        if cert_hash is None or self._ssl_cache is None:
+            return None
+        
+        cached_hash, cached_at, cached_result = self._ssl_cache
+        now = time.time()
+        if cached_hash != cert_hash or now - cached_at >= SSL_CACHE_TTL_SECONDS:
+            return None
+        
+        certificate = cached_result["ssl_detail"].get("certificate", {})
+        not_before = certificate.get("not_before_timestamp")
+        not_after = certificate.get("not_after_timestamp")
+        if not not_before or not not_after:
+            return None
+        if not (not_before <= now < not_after - SSL_CACHE_EXPIRY_MARGIN_SECONDS):
+            return None
+        
+        return {
+            "ok_ssl": True,
+            "ssl_detail": {**cached_result["ssl_detail"], "cached": True},
+        }
+    
+    def _read_body(self, response: requests.Response) -> Tuple[int, bool]:
+        """
+        Lê o corpo da resposta quando ele é pequeno.
+        
+        Corpos de até HTTP_BODY_SAMPLE_BYTES são lidos por inteiro, o que
+        devolve a conexão ao pool da sessão. Se o Content-Length indicar
+        um corpo maior, nada é lido; sem Content-Length, a leitura para
+        ao passar do limite.
+        
+        Args:
+            response: Resposta obtida com stream=True.
+            
+        Returns:
+            Tupla (tamanho do corpo em bytes, corpo lido por inteiro). Se
+            o corpo não foi lido por inteiro, o tamanho vem do
+            Content-Length ou é HTTP_BODY_SAMPLE_BYTES quando o servidor
+            não o informa.
+        """
+        header_value = response.headers.get("Content-Length")
+        if header_value is not None:
+            try:
+                content_length = int(header_value)
+            except ValueError:
+                logger.debug(f"Content-Length inválido: {header_value!r}")
+            else:
+                if content_length > HTTP_BODY_SAMPLE_BYTES:
+                    return content_length, False
+        
+        size = 0
+        for chunk in response.iter_content(HTTP_BODY_SAMPLE_BYTES):
+            size += len(chunk)
+            if size > HTTP_BODY_SAMPLE_BYTES:
+                return HTTP_BODY_SAMPLE_BYTES, False
+        return size, True
+    
     def _do_http_check(self) -> Dict[str, Any]:
         """
         Realiza verificação HTTP básica do site com métricas de performance.
@@ -235,42 +571,59 @@ class SiteChecker:
         logger.info(f"Executando verificação HTTP para {self.settings.SITE_URL}")
         
         try:
-            # Mede TTFB manualmente
-            start_time = time.time()
+            start_time = time.perf_counter()
             
-            response = requests.get(
+            response = self._session.get(
                 self.settings.SITE_URL,
                 timeout=DEFAULT_HTTP_TIMEOUT,
                 allow_redirects=True,
                 stream=True  # Stream para medir TTFB
             )
             
-            # Mede TTFB (tempo até primeiro byte)
-            ttfb_start = time.time()
-            # Lê primeiro chunk para garantir que recebeu o primeiro byte
-            content = b''
-            for chunk in response.iter_content(chunk_size=1):
-                content = chunk
-                break
-            ttfb = time.time() - ttfb_start
-            
-            # Lê o resto da resposta
-            for chunk in response.iter_content(chunk_size=8192):
-                content += chunk
-            
-            # Tempo total
-            total_time = time.time() - start_time
+            # Com stream=True, get() retorna assim que a resposta começa a
+            # chegar (status + cabeçalhos): esse intervalo é o TTFB
+            ttfb = time.perf_counter() - start_time
+            
+            # Corpos pequenos são lidos por inteiro e a conexão volta ao
+            # pool; só os grandes fecham a conexão sem baixar o restante
+            try:
+                content_length, body_read = self._read_body(response)
+            except BaseException:
+                response.close()
+                raise
+            if not body_read:
+                response.close()
+            
+            # Tempo total (inclui o corpo apenas quando ele foi lido)
+            total_time = time.perf_counter() - start_time
             elapsed_time = response.elapsed.total_seconds()
             
             # Tamanho da resposta
-            content_length = len(content)
-            headers_size = len(str(response.headers).encode('utf-8'))
+            # Cabeçalhos HTTP são latin-1 (1 caractere = 1 byte); cada linha
+            # tem ainda ": " e "\r\n", daí os 4 bytes extras
+            headers_size = sum(
+                len(name) + len(value) + 4
+                for name, value in response.headers.items()
+            )
             total_size = content_length + headers_size
             
             is_ok = response.status_code == 200
             
-            # Calcula velocidade de download (bytes/segundo)
-            download_speed = content_length / elapsed_time if elapsed_time > 0 else 0
+            performance = {
+                "ttfb": round(ttfb, 3),  # Time To First Byte em segundos
+                "total_time": round(total_time, 3),  # Tempo total da requisição
+                "response_time": round(elapsed_time, 3),  # Tempo de resposta (requests.elapsed)
+                "content_length": content_length,  # Tamanho do conteúdo em bytes
+                "total_size": total_size,  # Tamanho total (headers + content)
+                "body_downloaded": body_read,  # Corpo lido por inteiro
+            }
+            
+            # Velocidade de download (bytes/segundo) só faz sentido quando o
+            # corpo foi de fato baixado
+            if body_read and total_time > 0:
+                download_speed = content_length / total_time
+                performance["download_speed"] = round(download_speed, 2)
+                performance["download_speed_mbps"] = round(download_speed * 8 / 1_000_000, 2)
             
             result = {
                 "ok_http": is_ok,
@@ -278,15 +631,7 @@ class SiteChecker:
                     "status_code": response.status_code,
                     "elapsed": elapsed_time,
                     "url": response.url,
-                    "performance": {
-                        "ttfb": round(ttfb, 3),  # Time To First Byte em segundos
-                        "total_time": round(total_time, 3),  # Tempo total da requisição
-                        "response_time": round(elapsed_time, 3),  # Tempo de resposta (requests.elapsed)
-                        "content_length": content_length,  # Tamanho do conteúdo em bytes
-                        "total_size": total_size,  # Tamanho total (headers + content)
-                        "download_speed": round(download_speed, 2),  # Velocidade em bytes/segundo
-                        "download_speed_mbps": round(download_speed * 8 / 1_000_000, 2),  # Velocidade em Mbps
-                    }
+                    "performance": performance,
                 }
             }
             
@@ -338,6 +683,7 @@ class SiteChecker:
                 "http_detail": {
                     "error": "Request timeout",
                     "timeout_seconds": DEFAULT_HTTP_TIMEOUT,
+                    "transient": True,
                 }
             }
         except RequestsConnectionError as e:
@@ -359,6 +705,7 @@ class SiteChecker:
                 "http_detail": {
                     "error": "Connection error",
                     "message": str(e),
+                    "transient": True,
                 }
             }
         except RequestException as e:
@@ -405,32 +752,58 @@ class SiteChecker:
                 }
             }
     
-    @contextmanager
-    def _browser_context(self, playwright: Playwright) -> Browser:
+    def close(self) -> None:
+        """
+        Libera os recursos mantidos entre verificações (sessão HTTP,
+        browser, Playwright, thread de notificações e arquivo de histórico).
+        
+        Notificações ainda na fila são enviadas antes do encerramento
+        (limitado a SLACK_QUEUE_DRAIN_TIMEOUT segundos).
+        
+        Deve ser chamado quando o SiteChecker não for mais utilizado.
+        """
+        self._session.close()
+        if self._slack_worker.is_alive():
+            self._slack_queue.put(None)
+            self._slack_worker.join(timeout=SLACK_QUEUE_DRAIN_TIMEOUT)
+        self._slack_session.close()
+        try:
+            self._playwright_executor.submit(self._browser_pool.close).result()
+        except RuntimeError:
+            # Executor já encerrado (close chamado mais de uma vez)
+            pass
+        self._playwright_executor.shutdown(wait=True)
+        self.error_history.close()
+    
+    def _setup_browser_context(self, context: BrowserContext) -> None:
         """
-        Context manager para gerenciar o ciclo de vida do browser.
+        Configura cada contexto criado pelo pool de browser.
+        
+        Requisições que casam com BLOCKED_REQUESTS_RE são abortadas e
+        PERF_SCRIPT é instalado em todas as páginas.
         
         Args:
-            playwright: Instância do Playwright.
-            
+            context: Contexto recém-criado.
+        """
+        context.route(BLOCKED_REQUESTS_RE, lambda route: route.abort())
+        context.add_init_script(PERF_SCRIPT)
+    
+    @contextmanager
+    def _page_context(self) -> Iterator[Page]:
+        """
+        Context manager que aluga uma página do pool de browser.
+        
+        A página é devolvida ao pool ao final da verificação; o browser (e
+        com ele o cache HTTP) é mantido para as próximas verificações.
+        
         Yields:
-            Browser: Instância do browser.
+            Page: Página pronta para navegação.
         """
-        browser = None
+        page = self._browser_pool.rent()
         try:
-            browser = playwright.chromium.launch(
-                headless=True,
-                args=["--no-sandbox", "--disable-dev-shm-usage"]
-            )
-            logger.debug("Browser iniciado com sucesso")
-            yield browser
+            yield page
         finally:
-            if browser:
-                try:
-                    browser.close()
-                    logger.debug("Browser fechado com sucesso")
-                except Exception as e:
-                    logger.warning(f"Erro ao fechar browser: {e}")
+            self._browser_pool.release(page)
     
     def _do_playwright_check(self) -> Dict[str, Any]:
         """
@@ -443,76 +816,72 @@ class SiteChecker:
             Dict com chaves 'ok_playwright', 'playwright_detail' e 'screenshot'.
         """
         logger.info(f"Executando verificação Playwright para {self.settings.PORTAL_URL}")
-        
+        return self._playwright_executor.submit(self._run_playwright_check).result()
+    
+    def _run_playwright_check(self) -> Dict[str, Any]:
+        """Corpo de _do_playwright_check, executado na thread do Playwright."""
         try:
-            with sync_playwright() as playwright:
-                with self._browser_context(playwright) as browser:
-                    page = browser.new_page()
+            with self._page_context() as page:
+                # Navega para o portal e mede performance
+                logger.debug("Navegando para %s", self.settings.PORTAL_URL)
+                
+                # Mede tempo de navegação
+                navigation_start = time.perf_counter()
+                
+                # Aguarda apenas o DOM: a prontidão real da página é garantida
+                # pelas esperas explícitas em _interact_with_page
+                page.goto(
+                    self.settings.PORTAL_URL,
+                    wait_until="domcontentloaded",
+                    timeout=DEFAULT_PAGE_LOAD_TIMEOUT
+                )
+                
+                navigation_time = time.perf_counter() - navigation_start
+                logger.debug("Página carregada em %.2fs", navigation_time)
+                
+                # Interage com a página
+                interaction_start = time.perf_counter()
+                detail_messages: List[str] = []
+                playwright_ok = self._interact_with_page(page, detail_messages)
+                interaction_time = time.perf_counter() - interaction_start
+                
+                # Obtém métricas de performance do navegador usando Performance API
+                # (após a interação, quando o evento load normalmente já ocorreu)
+                performance_metrics = self._get_page_performance_metrics(page)
+                
+                # Compila métricas de performance
+                performance_metrics.update({
+                    "navigation_time": round(navigation_time, 3),
+                    "interaction_time": round(interaction_time, 3),
+                    "total_time": round(navigation_time + interaction_time, 3),
+                })
+                
+                # Tira screenshot em caso de falha
+                screenshot_path: Optional[str] = None
+                if not playwright_ok:
+                    logger.warning("Falha na interação com a página, tirando screenshot")
+                    screenshot_path = self._take_failure_screenshot(page)
                     
-                    try:
-                        # Navega para o portal e mede performance
-                        logger.debug(f"Navegando para {self.settings.PORTAL_URL}")
-                        
-                        # Mede tempo de navegação
-                        navigation_start = time.time()
-                        
-                        # Obtém métricas de performance do navegador
-                        page.goto(
-                            self.settings.PORTAL_URL,
-                            wait_until="networkidle",
-                            timeout=DEFAULT_PAGE_LOAD_TIMEOUT
-                        )
-                        
-                        navigation_time = time.time() - navigation_start
-                        logger.debug(f"Página carregada em {navigation_time:.2f}s")
-                        
-                        # Obtém métricas de performance do navegador usando Performance API
-                        performance_metrics = self._get_page_performance_metrics(page)
-                        
-                        # Interage com a página
-                        interaction_start = time.time()
-                        detail_messages: List[str] = []
-                        playwright_ok = self._interact_with_page(page, detail_messages)
-                        interaction_time = time.time() - interaction_start
-                        
-                        # Compila métricas de performance
-                        performance_metrics.update({
-                            "navigation_time": round(navigation_time, 3),
-                            "interaction_time": round(interaction_time, 3),
-                            "total_time": round(navigation_time + interaction_time, 3),
-                        })
-                        
-                        # Tira screenshot em caso de falha
-                        screenshot_path: Optional[str] = None
-                        if not playwright_ok:
-                            logger.warning("Falha na interação com a página, tirando screenshot")
-                            screenshot_path = self._take_failure_screenshot(page)
-                            
-                            # Registra erro no histórico
-                            self.error_history.record_error(
-                                error_type=ErrorType.PLAYWRIGHT_ERROR,
-                                severity=ErrorSeverity.WARNING,
-                                message=f"Playwright interaction failed: {'; '.join(detail_messages)}",
-                                details={"messages": detail_messages, "screenshot": screenshot_path},
-                                ok_ssl=True,
-                                ok_http=True,
-                                ok_playwright=False,
-                            )
-                        
-                        return {
-                            "ok_playwright": playwright_ok,
-                            "playwright_detail": {
-                                "messages": detail_messages,
-                                "performance": performance_metrics
-                            },
-                            "screenshot": screenshot_path
-                        }
-                    finally:
-                        try:
-                            page.close()
-                        except Exception as e:
-                            logger.warning(f"Erro ao fechar página: {e}")
-                            
+                    # Registra erro no histórico
+                    self.error_history.record_error(
+                        error_type=ErrorType.PLAYWRIGHT_ERROR,
+                        severity=ErrorSeverity.WARNING,
+                        message=f"Playwright interaction failed: {'; '.join(detail_messages)}",
+                        details={"messages": detail_messages, "screenshot": screenshot_path},
+                        ok_ssl=True,
+                        ok_http=True,
+                        ok_playwright=False,
+                    )
+                
+                return {
+                    "ok_playwright": playwright_ok,
+                    "playwright_detail": {
+                        "messages": detail_messages,
+                        "performance": performance_metrics
+                    },
+                    "screenshot": screenshot_path
+                }
+            
         except PlaywrightTimeoutError as e:
             logger.error(f"Timeout no Playwright: {e}")
             
@@ -532,17 +901,27 @@ class SiteChecker:
                 "playwright_detail": {
                     "error": "Playwright timeout",
                     "message": str(e),
+                    "transient": True,
                 }
             }
         except Exception as e:
-            logger.error(f"Erro inesperado no Playwright: {e}", exc_info=True)
+            # A pilha completa só é formatada em modo DEBUG (no log e no
+            # histórico); caso contrário registra apenas tipo e mensagem,
+            # sem percorrer os frames
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            logger.error(f"Erro inesperado no Playwright: {e}", exc_info=debug_enabled)
+            
+            if debug_enabled:
+                error_traceback = traceback.format_exc()
+            else:
+                error_traceback = "".join(traceback.format_exception_only(type(e), e))
             
             # Registra erro no histórico
             self.error_history.record_error(
                 error_type=ErrorType.PLAYWRIGHT_ERROR,
                 severity=ErrorSeverity.WARNING,
                 message=f"Unexpected error in Playwright check: {str(e)}",
-                details={"error": str(e), "type": type(e).__name__, "traceback": traceback.format_exc()},
+                details={"error": str(e), "type": type(e).__name__, "traceback": error_traceback},
                 ok_ssl=True,
                 ok_http=True,
                 ok_playwright=False,
@@ -553,7 +932,7 @@ class SiteChecker:
                 "playwright_detail": {
                     "error": type(e).__name__,
                     "message": str(e),
-                    "traceback": traceback.format_exc(),
+                    "traceback": error_traceback,
                 }
             }
     
@@ -569,57 +948,7 @@ class SiteChecker:
         """
         try:
             # Usa Performance API do navegador para obter métricas detalhadas
-            metrics = page.evaluate("""
-                () => {
-                    const perfData = window.performance.timing;
-                    const navigation = window.performance.navigation;
-                    const memory = window.performance.memory || {};
-                    
-                    // Calcula métricas de navegação
-                    const dns = perfData.domainLookupEnd - perfData.domainLookupStart;
-                    const tcp = perfData.connectEnd - perfData.connectStart;
-                    const ssl = perfData.secureConnectionStart > 0 
-                        ? perfData.connectEnd - perfData.secureConnectionStart 
-                        : 0;
-                    const ttfb = perfData.responseStart - perfData.requestStart;
-                    const download = perfData.responseEnd - perfData.responseStart;
-                    const domProcessing = perfData.domComplete - perfData.domInteractive;
-                    const domContentLoaded = perfData.domContentLoadedEventEnd - perfData.navigationStart;
-                    const loadComplete = perfData.loadEventEnd - perfData.navigationStart;
-                    
-                    // Resource timing
-                    const resources = window.performance.getEntriesByType('resource');
-                    const totalResources = resources.length;
-                    const totalResourceSize = resources.reduce((sum, r) => {
-                        return sum + (r.transferSize || 0);
-                    }, 0);
-                    
-                    return {
-                        // Tempos de navegação
-                        dns_time: dns,
-                        tcp_time: tcp,
-                        ssl_time: ssl,
-                        ttfb: ttfb,
-                        download_time: download,
-                        dom_processing: domProcessing,
-                        dom_content_loaded: domContentLoaded,
-                        load_complete: loadComplete,
-                        
-                        // Informações de navegação
-                        redirect_count: navigation.redirectCount,
-                        navigation_type: navigation.type,
-                        
-                        // Recursos
-                        total_resources: totalResources,
-                        total_resource_size: totalResourceSize,
-                        
-                        // Memória (se disponível)
-                        memory_used: memory.usedJSHeapSize || 0,
-                        memory_total: memory.totalJSHeapSize || 0,
-                        memory_limit: memory.jsHeapSizeLimit || 0,
-                    };
-                }
-            """)
+            metrics = page.evaluate(PERF_COLLECT_EXPRESSION)
             
             # Converte para formato mais legível
             return {
@@ -669,33 +998,48 @@ class SiteChecker:
             True se todas as interações foram bem-sucedidas, False caso contrário.
         """
         try:
+            # Cada passo é uma única chamada ao driver do Playwright: as ações
+            # já aguardam o elemento ficar visível (auto-waiting), sem um
+            # locator + wait_for separados.
+            
             # Seleciona organização
-            logger.debug("Localizando select de organização")
-            org_select = page.locator(SELECTOR_ORG_SELECT)
-            org_select.wait_for(state="visible", timeout=DEFAULT_ORG_SELECT_TIMEOUT)
-            org_select.select_option(label=self.settings.SUCCESS_ORG_LABEL)
+            logger.debug("Selecionando organização")
+            page.select_option(
+                SELECTOR_ORG_SELECT,
+                label=self.settings.SUCCESS_ORG_LABEL,
+                timeout=DEFAULT_ORG_SELECT_TIMEOUT
+            )
             detail_messages.append("Select de organização selecionado com sucesso")
-            logger.debug(f"Organização '{self.settings.SUCCESS_ORG_LABEL}' selecionada")
+            logger.debug("Organização '%s' selecionada", self.settings.SUCCESS_ORG_LABEL)
             
             # Aguarda lista de documentos
             logger.debug("Aguardando lista de documentos")
-            doc_list = page.locator(SELECTOR_DOC_LIST)
-            doc_list.wait_for(state="visible", timeout=DEFAULT_ELEMENT_TIMEOUT)
+            page.wait_for_selector(
+                SELECTOR_DOC_LIST,
+                state="visible",
+                timeout=DEFAULT_ELEMENT_TIMEOUT
+            )
             detail_messages.append("Lista de documentos carregada")
             logger.debug("Lista de documentos visível")
             
             # Abre primeiro documento
-            logger.debug("Localizando primeiro documento")
-            first_doc = page.locator(SELECTOR_DOC_LINK).first
-            first_doc.wait_for(state="visible", timeout=DEFAULT_ELEMENT_TIMEOUT)
-            first_doc.click()
+            logger.debug("Clicando no primeiro documento")
+            # A lista já está visível: usa o seletor CSS puro por testid e só
+            # recorre à busca por texto (mais cara) se ele não existir
+            doc_link_selector = SELECTOR_DOC_LINK
+            if not page.locator(SELECTOR_DOC_LINK).count():
+                doc_link_selector = SELECTOR_DOC_LINK_FALLBACK
+            page.locator(doc_link_selector).nth(0).click(timeout=DEFAULT_ELEMENT_TIMEOUT)
             detail_messages.append("Primeiro documento clicado")
             logger.debug("Primeiro documento clicado")
             
             # Verifica se documento abriu
             logger.debug("Verificando se documento abriu")
-            doc_viewer = page.locator(SELECTOR_DOC_VIEWER)
-            doc_viewer.wait_for(state="visible", timeout=DEFAULT_DOC_VIEWER_TIMEOUT)
+            page.wait_for_selector(
+                SELECTOR_DOC_VIEWER,
+                state="visible",
+                timeout=DEFAULT_DOC_VIEWER_TIMEOUT
+            )
             detail_messages.append("Documento aberto com sucesso")
             logger.info("Fluxo completo executado com sucesso")
             
@@ -712,6 +1056,69 @@ class SiteChecker:
             logger.error(error_msg, exc_info=True)
             return False
     
+    def _ensure_fail_dir(self) -> bool:
+        """
+        Garante que o diretório de screenshots de falha existe.
+        
+        Returns:
+            True se o diretório está disponível, False caso contrário.
+        """
+        if self._fail_dir_ready:
+            return True
+        
+        try:
+            self.settings.FAIL_DIR.mkdir(parents=True, exist_ok=True)
+            self._fail_dir_ready = True
+        except OSError as e:
+            logger.warning(f"Não foi possível criar {self.settings.FAIL_DIR}: {e}")
+        
+        return self._fail_dir_ready
+    
+    def _capture_jpeg_screenshot(self, page: Page) -> bytes:
+        """
+        Captura a página inteira em JPEG usando Page.captureScreenshot do CDP.
+        
+        Args:
+            page: Instância da página do Playwright (Chromium).
+            
+        Returns:
+            Bytes da imagem JPEG.
+        """
+        cdp_session = page.context.new_cdp_session(page)
+        try:
+            response = cdp_session.send(
+                "Page.captureScreenshot",
+                {
+                    "format": "jpeg",
+                    "quality": SCREENSHOT_JPEG_QUALITY,
+                    "optimizeForSpeed": True,
+                    "captureBeyondViewport": True,
+                }
+            )
+        finally:
+            cdp_session.detach()
+        
+        return base64.b64decode(response["data"])
+    
+    def _screenshot_timestamp(self) -> str:
+        """
+        Gera o sufixo único e ordenável do nome de um screenshot.
+        
+        O prefixo de data/hora é formatado no máximo uma vez por segundo;
+        a unicidade dentro do mesmo segundo vem de um contador global.
+        
+        Returns:
+            String no formato "AAAAMMDD_HHMMSS_NNNNNN".
+        """
+        second = int(time.time())
+        cached_second, prefix = self._screenshot_prefix
+        if second != cached_second:
+            local_time = time.gmtime(second + self.settings.utc_offset_seconds(second))
+            prefix = time.strftime("%Y%m%d_%H%M%S", local_time)
+            self._screenshot_prefix = (second, prefix)
+        
+        return f"{prefix}_{next(_SCREENSHOT_COUNTER):06d}"
+    
     def _take_failure_screenshot(self, page: Page) -> Optional[str]:
         """
         Tira screenshot da página em caso de falha.
@@ -723,15 +1130,28 @@ class SiteChecker:
             Caminho do arquivo de screenshot ou None em caso de erro.
         """
         try:
-            # Garante que o diretório existe
-            self.settings.FAIL_DIR.mkdir(parents=True, exist_ok=True)
+            if not self._ensure_fail_dir():
+                return None
             
             # Gera nome único para o screenshot
-            timestamp = datetime.now(self.settings.tz).strftime("%Y%m%d_%H%M%S_%f")
-            screenshot_path = self.settings.FAIL_DIR / f"fail_{timestamp}.png"
+            screenshot_path = self.settings.FAIL_DIR / f"fail_{self._screenshot_timestamp()}.jpg"
+            
+            # Tira o screenshot via CDP em JPEG (codificação bem mais barata
+            # que PNG); fora do Chromium recorre ao screenshot do Playwright
+            try:
+                screenshot_data = self._capture_jpeg_screenshot(page)
+            except Exception as e:
+                logger.debug(f"Screenshot via CDP indisponível: {e}")
+                screenshot_data = page.screenshot(
+                    full_page=True,
+                    type="jpeg",
+                    quality=SCREENSHOT_JPEG_QUALITY
+                )
             
-            # Tira o screenshot
-            page.screenshot(path=str(screenshot_path), full_page=True)
+            # Os bytes ficam em memória e são gravados aqui em uma única
+            # escrita bufferizada, em vez de o Playwright gravar via path=
+            with open(screenshot_path, "wb", buffering=SCREENSHOT_WRITE_BUFFER_SIZE) as f:
+                f.write(screenshot_data)
             
             logger.info(f"Screenshot salvo em: {screenshot_path}")
             return str(screenshot_path)
@@ -747,87 +1167,245 @@ class SiteChecker:
         Args:
             result: Dict com os resultados das verificações.
         """
+        if not self._slack_enabled:
+            logger.debug("Slack desabilitado, notificação ignorada")
+            return
+        
         try:
-            # Constrói mensagem formatada
-            message_parts = [
-                f"🚨 Problema detectado em {result['site_url']}",
-                f"Timestamp: {result['timestamp']}",
-                f"HTTP OK: {result['ok_http']}",
-                f"SSL OK: {result.get('ok_ssl', 'N/A')}",
-                f"Playwright OK: {result['ok_playwright']}",
-            ]
-            
-            # Adiciona detalhes SSL
-            if result.get('ssl_detail'):
-                ssl_detail = result['ssl_detail']
-                if 'expiration' in ssl_detail:
-                    exp = ssl_detail['expiration']
-                    if exp.get('is_expired'):
-                        message_parts.append(
-                            f"SSL: ❌ Certificado EXPIRADO há {abs(exp.get('days_until_expiration', 0))} dias"
-                        )
-                    elif exp.get('is_expiring_soon'):
-                        message_parts.append(
-                            f"SSL: ⚠️ Certificado expira em {exp.get('days_until_expiration', 0)} dias"
-                        )
-                    elif exp.get('warning'):
-                        message_parts.append(f"SSL: ⚠️ {exp['warning']}")
-                elif 'error' in ssl_detail:
-                    message_parts.append(f"SSL Error: {ssl_detail['error']}")
-            
-            # Adiciona detalhes HTTP
-            if result.get('http_detail'):
-                http_detail = result['http_detail']
-                if 'status_code' in http_detail:
-                    elapsed = http_detail.get('elapsed', 0)
-                    perf = http_detail.get('performance', {})
-                    ttfb = perf.get('ttfb', 0)
-                    message_parts.append(
-                        f"HTTP Status: {http_detail['status_code']} "
-                        f"(TTFB: {ttfb:.3f}s, Total: {elapsed:.2f}s)"
+            # Enfileira apenas a referência: a mensagem é montada na thread
+            # de notificações, fora do caminho da verificação
+            logger.info("Enfileirando notificação de falha")
+            self._slack_queue.put_nowait((result, 0))
+            
+        except queue.Full:
+            logger.error("Fila de notificações do Slack cheia, notificação descartada")
+        except Exception as e:
+            logger.error(f"Erro ao enviar notificação: {e}", exc_info=True)
+    
+    def _build_failure_message(self, result: Dict[str, Any]) -> str:
+        """
+        Monta o texto da notificação de falha.
+        
+        O cabeçalho vem de FAILURE_MESSAGE_HEADER; as seções de SSL, HTTP,
+        Playwright e screenshot só são escritas quando há detalhes.
+        
+        Args:
+            result: Dict com os resultados das verificações.
+            
+        Returns:
+            Mensagem formatada para o Slack.
+        """
+        # Aliases locais: evitam repetir a busca do atributo a cada acesso
+        get = result.get
+        buffer = io.StringIO()
+        write = buffer.write
+        write(FAILURE_MESSAGE_HEADER.format(
+            site_url=result['site_url'],
+            timestamp=result['timestamp'],
+            ok_http=result['ok_http'],
+            ok_ssl=get('ok_ssl', 'N/A'),
+            ok_playwright=result['ok_playwright'],
+        ))
+        
+        # Adiciona detalhes SSL
+        if ssl_detail := get('ssl_detail'):
+            if 'expiration' in ssl_detail:
+                exp_get = ssl_detail['expiration'].get
+                if exp_get('is_expired'):
+                    write(
+                        f"\nSSL: ❌ Certificado EXPIRADO há "
+                        f"{abs(exp_get('days_until_expiration', 0))} dias"
                     )
-                    if perf.get('download_speed_mbps'):
-                        message_parts.append(
-                            f"  Velocidade: {perf['download_speed_mbps']} Mbps"
-                        )
-                elif 'error' in http_detail:
-                    message_parts.append(f"HTTP Error: {http_detail['error']}")
-            
-            # Adiciona detalhes Playwright
-            if result.get('playwright_detail'):
-                playwright_detail = result['playwright_detail']
-                if 'messages' in playwright_detail:
-                    messages = playwright_detail['messages']
-                    message_parts.append("Mensagens:")
-                    for msg in messages:
-                        message_parts.append(f"  - {msg}")
-                    
-                    # Adiciona métricas de performance
-                    perf = playwright_detail.get('performance', {})
-                    if perf and 'error' not in perf:
-                        nav_time = perf.get('navigation_time', 0)
-                        load_time = perf.get('load_complete_ms', 0)
-                        if load_time > 0:
-                            message_parts.append(
-                                f"Performance: Navegação {nav_time:.2f}s, "
-                                f"Carregamento completo {load_time/1000:.2f}s"
-                            )
-                elif 'error' in playwright_detail:
-                    message_parts.append(
-                        f"Playwright Error: {playwright_detail['error']}"
+                elif exp_get('is_expiring_soon'):
+                    write(
+                        f"\nSSL: ⚠️ Certificado expira em "
+                        f"{exp_get('days_until_expiration', 0)} dias"
                     )
-            
-            # Adiciona informação sobre screenshot
-            if result.get('screenshot'):
-                screenshot_path = Path(result['screenshot'])
-                message_parts.append(
-                    f"Screenshot: {screenshot_path.name} "
-                    f"({screenshot_path.parent})"
+                elif warning := exp_get('warning'):
+                    write(f"\nSSL: ⚠️ {warning}")
+            elif 'error' in ssl_detail:
+                write(f"\nSSL Error: {ssl_detail['error']}")
+        
+        # Adiciona detalhes HTTP
+        if http_detail := get('http_detail'):
+            if 'status_code' in http_detail:
+                perf_get = http_detail.get('performance', {}).get
+                write(
+                    f"\nHTTP Status: {http_detail['status_code']} "
+                    f"(TTFB: {perf_get('ttfb', 0):.3f}s, "
+                    f"Total: {http_detail.get('elapsed', 0):.2f}s)"
                 )
+                if download_speed := perf_get('download_speed_mbps'):
+                    write(f"\n  Velocidade: {download_speed} Mbps")
+            elif 'error' in http_detail:
+                write(f"\nHTTP Error: {http_detail['error']}")
+        
+        # Adiciona detalhes Playwright
+        if playwright_detail := get('playwright_detail'):
+            if 'messages' in playwright_detail:
+                write("\nMensagens:")
+                for msg in playwright_detail['messages']:
+                    write(f"\n  - {msg}")
+                
+                # Adiciona métricas de performance
+                perf = playwright_detail.get('performance', {})
+                if perf and 'error' not in perf:
+                    perf_get = perf.get
+                    load_time = perf_get('load_complete_ms', 0)
+                    if load_time > 0:
+                        write(
+                            f"\nPerformance: Navegação {perf_get('navigation_time', 0):.2f}s, "
+                            f"Carregamento completo {load_time/1000:.2f}s"
+                        )
+            elif 'error' in playwright_detail:
+                write(f"\nPlaywright Error: {playwright_detail['error']}")
+        
+        # Adiciona informação sobre screenshot
+        if screenshot := get('screenshot'):
+            screenshot_path = Path(screenshot)
+            write(f"\nScreenshot: {screenshot_path.name} ({screenshot_path.parent})")
+        
+        return buffer.getvalue()
+    
+    def _run_slack_worker(self) -> None:
+        """
+        Consome a fila de notificações e as envia ao Slack.
+        
+        Respeita o intervalo mínimo SLACK_MIN_INTERVAL_SECONDS entre envios
+        para não acionar o rate limit do webhook. Notificações recusadas
+        com 429 ou 5xx (ou com falha de rede) ficam guardadas com o horário
+        a partir do qual podem ser reenviadas (Retry-After ou backoff
+        exponencial, ambos limitados a SLACK_BACKOFF_MAX_SECONDS), até
+        SLACK_MAX_ATTEMPTS tentativas; enquanto isso, as demais
+        notificações da fila continuam sendo enviadas.
+        
+        Ao receber None, envia as retentativas que vencem dentro de
+        SLACK_QUEUE_DRAIN_TIMEOUT segundos, descarta as demais e encerra.
+        Cada item da fila só é dado como concluído (task_done) quando é
+        entregue ou descartado.
+        
+        A formatação da mensagem é feita aqui, e não em _notify_failure,
+        para não consumir CPU da thread que executa as verificações.
+        """
+        last_sent = 0.0
+        # Heap de (horário de reenvio, desempate, mensagem, tentativas feitas)
+        retries: List[Tuple[float, int, str, int]] = []
+        retry_order = itertools.count()
+        stop_deadline: Optional[float] = None
+        
+        while True:
+            now = time.monotonic()
+            if retries and retries[0][0] <= now:
+                _, _, payload, attempts = heapq.heappop(retries)
+            elif stop_deadline is not None:
+                if not retries:
+                    return
+                if retries[0][0] > stop_deadline:
+                    logger.error(
+                        f"{len(retries)} notificação(ões) do Slack descartada(s) "
+                        f"no encerramento"
+                    )
+                    for _ in retries:
+                        self._slack_queue.task_done()
+                    return
+                time.sleep(retries[0][0] - now)
+                continue
+            else:
+                try:
+                    item = self._slack_queue.get(
+                        timeout=retries[0][0] - now if retries else None
+                    )
+                except queue.Empty:
+                    continue
+                if item is None:
+                    self._slack_queue.task_done()
+                    stop_deadline = now + SLACK_QUEUE_DRAIN_TIMEOUT
+                    continue
+                payload, attempts = item
             
-            message = "\n".join(message_parts)
-            logger.info("Enviando notificação de falha")
-            send_slack(self.settings, message)
+            retry_delay = None
+            try:
+                if isinstance(payload, str):
+                    message = payload
+                else:
+                    message = self._build_failure_message(payload)
+                
+                wait_time = SLACK_MIN_INTERVAL_SECONDS - (time.monotonic() - last_sent)
+                if wait_time > 0:
+                    time.sleep(wait_time)
+                
+                logger.info("Enviando notificação de falha")
+                attempts += 1
+                retry_delay = self._post_slack(message, attempts)
+                last_sent = time.monotonic()
+                
+                if retry_delay is not None and attempts >= SLACK_MAX_ATTEMPTS:
+                    logger.error(
+                        f"Notificação descartada após {attempts} tentativas de envio ao Slack"
+                    )
+                    retry_delay = None
+            except Exception as e:
+                logger.error(f"Erro ao enviar notificação: {e}", exc_info=True)
+                retry_delay = None
             
-        except Exception as e:
-            logger.error(f"Erro ao enviar notificação: {e}", exc_info=True)
\ No newline at end of file
+            if retry_delay is None:
+                self._slack_queue.task_done()
+            else:
+                heapq.heappush(
+                    retries,
+                    (time.monotonic() + retry_delay, next(retry_order), message, attempts)
+                )
+    
+    def _post_slack(self, message: str, attempt: int) -> Optional[float]:
+        """
+        Envia uma mensagem ao webhook do Slack pela sessão persistente.
+        
+        Args:
+            message: Texto da mensagem.
+            attempt: Número desta tentativa (a partir de 1).
+        
+        Returns:
+            None se a mensagem foi entregue ou recusada de forma definitiva
+            (4xx exceto 429); caso contrário, segundos a aguardar antes de
+            tentar de novo (Retry-After, se informado, ou backoff
+            exponencial limitado a SLACK_BACKOFF_MAX_SECONDS).
+        """
+        backoff = min(
+            SLACK_BACKOFF_BASE_SECONDS * 2 ** (attempt - 1),
+            SLACK_BACKOFF_MAX_SECONDS
+        )
+        try:
+            response = self._slack_session.post(
+                self.settings.SLACK_WEBHOOK,
+                json={"text": message},
+                timeout=SLACK_POST_TIMEOUT
+            )
+        except (Timeout, RequestsConnectionError) as e:
+            logger.warning(f"Falha de rede ao enviar notificação ao Slack: {e}")
+            return backoff
+        except RequestException as e:
+            logger.error(f"Erro ao enviar notificação ao Slack: {e}")
+            return None
+        
+        status_code = response.status_code
+        if status_code == 429:
+            try:
+                retry_after = min(
+                    max(float(response.headers.get("Retry-After", "")), 0.0),
+                    SLACK_BACKOFF_MAX_SECONDS
+                )
+            except ValueError:
+                retry_after = backoff
+            logger.warning(
+                f"Slack limitou o envio (HTTP 429), nova tentativa em {retry_after:.0f}s"
+            )
+            return retry_after
+        if status_code >= 500:
+            logger.warning(f"Erro HTTP {status_code} do Slack, nova tentativa em {backoff:.0f}s")
+            return backoff
+        if status_code >= 400:
+            logger.error(f"Erro HTTP {status_code} ao enviar notificação ao Slack: {response.text[:200]}")
+            return None
+        
+        logger.info("Mensagem enviada para Slack com sucesso")
+        return None
\ No newline at end of file
@@ -6,13 +6,15 @@ incluindo carregamento de variáveis de ambiente via python-dotenv.
 """
 import logging
 import os
+import re
+import time
 from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
-from urllib.parse import urlparse
+from typing import Any, Dict, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
-from dotenv import load_dotenv
+from dotenv import find_dotenv, load_dotenv
 
 # Configuração de logging
 logger = logging.getLogger(__name__)
@@ -43,8 +45,44 @@ DEFAULT_DASHBOARD_PORT = 8080
 MIN_DASHBOARD_PORT = 1024
 MAX_DASHBOARD_PORT = 65535
 
+# Configurações de teste de carga
+DEFAULT_USE_UVLOOP = True  # Usa o event loop do uvloop, se instalado
+DEFAULT_LOAD_TEST_MAX_WORKERS = 100  # Requisições simultâneas no teste de carga
+MIN_LOAD_TEST_MAX_WORKERS = 1
+MAX_LOAD_TEST_MAX_WORKERS = 10000
+DEFAULT_LOAD_TEST_RESERVOIR_SIZE = 100_000  # Latências amostradas para percentis
+MIN_LOAD_TEST_RESERVOIR_SIZE = 0  # 0: percentis por histograma, sem amostra
+MAX_LOAD_TEST_RESERVOIR_SIZE = 10_000_000
 
-@dataclass(frozen=True)
+# Valores aceitos em variáveis de ambiente booleanas
+_TRUE_VALUES = frozenset({"1", "true", "yes", "sim", "on"})
+_FALSE_VALUES = frozenset({"0", "false", "no", "nao", "não", "off"})
+
+# Transições de fuso horário ocorrem em múltiplos de 15 minutos (UTC):
+# o offset em cache vale até o próximo limite desse intervalo
+TZ_OFFSET_CACHE_GRANULARITY_SECONDS = 15 * 60
+
+# URL http(s) completa; o grupo 1 captura o host (netloc)
+_URL_RE = re.compile(r"\Ahttps?://([^\s/?#]+)[^\s]*\Z", re.IGNORECASE)
+
+# Campos inteiros de Settings e seus limites (validados em ordem)
+_INT_BOUNDS = (
+    ("CHECK_INTERVAL_MINUTES", MIN_CHECK_INTERVAL_MINUTES, MAX_CHECK_INTERVAL_MINUTES),
+    ("CHECK_INTERVAL_HOURS", MIN_CHECK_INTERVAL_HOURS, MAX_CHECK_INTERVAL_HOURS),
+    ("DAILY_REPORT_HOUR", MIN_DAILY_REPORT_HOUR, MAX_DAILY_REPORT_HOUR),
+    ("DASHBOARD_PORT", MIN_DASHBOARD_PORT, MAX_DASHBOARD_PORT),
+    ("SSL_EXPIRATION_WARNING_DAYS", MIN_SSL_EXPIRATION_WARNING_DAYS, MAX_SSL_EXPIRATION_WARNING_DAYS),
+    ("LOAD_TEST_MAX_WORKERS", MIN_LOAD_TEST_MAX_WORKERS, MAX_LOAD_TEST_MAX_WORKERS),
+    ("LOAD_TEST_RESERVOIR_SIZE", MIN_LOAD_TEST_RESERVOIR_SIZE, MAX_LOAD_TEST_RESERVOIR_SIZE),
+)
+
+# Cache do carregamento do .env: arquivo pedido -> (mtime, retorno de
+# load_dotenv) da última carga. Evita reler e reaplicar o arquivo enquanto
+# ele não for modificado.
+_DOTENV_CACHE: Dict[Optional[str], Tuple[float, Any]] = {}
+
+
+@dataclass(frozen=True, slots=True)
 class Settings:
     """
     Configurações do sistema de monitoramento.
@@ -63,6 +101,13 @@ class Settings:
         DAILY_REPORT_HOUR: Hora do dia para geração de relatório diário (0-23).
         SSL_EXPIRATION_WARNING_DAYS: Dias antes da expiração do certificado SSL para alertar (1-365).
         DASHBOARD_PORT: Porta do dashboard Flask (padrão: 8080).
+        USE_UVLOOP: Se os testes de carga usam o event loop do uvloop
+                   (quando instalado) em vez do loop padrão do asyncio.
+        LOAD_TEST_MAX_WORKERS: Máximo de requisições simultâneas em um teste
+                              de carga, independente do número de usuários.
+        LOAD_TEST_RESERVOIR_SIZE: Máximo de latências amostradas (reservatório)
+                                 para os percentis do teste de carga; 0 usa
+                                 um histograma logarítmico, sem amostra.
         BASE_DIR: Diretório base para relatórios e logs.
         FAIL_DIR: Diretório para screenshots de falhas.
         DAILY_DIR: Diretório para relatórios diários.
@@ -72,7 +117,13 @@ class Settings:
     
     Raises:
         ValueError: Se alguma configuração for inválida.
-        OSError: Se não for possível criar os diretórios necessários.
+    
+    Note:
+        Os diretórios não são criados na instanciação; use ensure_dirs()
+        quando a árvore de diretórios for necessária.
+        
+        A classe usa __slots__: todo atributo precisa estar declarado como
+        campo, inclusive os calculados em __post_init__ (init=False).
     """
     
     SITE_URL: str
@@ -85,29 +136,32 @@ class Settings:
     DAILY_REPORT_HOUR: int = DEFAULT_DAILY_REPORT_HOUR
     SSL_EXPIRATION_WARNING_DAYS: int = DEFAULT_SSL_EXPIRATION_WARNING_DAYS
     DASHBOARD_PORT: int = DEFAULT_DASHBOARD_PORT
+    USE_UVLOOP: bool = DEFAULT_USE_UVLOOP
+    LOAD_TEST_MAX_WORKERS: int = DEFAULT_LOAD_TEST_MAX_WORKERS
+    LOAD_TEST_RESERVOIR_SIZE: int = DEFAULT_LOAD_TEST_RESERVOIR_SIZE
     BASE_DIR: Path = field(default_factory=lambda: Path.cwd() / DEFAULT_BASE_DIR_NAME)
     FAIL_DIR: Path = field(init=False)
     DAILY_DIR: Path = field(init=False)
     MONTHLY_DIR: Path = field(init=False)
     LOG_FILE: Path = field(init=False)
     tz: ZoneInfo = field(init=False)
+    # [offset_segundos, válido_até_timestamp]; mutável para uso em instância frozen
+    _tz_offset_cache: List[float] = field(init=False, repr=False, compare=False)
     
     def __post_init__(self) -> None:
         """
         Valida e inicializa configurações após a criação do objeto.
         
         Este método é chamado automaticamente pelo dataclass após a inicialização.
-        Ele valida todas as configurações e cria os diretórios necessários.
+        Ele valida todas as configurações e calcula os caminhos derivados
+        (sem criá-los no disco; veja ensure_dirs).
         """
         # Valida URLs obrigatórias
         self._validate_urls()
         
-        # Valida valores numéricos
+        # Valida valores numéricos (inclui configurações SSL)
         self._validate_numeric_values()
         
-        # Valida configurações SSL
-        self._validate_ssl_settings()
-        
         # Valida webhook do Slack (se fornecido)
         self._validate_slack_webhook()
         
@@ -117,8 +171,7 @@ class Settings:
         # Inicializa diretórios derivados
         self._initialize_directories()
         
-        # Cria diretórios necessários
-        self._create_directories()
+        object.__setattr__(self, "_tz_offset_cache", [0, 0.0])
         
         logger.info(
             f"Configurações inicializadas: "
@@ -136,98 +189,38 @@ class Settings:
             raise ValueError("PORTAL_URL é obrigatório e não pode estar vazio")
         
         # Valida formato das URLs
-        try:
-            site_parsed = urlparse(self.SITE_URL.strip())
-            if not site_parsed.scheme or not site_parsed.netloc:
-                raise ValueError(
-                    f"SITE_URL inválida: deve ser uma URL completa "
-                    f"(ex: https://example.com). Recebido: {self.SITE_URL}"
-                )
-        except Exception as e:
-            raise ValueError(f"SITE_URL inválida: {e}") from e
-        
-        try:
-            portal_parsed = urlparse(self.PORTAL_URL.strip())
-            if not portal_parsed.scheme or not portal_parsed.netloc:
-                raise ValueError(
-                    f"PORTAL_URL inválida: deve ser uma URL completa "
-                    f"(ex: https://example.com). Recebido: {self.PORTAL_URL}"
-                )
-        except Exception as e:
-            raise ValueError(f"PORTAL_URL inválida: {e}") from e
-        
-        # Normaliza URLs (remove espaços)
-        object.__setattr__(self, "SITE_URL", self.SITE_URL.strip())
-        object.__setattr__(self, "PORTAL_URL", self.PORTAL_URL.strip())
-    
-    def _validate_numeric_values(self) -> None:
-        """Valida valores numéricos dentro dos limites aceitáveis."""
-        if not isinstance(self.CHECK_INTERVAL_MINUTES, int):
-            raise TypeError(
-                f"CHECK_INTERVAL_MINUTES deve ser um inteiro. "
-                f"Recebido: {type(self.CHECK_INTERVAL_MINUTES)}"
-            )
-        
-        if not (MIN_CHECK_INTERVAL_MINUTES <= self.CHECK_INTERVAL_MINUTES <= MAX_CHECK_INTERVAL_MINUTES):
+        if not _URL_RE.match(self.SITE_URL.strip()):
             raise ValueError(
-                f"CHECK_INTERVAL_MINUTES deve estar entre "
-                f"{MIN_CHECK_INTERVAL_MINUTES} e {MAX_CHECK_INTERVAL_MINUTES}. "
-                f"Recebido: {self.CHECK_INTERVAL_MINUTES}"
+                f"SITE_URL inválida: deve ser uma URL completa "
+                f"(ex: https://example.com). Recebido: {self.SITE_URL}"
             )
         
-        if not isinstance(self.CHECK_INTERVAL_HOURS, int):
-            raise TypeError(
-                f"CHECK_INTERVAL_HOURS deve ser um inteiro. "
-                f"Recebido: {type(self.CHECK_INTERVAL_HOURS)}"
-            )
-        
-        if not (MIN_CHECK_INTERVAL_HOURS <= self.CHECK_INTERVAL_HOURS <= MAX_CHECK_INTERVAL_HOURS):
-            raise ValueError(
-                f"CHECK_INTERVAL_HOURS deve estar entre "
-                f"{MIN_CHECK_INTERVAL_HOURS} e {MAX_CHECK_INTERVAL_HOURS}. "
-                f"Recebido: {self.CHECK_INTERVAL_HOURS}"
-            )
-        
-        if not isinstance(self.DAILY_REPORT_HOUR, int):
-            raise TypeError(
-                f"DAILY_REPORT_HOUR deve ser um inteiro. "
-                f"Recebido: {type(self.DAILY_REPORT_HOUR)}"
-            )
-        
-        if not (MIN_DAILY_REPORT_HOUR <= self.DAILY_REPORT_HOUR <= MAX_DAILY_REPORT_HOUR):
+        if not _URL_RE.match(self.PORTAL_URL.strip()):
             raise ValueError(
-                f"DAILY_REPORT_HOUR deve estar entre "
-                f"{MIN_DAILY_REPORT_HOUR} e {MAX_DAILY_REPORT_HOUR}. "
-                f"Recebido: {self.DAILY_REPORT_HOUR}"
+                f"PORTAL_URL inválida: deve ser uma URL completa "
+                f"(ex: https://example.com). Recebido: {self.PORTAL_URL}"
             )
         
-        if not isinstance(self.DASHBOARD_PORT, int):
-            raise TypeError(
-                f"DASHBOARD_PORT deve ser um inteiro. "
-                f"Recebido: {type(self.DASHBOARD_PORT)}"
-            )
-        
-        if not (MIN_DASHBOARD_PORT <= self.DASHBOARD_PORT <= MAX_DASHBOARD_PORT):
-            raise ValueError(
-                f"DASHBOARD_PORT deve estar entre "
-                f"{MIN_DASHBOARD_PORT} e {MAX_DASHBOARD_PORT}. "
-                f"Recebido: {self.DASHBOARD_PORT}"
-            )
+        # Normaliza URLs (remove espaços)
+        object.__setattr__(self, "SITE_URL", self.SITE_URL.strip())
+        object.__setattr__(self, "PORTAL_URL", self.PORTAL_URL.strip())
     
-    def _validate_ssl_settings(self) -> None:
-        """Valida configurações SSL/TLS."""
-        if not isinstance(self.SSL_EXPIRATION_WARNING_DAYS, int):
-            raise TypeError(
-                f"SSL_EXPIRATION_WARNING_DAYS deve ser um inteiro. "
-                f"Recebido: {type(self.SSL_EXPIRATION_WARNING_DAYS)}"
-            )
-        
-        if not (MIN_SSL_EXPIRATION_WARNING_DAYS <= self.SSL_EXPIRATION_WARNING_DAYS <= MAX_SSL_EXPIRATION_WARNING_DAYS):
-            raise ValueError(
-                f"SSL_EXPIRATION_WARNING_DAYS deve estar entre "
-                f"{MIN_SSL_EXPIRATION_WARNING_DAYS} e {MAX_SSL_EXPIRATION_WARNING_DAYS}. "
-                f"Recebido: {self.SSL_EXPIRATION_WARNING_DAYS}"
-            )
+    def _validate_numeric_values(self) -> None:
+        """Valida valores inteiros dentro dos limites de _INT_BOUNDS."""
+        for name, min_value, max_value in _INT_BOUNDS:
+            value = getattr(self, name)
+            if type(value) is not int:
+                raise TypeError(
+                    f"{name} deve ser um inteiro. "
+                    f"Recebido: {type(value)}"
+                )
+            
+            if not (min_value <= value <= max_value):
+                raise ValueError(
+                    f"{name} deve estar entre "
+                    f"{min_value} e {max_value}. "
+                    f"Recebido: {value}"
+                )
     
     def _validate_slack_webhook(self) -> None:
         """Valida o formato da URL do webhook do Slack (se fornecido)."""
@@ -238,24 +231,21 @@ class Settings:
                 object.__setattr__(self, "SLACK_WEBHOOK", None)
                 return
             
-            try:
-                parsed = urlparse(webhook)
-                if not parsed.scheme or not parsed.netloc:
-                    raise ValueError(
-                        f"SLACK_WEBHOOK inválida: deve ser uma URL completa. "
-                        f"Recebido: {webhook}"
-                    )
-                
-                # Valida se é uma URL do Slack
-                if "slack.com" not in parsed.netloc and "hooks.slack.com" not in parsed.netloc:
-                    logger.warning(
-                        f"SLACK_WEBHOOK pode não ser uma URL válida do Slack: {webhook}"
-                    )
-                
-                # Normaliza URL
-                object.__setattr__(self, "SLACK_WEBHOOK", webhook)
-            except Exception as e:
-                raise ValueError(f"SLACK_WEBHOOK inválida: {e}") from e
+            match = _URL_RE.match(webhook)
+            if not match:
+                raise ValueError(
+                    f"SLACK_WEBHOOK inválida: deve ser uma URL completa. "
+                    f"Recebido: {webhook}"
+                )
+            
+            # Valida se é uma URL do Slack
+            if "slack.com" not in match.group(1):
+                logger.warning(
+                    f"SLACK_WEBHOOK pode não ser uma URL válida do Slack: {webhook}"
+                )
+            
+            # Normaliza URL
+            object.__setattr__(self, "SLACK_WEBHOOK", webhook)
     
     def _validate_timezone(self) -> None:
         """Valida e configura o timezone."""
@@ -273,6 +263,33 @@ class Settings:
                 f"(ex: 'America/Sao_Paulo', 'UTC'). Erro: {e}"
             ) from e
     
+    def utc_offset_seconds(self, timestamp: Optional[float] = None) -> int:
+        """
+        Retorna o offset UTC do timezone configurado, em segundos.
+        
+        O offset é calculado pelo ZoneInfo no máximo uma vez a cada
+        TZ_OFFSET_CACHE_GRANULARITY_SECONDS, permitindo gerar horários
+        locais com time.gmtime(timestamp + offset) sem criar datetimes.
+        
+        Args:
+            timestamp: Instante Unix de referência (padrão: agora).
+            
+        Returns:
+            Offset em segundos (ex: -10800 para America/Sao_Paulo).
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        
+        cache = self._tz_offset_cache
+        if timestamp >= cache[1] or timestamp < cache[1] - TZ_OFFSET_CACHE_GRANULARITY_SECONDS:
+            offset = datetime.fromtimestamp(timestamp, self.tz).utcoffset()
+            cache[0] = int(offset.total_seconds()) if offset is not None else 0
+            cache[1] = (
+                timestamp // TZ_OFFSET_CACHE_GRANULARITY_SECONDS + 1
+            ) * TZ_OFFSET_CACHE_GRANULARITY_SECONDS
+        
+        return cache[0]
+    
     def _initialize_directories(self) -> None:
         """Inicializa os caminhos dos diretórios derivados."""
         object.__setattr__(self, "FAIL_DIR", self.BASE_DIR / "failures")
@@ -280,18 +297,48 @@ class Settings:
         object.__setattr__(self, "MONTHLY_DIR", self.BASE_DIR / "monthly")
         object.__setattr__(self, "LOG_FILE", self.BASE_DIR / "logs.jsonl")
     
-    def _create_directories(self) -> None:
-        """Cria os diretórios necessários se não existirem."""
-        directories = (self.BASE_DIR, self.FAIL_DIR, self.DAILY_DIR, self.MONTHLY_DIR)
+    def ensure_dirs(self) -> None:
+        """
+        Cria os diretórios necessários se não existirem.
+        
+        Deve ser chamado pelos pontos de entrada que gravam relatórios,
+        logs ou screenshots, e não a cada instanciação de Settings.
         
-        for directory in directories:
-            try:
-                directory.mkdir(parents=True, exist_ok=True)
-                logger.debug(f"Diretório verificado/criado: {directory}")
-            except OSError as e:
-                raise OSError(
-                    f"Não foi possível criar o diretório {directory}: {e}"
-                ) from e
+        Raises:
+            OSError: Se não for possível criar algum diretório.
+        """
+        # Uma única listagem de BASE_DIR evita um stat/mkdir por diretório
+        # no caso comum em que tudo já existe
+        try:
+            with os.scandir(self.BASE_DIR) as entries:
+                existing = {entry.name for entry in entries if entry.is_dir()}
+        except FileNotFoundError:
+            existing = set()
+            self._make_dir(self.BASE_DIR, parents=True)
+        
+        for directory in (self.FAIL_DIR, self.DAILY_DIR, self.MONTHLY_DIR):
+            if directory.name not in existing:
+                self._make_dir(directory)
+    
+    @staticmethod
+    def _make_dir(directory: Path, parents: bool = False) -> None:
+        """
+        Cria um diretório, tolerando que ele já exista.
+        
+        Args:
+            directory: Diretório a criar.
+            parents: Se True, cria também os diretórios pais.
+            
+        Raises:
+            OSError: Se não for possível criar o diretório.
+        """
+        try:
+            directory.mkdir(parents=parents, exist_ok=True)
+            logger.debug(f"Diretório criado: {directory}")
+        except OSError as e:
+            raise OSError(
+                f"Não foi possível criar o diretório {directory}: {e}"
+            ) from e
 
 
 def _get_env_int(
@@ -343,6 +390,35 @@ def _get_env_int(
     return value
 
 
+def _get_env_bool(key: str, default: bool) -> bool:
+    """
+    Obtém um valor booleano de uma variável de ambiente.
+    
+    Args:
+        key: Nome da variável de ambiente.
+        default: Valor padrão se a variável não existir ou estiver vazia.
+    
+    Returns:
+        Valor booleano da variável de ambiente ou valor padrão.
+    
+    Raises:
+        ValueError: Se o valor não for reconhecido como booleano.
+    """
+    value_str = os.getenv(key, "").strip().lower()
+    if not value_str:
+        return default
+    
+    if value_str in _TRUE_VALUES:
+        return True
+    if value_str in _FALSE_VALUES:
+        return False
+    
+    raise ValueError(
+        f"Variável de ambiente {key} deve ser booleana (true/false). "
+        f"Recebido: '{value_str}'"
+    )
+
+
 def _get_env_str(key: str, default: str) -> str:
     """
     Obtém uma string de uma variável de ambiente.
@@ -358,6 +434,34 @@ def _get_env_str(key: str, default: str) -> str:
     return value.strip() if value else default
 
 
+def _load_dotenv_cached(env_file: Optional[str] = None) -> Any:
+    """
+    Carrega o arquivo .env apenas se ele mudou desde a última carga.
+    
+    Args:
+        env_file: Caminho opcional para o arquivo .env (mesmo significado
+                 que em load_settings).
+    
+    Returns:
+        Retorno de load_dotenv na carga que está em cache.
+    """
+    # Sem env_file, resolve o arquivo como load_dotenv faria (find_dotenv
+    # procura a partir do diretório deste módulo e sobe até a raiz)
+    dotenv_path = env_file or find_dotenv()
+    try:
+        mtime = os.stat(dotenv_path).st_mtime if dotenv_path else 0.0
+    except OSError:
+        mtime = 0.0
+    
+    cached = _DOTENV_CACHE.get(env_file)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    result = load_dotenv(dotenv_path or None)
+    _DOTENV_CACHE[env_file] = (mtime, result)
+    return result
+
+
 def load_settings(env_file: Optional[str] = None) -> Settings:
     """
     Carrega as configurações do sistema a partir de variáveis de ambiente.
@@ -375,7 +479,6 @@ def load_settings(env_file: Optional[str] = None) -> Settings:
     Raises:
         ValueError: Se alguma configuração obrigatória estiver faltando ou
                    for inválida.
-        OSError: Se não for possível criar os diretórios necessários.
     
     Example:
         ```python
@@ -387,7 +490,7 @@ def load_settings(env_file: Optional[str] = None) -> Settings:
         ```
     """
     # Carrega variáveis de ambiente do arquivo .env
-    env_path = load_dotenv(env_file)
+    env_path = _load_dotenv_cached(env_file)
     
     if env_path:
         logger.info(f"Variáveis de ambiente carregadas de: {env_path}")
@@ -444,6 +547,19 @@ def load_settings(env_file: Optional[str] = None) -> Settings:
                 min_value=MIN_SSL_EXPIRATION_WARNING_DAYS,
                 max_value=MAX_SSL_EXPIRATION_WARNING_DAYS
             ),
+            USE_UVLOOP=_get_env_bool("USE_UVLOOP", DEFAULT_USE_UVLOOP),
+            LOAD_TEST_MAX_WORKERS=_get_env_int(
+                "LOAD_TEST_MAX_WORKERS",
+                DEFAULT_LOAD_TEST_MAX_WORKERS,
+                min_value=MIN_LOAD_TEST_MAX_WORKERS,
+                max_value=MAX_LOAD_TEST_MAX_WORKERS
+            ),
+            LOAD_TEST_RESERVOIR_SIZE=_get_env_int(
+                "LOAD_TEST_RESERVOIR_SIZE",
+                DEFAULT_LOAD_TEST_RESERVOIR_SIZE,
+                min_value=MIN_LOAD_TEST_RESERVOIR_SIZE,
+                max_value=MAX_LOAD_TEST_RESERVOIR_SIZE
+            ),
         )
         
         logger.info("Configurações carregadas com sucesso")
@@ -4,16 +4,38 @@ Módulo de dashboard em tempo real para monitoramento de saúde do sistema.
 Fornece uma interface web (Flask) para visualizar status, métricas e histórico
 de erros em tempo real, com charts e atualizações automáticas.
 """
+import gzip
+import hashlib
 import json
 import logging
+import mimetypes
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from threading import Thread
-from typing import Dict, Any
+from threading import BoundedSemaphore, Event, Lock, Thread
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
 
-from flask import Flask, render_template_string, jsonify, send_from_directory
+from flask import Flask, Response, request, send_from_directory
 from werkzeug.serving import make_server
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fallback para o json da stdlib
+    orjson = None
+
+try:
+    from waitress import create_server
+except ImportError:  # pragma: no cover - fallback para o servidor do werkzeug
+    create_server = None
+
+try:
+    import rcssmin
+    import rjsmin
+except ImportError:  # pragma: no cover - minificação apenas por linhas
+    rcssmin = rjsmin = None
+
 from config import Settings
 from error_history import ErrorHistory
 
@@ -21,6 +43,134 @@ logger = logging.getLogger(__name__)
 
 # Configuração Flask
 STATIC_DIR = Path(__file__).parent / "dashboard_static"
+STATIC_MAX_AGE_SECONDS = 365 * 24 * 3600  # Assets versionados pelo nome do arquivo
+STATIC_CACHE_CONTROL = f"public, max-age={STATIC_MAX_AGE_SECONDS}, immutable"
+CHART_JS_CDN_URL = "https://cdn.jsdelivr.net/npm/chart.js"
+# Chart.js servido localmente quando vendorizado em dashboard_static/;
+# caso contrário, a página aponta direto para a CDN
+CHART_JS_SRC = (
+    "/static/chart.min.js"
+    if (STATIC_DIR / "chart.min.js").is_file()
+    else CHART_JS_CDN_URL
+)
+_SCRIPT_BLOCK_RE = re.compile(r"(<script>)(.*?)(</script>)", re.DOTALL)
+_STYLE_BLOCK_RE = re.compile(r"(<style>)(.*?)(</style>)", re.DOTALL)
+JSON_MIMETYPE = "application/json"
+HTML_MIMETYPE = "text/html"
+SERVER_HOST = "0.0.0.0"
+SERVER_THREADS = 8  # Requisições atendidas em paralelo pelo waitress
+API_CACHE_KEYS = ("health", "history", "patterns")
+AGGREGATION_WORKERS = len(API_CACHE_KEYS)  # Payloads da API montados em paralelo
+SSE_POLL_INTERVAL_SECONDS = 2  # Frequência de verificação de mudanças no histórico
+# Comentário SSE enviado sem mudanças: mantém a conexão e detecta clientes
+# desconectados (liberando a vaga do stream) em no máximo este intervalo
+SSE_HEARTBEAT_SECONDS = 10
+SSE_HEARTBEAT_EVENT = b": ping\n\n"
+# Cada stream SSE ocupa uma thread do servidor: metade fica reservada à API
+SSE_MAX_CLIENTS = SERVER_THREADS // 2
+API_CACHE_TTL_SECONDS = 10  # Respostas da API compartilhadas entre clientes
+SERVER_SHUTDOWN_TIMEOUT_SECONDS = 5  # Espera máxima pelas threads do servidor em stop()
+
+
+def _json_default(value: Any) -> Any:
+    """Serializa tipos não suportados pelo json da stdlib (fallback)."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Tipo não serializável em JSON: {type(value).__name__}")
+
+
+def _dumps_json(payload: Any) -> bytes:
+    """
+    Serializa um payload para JSON em bytes.
+    
+    Usa orjson quando disponível (datetimes serializados nativamente);
+    caso contrário, recorre ao módulo json da stdlib.
+    
+    Args:
+        payload: Objeto a serializar.
+        
+    Returns:
+        JSON codificado em UTF-8.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+    return json.dumps(payload, ensure_ascii=False, default=_json_default).encode("utf-8")
+
+
+def _minify_html(html: str) -> str:
+    """
+    Minifica a página do dashboard (executado uma vez, na importação).
+    
+    Remove indentação e linhas em branco; se rjsmin/rcssmin estiverem
+    instalados, também minifica o conteúdo dos blocos <script> e <style>.
+    As quebras de linha são mantidas, preservando a semântica do JS.
+    
+    Args:
+        html: Página HTML original.
+        
+    Returns:
+        Página minificada.
+    """
+    if rjsmin is not None and rcssmin is not None:
+        html = _SCRIPT_BLOCK_RE.sub(
+            lambda m: m.group(1) + rjsmin.jsmin(m.group(2)) + m.group(3), html
+        )
+        html = _STYLE_BLOCK_RE.sub(
+            lambda m: m.group(1) + rcssmin.cssmin(m.group(2)) + m.group(3), html
+        )
+    
+    return "\n".join(line.strip() for line in html.splitlines() if line.strip())
+
+
+def _make_etag(body: bytes) -> str:
+    """
+    Calcula um ETag forte (entre aspas) a partir do corpo da resposta.
+    
+    Args:
+        body: Corpo serializado.
+        
+    Returns:
+        Hash BLAKE2b de 8 bytes em hexadecimal, entre aspas.
+    """
+    return f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def _shutdown_waitress(server: Any) -> None:
+    """
+    Encerra o laço de eventos de um servidor waitress.
+
+    O laço só termina quando não resta nenhum canal no seu mapa; fechar
+    apenas o socket de escuta deixa o laço (e as conexões abertas)
+    ativos. O fechamento de todos os canais (escuta, trigger e conexões)
+    é feito na própria thread do laço, via trigger.
+
+    Args:
+        server: Servidor retornado por waitress.create_server.
+    """
+    def close_channels() -> None:
+        for channel in list(server._map.values()):
+            channel.close()
+
+    try:
+        server.trigger.pull_trigger(close_channels)
+    except OSError:
+        # O laço já executou close_channels (acordado por outra thread)
+        # e fechou o trigger antes da escrita que o acordaria
+        pass
+
+
+def _json_response(payload: Any, status: int = 200) -> Response:
+    """
+    Cria uma resposta JSON serializada por _dumps_json.
+    
+    Args:
+        payload: Objeto a serializar.
+        status: Código HTTP da resposta.
+        
+    Returns:
+        Response com Content-Type application/json.
+    """
+    return Response(_dumps_json(payload), status=status, mimetype=JSON_MIMETYPE)
 
 
 class HealthDashboard:
@@ -47,8 +197,22 @@ class HealthDashboard:
         self.port = port
         self.error_history = ErrorHistory(settings)
         
-        # Cria aplicação Flask
-        self.app = Flask(__name__)
+        # Cache das respostas da API já serializadas:
+        # chave -> (expira_em, versão do histórico, corpo JSON, ETag)
+        self._api_cache: Dict[str, Tuple[float, Hashable, bytes, str]] = {}
+        # Um lock por rota: rotas diferentes podem ser recalculadas em paralelo
+        self._api_cache_locks = {key: Lock() for key in API_CACHE_KEYS}
+        
+        # Pool para montar os payloads independentes em paralelo, criado a
+        # cada start() (stop() o encerra)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        
+        # Sinaliza às conexões SSE abertas que o servidor está parando
+        self._stop_event = Event()
+        self._sse_slots = BoundedSemaphore(SSE_MAX_CLIENTS)
+        
+        # Cria aplicação Flask (a rota /static é registrada em _register_routes)
+        self.app = Flask(__name__, static_folder=None)
         self.server = None
         self.thread = None
         
@@ -63,19 +227,48 @@ class HealthDashboard:
             logger.warning("Dashboard já está rodando")
             return
         
-        self.server = make_server("0.0.0.0", self.port, self.app)
-        self.thread = Thread(target=self.server.serve_forever, daemon=True)
+        self._stop_event.clear()
+        self._pool = ThreadPoolExecutor(
+            max_workers=AGGREGATION_WORKERS,
+            thread_name_prefix="dashboard"
+        )
+        # Leituras frequentes: mantém o arquivo de histórico aberto
+        self.error_history.open_reader()
+        if create_server is not None:
+            # Servidor WSGI de produção com pool de threads
+            self.server = create_server(
+                self.app, host=SERVER_HOST, port=self.port, threads=SERVER_THREADS
+            )
+            serve = self.server.run
+        else:
+            logger.warning("waitress não instalado; usando servidor do werkzeug")
+            self.server = make_server(SERVER_HOST, self.port, self.app, threaded=True)
+            serve = self.server.serve_forever
+        
+        self.thread = Thread(target=serve, daemon=True)
         self.thread.start()
         
-        logger.info(f"Dashboard iniciado em http://0.0.0.0:{self.port}")
+        logger.info(f"Dashboard iniciado em http://{SERVER_HOST}:{self.port}")
 
     def stop(self) -> None:
-        """Para o servidor Flask."""
+        """Para o servidor Flask, libera a porta e aguarda a thread do servidor."""
         if self.server is None:
             return
         
-        self.server.shutdown()
+        self._stop_event.set()
+        if create_server is not None:
+            _shutdown_waitress(self.server)
+            self.thread.join(timeout=SERVER_SHUTDOWN_TIMEOUT_SECONDS)
+            self.server.task_dispatcher.shutdown(timeout=SERVER_SHUTDOWN_TIMEOUT_SECONDS)
+        else:
+            self.server.shutdown()
+            self.server.server_close()
+            self.thread.join(timeout=SERVER_SHUTDOWN_TIMEOUT_SECONDS)
         self.server = None
+        self.thread = None
+        self._pool.shutdown(wait=False)
+        self._pool = None
+        self.error_history.close_reader()
         
         logger.info("Dashboard parado")
 
@@ -83,68 +276,275 @@ class HealthDashboard:
         """Registra as rotas do Flask."""
         
         @self.app.route("/")
-        def index() -> str:
-            """Página principal do dashboard."""
-            return render_template_string(self._get_html_template())
+        def index() -> Response:
+            """Página principal do dashboard (gzip quando aceito pelo cliente)."""
+            if "gzip" in request.headers.get("Accept-Encoding", ""):
+                body = _HTML_GZIP_BYTES
+                headers = {"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+            else:
+                body = _HTML_BYTES
+                headers = {"Vary": "Accept-Encoding"}
+            headers["Content-Length"] = str(len(body))
+            return Response(body, mimetype=HTML_MIMETYPE, headers=headers)
 
         @self.app.route("/api/health")
-        def api_health() -> Dict[str, Any]:
+        def api_health() -> Response:
             """API: Status de saúde atual."""
             try:
-                reliability = {
-                    "24h": self.error_history.get_reliability_score(days_lookback=1),
-                    "7d": self.error_history.get_reliability_score(days_lookback=7),
-                    "30d": self.error_history.get_reliability_score(days_lookback=30),
-                }
-                
-                mttr = {
-                    "24h": self.error_history.get_mttr(days_lookback=1),
-                    "7d": self.error_history.get_mttr(days_lookback=7),
-                }
-                
-                error_summary = self.error_history.get_error_summary(hours_lookback=24)
-                
-                return jsonify({
-                    "timestamp": datetime.now(self.settings.tz).isoformat(),
-                    "reliability": reliability,
-                    "mttr_minutes": mttr,
-                    "recent_errors": error_summary.get("total_errors", 0),
-                    "error_summary": error_summary,
-                })
+                return self._cached_json_response("health", self._build_health)
             except Exception as e:
                 logger.error(f"Erro na API /health: {e}")
-                return jsonify({"error": str(e)}), 500
+                return _json_response({"error": str(e)}, status=500)
 
         @self.app.route("/api/patterns")
-        def api_patterns() -> Dict[str, Any]:
+        def api_patterns() -> Response:
             """API: Padrões de falha detectados."""
             try:
-                patterns = self.error_history.detect_patterns(days_lookback=7)
-                return jsonify(patterns)
+                return self._cached_json_response("patterns", self._build_patterns)
             except Exception as e:
                 logger.error(f"Erro na API /patterns: {e}")
-                return jsonify({"error": str(e)}), 500
+                return _json_response({"error": str(e)}, status=500)
 
         @self.app.route("/api/history")
-        def api_history() -> Dict[str, Any]:
+        def api_history() -> Response:
             """API: Histórico recente de erros."""
             try:
-                error_summary = self.error_history.get_error_summary(hours_lookback=24)
-                return jsonify(error_summary)
+                return self._cached_json_response("history", self._build_history)
             except Exception as e:
                 logger.error(f"Erro na API /history: {e}")
-                return jsonify({"error": str(e)}), 500
+                return _json_response({"error": str(e)}, status=500)
+
+        @self.app.route("/api/all")
+        def api_all() -> Response:
+            """API: health, history e patterns em uma única resposta."""
+            try:
+                body = self._build_combined_body()
+                return self._conditional_json_response(body, _make_etag(body))
+            except Exception as e:
+                logger.error(f"Erro na API /all: {e}")
+                return _json_response({"error": str(e)}, status=500)
+
+        @self.app.route("/api/stream")
+        def api_stream() -> Response:
+            """API: Server-Sent Events com health, history e patterns."""
+            if not self._sse_slots.acquire(blocking=False):
+                # Limite de streams atingido: o cliente passa a usar /api/all
+                return _json_response(
+                    {"error": "Limite de conexões de streaming atingido"}, status=503
+                )
+            
+            slot_held = [True]
+
+            def release_slot() -> None:
+                # Chamado pelo fim do gerador e pelo fechamento da resposta:
+                # a vaga é liberada uma única vez
+                if slot_held and slot_held.pop():
+                    self._sse_slots.release()
+
+            response = Response(
+                self._stream_events(release_slot),
+                mimetype="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
+            response.call_on_close(release_slot)
+            return response
+
+        @self.app.route("/static/<path:filename>")
+        def static_asset(filename: str) -> Response:
+            """Assets locais (Chart.js etc.), com cache de longa duração."""
+            return self._send_static(filename)
+
+    def _send_static(self, filename: str) -> Response:
+        """
+        Envia um arquivo de STATIC_DIR com cache de longa duração.
+
+        Se existir uma versão pré-comprimida (arquivo + ".gz") e o cliente
+        aceitar gzip, ela é enviada no lugar do original. O envio é
+        condicional (ETag/Last-Modified, 304) e o arquivo é repassado ao
+        servidor via wsgi.file_wrapper, sem ser lido pela aplicação.
+
+        Args:
+            filename: Caminho do arquivo relativo a STATIC_DIR.
+
+        Returns:
+            Response com o conteúdo do arquivo.
+        """
+        gzip_name = f"{filename}.gz"
+        if (
+            "gzip" in request.headers.get("Accept-Encoding", "")
+            and (STATIC_DIR / gzip_name).is_file()
+        ):
+            mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            response = send_from_directory(
+                STATIC_DIR, gzip_name, mimetype=mimetype,
+                conditional=True, max_age=STATIC_MAX_AGE_SECONDS
+            )
+            response.headers["Content-Encoding"] = "gzip"
+        else:
+            response = send_from_directory(
+                STATIC_DIR, filename,
+                conditional=True, max_age=STATIC_MAX_AGE_SECONDS
+            )
+        
+        response.headers["Cache-Control"] = STATIC_CACHE_CONTROL
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+    def _cached_json_response(self, key: str, builder: Callable[[], Any]) -> Response:
+        """
+        Retorna a resposta JSON de uma rota da API, usando cache com TTL.
+
+        O corpo serializado é reaproveitado por API_CACHE_TTL_SECONDS, ou até
+        o arquivo de histórico mudar, de modo que vários dashboards abertos
+        compartilham o mesmo cálculo (e a mesma serialização). A resposta
+        leva um ETag; se o cliente já tiver o mesmo conteúdo
+        (If-None-Match), responde 304 sem corpo.
+
+        Args:
+            key: Chave da rota no cache.
+            builder: Função que monta o payload em caso de cache miss.
 
-    def _get_html_template(self) -> str:
-        """Retorna template HTML do dashboard."""
-        return """
-<!DOCTYPE html>
+        Returns:
+            Response com o JSON da rota.
+        """
+        body, etag = self._get_cached_body(key, builder)
+        return self._conditional_json_response(body, etag)
+
+    def _conditional_json_response(self, body: bytes, etag: str) -> Response:
+        """
+        Responde com o corpo JSON, ou 304 se o cliente já tiver o mesmo ETag.
+
+        Args:
+            body: Corpo JSON serializado.
+            etag: ETag do corpo.
+
+        Returns:
+            Response 200 com o corpo, ou 304 sem corpo.
+        """
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if request.headers.get("If-None-Match") == etag:
+            return Response(status=304, headers=headers)
+        return Response(body, mimetype=JSON_MIMETYPE, headers=headers)
+
+    def _get_cached_body(self, key: str, builder: Callable[[], Any]) -> Tuple[bytes, str]:
+        """
+        Retorna o corpo JSON em cache de uma rota, recalculando se expirado.
+
+        Args:
+            key: Chave da rota no cache.
+            builder: Função que monta o payload em caso de cache miss.
+
+        Returns:
+            Tupla (corpo serializado, ETag).
+        """
+        version = self.error_history.get_history_version()
+        with self._api_cache_locks[key]:
+            now = time.monotonic()
+            entry = self._api_cache.get(key)
+            if entry is None or entry[0] <= now or entry[1] != version:
+                body = _dumps_json(builder())
+                entry = (now + API_CACHE_TTL_SECONDS, version, body, _make_etag(body))
+                self._api_cache[key] = entry
+        
+        return entry[2], entry[3]
+
+    def _build_combined_body(self) -> bytes:
+        """
+        Monta o JSON {"health", "history", "patterns"} a partir dos corpos
+        já serializados em cache, sem serializar os payloads novamente.
+
+        Os corpos expirados são recalculados em paralelo no pool; antes de
+        start() (p.ex. app usada diretamente), em sequência nesta thread.
+        """
+        parts = (
+            ("health", self._build_health),
+            ("history", self._build_history),
+            ("patterns", self._build_patterns),
+        )
+        pool = self._pool
+        if pool is None:
+            bodies = [self._get_cached_body(key, builder)[0] for key, builder in parts]
+        else:
+            futures = [pool.submit(self._get_cached_body, key, builder) for key, builder in parts]
+            bodies = [future.result()[0] for future in futures]
+        
+        health, history, patterns = bodies
+        return b'{"health":' + health + b',"history":' + history + b',"patterns":' + patterns + b"}"
+
+    def _stream_events(self, on_close: Callable[[], None]) -> Iterator[bytes]:
+        """
+        Gera os eventos de /api/stream.
+
+        Envia o estado completo ao conectar e sempre que o arquivo de
+        histórico muda; sem mudanças, envia apenas o comentário
+        SSE_HEARTBEAT_EVENT a cada SSE_HEARTBEAT_SECONDS. Encerra quando o
+        dashboard é parado.
+
+        Args:
+            on_close: Chamada ao fim do stream, inclusive quando o servidor
+                fecha o gerador (GeneratorExit) após o cliente desconectar.
+
+        Yields:
+            Eventos SSE ("data: <json>" seguido de linha em branco) ou o
+            comentário de heartbeat.
+        """
+        last_version: Any = object()  # Força o envio inicial
+        last_sent = 0.0
+        try:
+            while not self._stop_event.is_set():
+                version = self.error_history.get_history_version()
+                now = time.monotonic()
+                if version != last_version:
+                    try:
+                        yield b"data: " + self._build_combined_body() + b"\n\n"
+                    except Exception as e:
+                        logger.error(f"Erro na API /stream: {e}")
+                    last_version = version
+                    last_sent = now
+                elif now - last_sent >= SSE_HEARTBEAT_SECONDS:
+                    yield SSE_HEARTBEAT_EVENT
+                    last_sent = now
+                self._stop_event.wait(SSE_POLL_INTERVAL_SECONDS)
+        finally:
+            on_close()
+
+    def _build_health(self) -> Dict[str, Any]:
+        """
+        Monta o payload de /api/health.
+
+        Confiabilidade, MTTR e resumo de erros vêm de uma única leitura do
+        histórico (ErrorHistory.compute_health_bundle).
+        """
+        bundle = self.error_history.compute_health_bundle()
+        error_summary = bundle["error_summary"]
+        
+        return {
+            "timestamp": datetime.now(self.settings.tz),
+            "reliability": bundle["reliability"],
+            "mttr_minutes": bundle["mttr_minutes"],
+            "recent_errors": error_summary.get("total_errors", 0),
+            "error_summary": error_summary,
+        }
+
+    def _build_patterns(self) -> Dict[str, Any]:
+        """Monta o payload de /api/patterns (inclui hourly_error_rate)."""
+        return self.error_history.detect_patterns(days_lookback=7)
+
+    def _build_history(self) -> Dict[str, Any]:
+        """Monta o payload de /api/history."""
+        return self.error_history.get_error_summary(hours_lookback=24)
+
+
+# Página do dashboard: HTML estático (apenas a origem do Chart.js é
+# substituída), minificado, codificado e comprimido uma única vez na
+# importação do módulo
+_HTML_TEMPLATE = """<!DOCTYPE html>
 <html lang="pt-BR">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Health Dashboard - Sistema de Monitoramento</title>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
+    <script src="@CHART_JS_SRC@"></script>
     <style>
         * {
             margin: 0;
@@ -154,7 +554,8 @@ class HealthDashboard:
 
         body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            /* Degradê pré-composto em SVG: pintado uma vez, sem recomposição */
+            background: #6e65c6 url("data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 1 1' preserveAspectRatio='none'%3E%3ClinearGradient id='g' x2='1' y2='1'%3E%3Cstop stop-color='%23667eea'/%3E%3Cstop offset='1' stop-color='%23764ba2'/%3E%3C/linearGradient%3E%3Crect width='1' height='1' fill='url(%23g)'/%3E%3C/svg%3E") 0 0 / 100% 100% no-repeat;
             min-height: 100vh;
             padding: 20px;
         }
@@ -169,7 +570,7 @@ class HealthDashboard:
             border-radius: 8px;
             padding: 20px;
             margin-bottom: 20px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+            border: 1px solid #e5e7eb;
         }
 
         h1 {
@@ -194,13 +595,7 @@ class HealthDashboard:
             background: white;
             border-radius: 8px;
             padding: 20px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-            transition: transform 0.2s, box-shadow 0.2s;
-        }
-
-        .card:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 4px 12px rgba(0,0,0,0.15);
+            border: 1px solid #e5e7eb;
         }
 
         .card-title {
@@ -239,7 +634,7 @@ class HealthDashboard:
             background: white;
             border-radius: 8px;
             padding: 20px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+            border: 1px solid #e5e7eb;
             margin-bottom: 20px;
             position: relative;
             height: 400px;
@@ -261,7 +656,7 @@ class HealthDashboard:
             background: white;
             border-radius: 8px;
             padding: 20px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+            border: 1px solid #e5e7eb;
         }
 
         .error-item {
@@ -415,7 +810,7 @@ class HealthDashboard:
         </div>
 
         <!-- Padrões detectados -->
-        <div style="background: white; border-radius: 8px; padding: 20px; box-shadow: 0 2px 8px rgba(0,0,0,0.1); margin-top: 20px;">
+        <div style="background: white; border-radius: 8px; padding: 20px; border: 1px solid #e5e7eb; margin-top: 20px;">
             <div class="chart-title">Padrões de Falha Detectados (7 dias)</div>
             <div id="patterns-container" class="patterns-grid">
                 <div class="loading">
@@ -429,32 +824,53 @@ class HealthDashboard:
     <script>
         const API_BASE = '/api';
         let hourlyErrorsChart = null;
+        const HOUR_LABELS = Array.from({length: 24}, (_, h) => String(h).padStart(2, '0') + ':00');
+
+        // O servidor envia os dados ao conectar e sempre que o histórico muda;
+        // sem stream disponível, consulta a API a cada 30 segundos
+        document.addEventListener('DOMContentLoaded', () => {
+            if (!window.EventSource) {
+                startPolling();
+                return;
+            }
 
-        // Atualiza dados a cada 30 segundos
-        setInterval(updateDashboard, 30000);
+            const stream = new EventSource(API_BASE + '/stream');
+            stream.onmessage = event => {
+                try {
+                    applyAll(JSON.parse(event.data));
+                } catch (error) {
+                    console.error('Erro ao atualizar dashboard:', error);
+                }
+            };
+            // Stream recusado (p.ex. limite de conexões): volta ao polling
+            stream.onerror = () => {
+                if (stream.readyState === EventSource.CLOSED) startPolling();
+            };
+        });
 
-        // Carrega dados iniciais
-        document.addEventListener('DOMContentLoaded', updateDashboard);
+        function startPolling() {
+            updateDashboard();
+            setInterval(updateDashboard, 30000);
+        }
 
         async function updateDashboard() {
             try {
-                const [health, history, patterns] = await Promise.all([
-                    fetch(API_BASE + '/health').then(r => r.json()),
-                    fetch(API_BASE + '/history').then(r => r.json()),
-                    fetch(API_BASE + '/patterns').then(r => r.json()),
-                ]);
-
-                updateMetrics(health);
-                updateRecentErrors(history);
-                updatePatterns(patterns);
-                updateCharts(patterns);
-
-                document.getElementById('last-update').textContent = new Date().toLocaleTimeString('pt-BR');
+                const response = await fetch(API_BASE + '/all');
+                applyAll(await response.json());
             } catch (error) {
                 console.error('Erro ao atualizar dashboard:', error);
             }
         }
 
+        function applyAll({health, history, patterns}) {
+            updateMetrics(health);
+            updateRecentErrors(history);
+            updatePatterns(patterns);
+            updateCharts(patterns);
+
+            document.getElementById('last-update').textContent = new Date().toLocaleTimeString('pt-BR');
+        }
+
         function updateMetrics(health) {
             const setMetric = (id, value, unit = '') => {
                 const elem = document.getElementById(id);
@@ -547,27 +963,22 @@ class HealthDashboard:
             const ctx = document.getElementById('hourly-errors-chart');
             if (!ctx) return;
 
-            const timePatterns = patterns.time_patterns || {};
-            
-            // Extrai dados por hora
-            const hours = [];
-            const errorRates = [];
-            
-            for (let h = 0; h < 24; h++) {
-                const hourKey = `hour_${String(h).padStart(2, '0')}`;
-                const pattern = timePatterns[hourKey];
-                hours.push(String(h).padStart(2, '0') + ':00');
-                errorRates.push(pattern ? pattern.error_rate : 0);
-            }
+            // Taxa de erro por hora (0-23), já montada pelo servidor
+            const errorRates = patterns.hourly_error_rate || new Array(24).fill(0);
 
+            // Gráfico já criado: só atualiza os dados (e só se mudaram)
             if (hourlyErrorsChart) {
-                hourlyErrorsChart.destroy();
+                const dataset = hourlyErrorsChart.data.datasets[0];
+                if (dataset.data.every((value, i) => value === errorRates[i])) return;
+                dataset.data = errorRates;
+                hourlyErrorsChart.update('none');
+                return;
             }
 
             hourlyErrorsChart = new Chart(ctx, {
                 type: 'line',
                 data: {
-                    labels: hours,
+                    labels: HOUR_LABELS,
                     datasets: [{
                         label: 'Taxa de Erro (%)',
                         data: errorRates,
@@ -613,4 +1024,8 @@ class HealthDashboard:
     </script>
 </body>
 </html>
-        """
+"""
+_HTML_BYTES = _minify_html(
+    _HTML_TEMPLATE.replace("@CHART_JS_SRC@", CHART_JS_SRC)
+).encode("utf-8")
+_HTML_GZIP_BYTES = gzip.compress(_HTML_BYTES, compresslevel=9)
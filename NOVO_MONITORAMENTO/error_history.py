@@ -6,17 +6,51 @@ e tendências para alertas proativos sobre problemas recorrentes.
 """
 import json
 import logging
-from collections import defaultdict, Counter
+import os
+import queue
+import tempfile
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from typing import BinaryIO, Callable, Dict, Any, List, Mapping, Optional, Tuple, Union
+from dataclasses import dataclass
 from enum import Enum
+from itertools import compress, groupby
+from operator import itemgetter, not_
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fallback para o json da stdlib
+    orjson = None
 
 from config import Settings
 
 logger = logging.getLogger(__name__)
 
+# Registro do cache: (timestamp Unix, todos os componentes OK (0/1),
+# hora local do registro, id do tipo de erro, registro)
+HistoryEntry = Tuple[float, int, int, int, Dict[str, Any]]
+
+# Máximo de linhas por chamada a os.writev (IOV_MAX usual no Linux)
+WRITEV_MAX_BUFFERS = 1024
+
+# Bytes copiados por chamada ao compactar o histórico (ver _copy_tail)
+COPY_CHUNK_BYTES = 1024 * 1024
+
+# Validade (segundos) dos resultados de análise memorizados (ver _cached)
+ANALYTICS_CACHE_TTL_SECONDS = 10.0
+
+# Intervalo (segundos) em que flush() confere se a thread de escrita segue viva
+FLUSH_POLL_SECONDS = 0.5
+
+# Item da fila de escrita: linha serializada, marcador de flush (Event) ou
+# None para encerrar a thread de escrita
+_WriteItem = Union[bytes, threading.Event, None]
+
 
 class ErrorSeverity(Enum):
     """Níveis de severidade de erro."""
@@ -44,6 +78,90 @@ class ErrorType(Enum):
     UNKNOWN = "unknown"
 
 
+def _dumps_line(record: Dict[str, Any]) -> bytes:
+    """
+    Serializa um registro como uma linha JSONL em UTF-8.
+
+    Usa orjson quando disponível; caso contrário, recorre ao módulo json da
+    stdlib. As duas saídas são lidas indistintamente por _loads_line.
+
+    Args:
+        record: Registro a serializar.
+
+    Returns:
+        Linha JSON terminada em "\\n".
+    """
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _loads_line(line: bytes) -> Any:
+    """
+    Desserializa uma linha JSONL (orjson quando disponível).
+
+    Raises:
+        json.JSONDecodeError: Se a linha não for JSON válido (o erro do
+            orjson é subclasse dele).
+    """
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+def _copy_tail(src: BinaryIO, dst: BinaryIO, offset: int) -> int:
+    """
+    Copia o conteúdo de src a partir de offset para dst.
+
+    A cópia é feita em blocos, com os.copy_file_range quando disponível
+    (cópia dentro do kernel) e leitura/escrita comum caso contrário.
+
+    Args:
+        src: Arquivo de origem aberto em "rb" sem buffer.
+        dst: Arquivo de destino vazio, aberto em "wb" sem buffer.
+        offset: Posição do primeiro byte a copiar.
+
+    Returns:
+        Número de bytes copiados.
+    """
+    src_fd, dst_fd = src.fileno(), dst.fileno()
+    size = os.fstat(src_fd).st_size
+    pos, copied_total = offset, 0
+    use_copy_file_range = hasattr(os, "copy_file_range")
+    
+    while pos < size:
+        count = min(size - pos, COPY_CHUNK_BYTES)
+        copied = 0
+        if use_copy_file_range:
+            try:
+                copied = os.copy_file_range(src_fd, dst_fd, count, pos, copied_total)
+            except OSError:
+                # Sistema de arquivos sem suporte: segue com cópia comum
+                use_copy_file_range = False
+        if not copied:
+            src.seek(pos)
+            data = src.read(count)
+            if not data:
+                break
+            dst.seek(copied_total)
+            dst.write(data)
+            copied = len(data)
+        pos += copied
+        copied_total += copied
+    
+    return copied_total
+
+
+# Valores dos enums resolvidos uma única vez (evita o descritor .value de
+# Enum a cada registro)
+_ERROR_TYPE_VALUES = {member: member.value for member in ErrorType}
+_SEVERITY_VALUES = {member: member.value for member in ErrorSeverity}
+
+# Ids inteiros dos tipos de erro conhecidos; tipos desconhecidos lidos do
+# arquivo recebem ids seguintes em cada instância (ver _intern_error_type)
+_ERROR_TYPE_IDS = {member.value: i for i, member in enumerate(ErrorType)}
+
+
 @dataclass
 class ErrorRecord:
     """Registro de um erro detectado."""
@@ -57,8 +175,23 @@ class ErrorRecord:
     ok_playwright: bool
 
     def to_dict(self) -> Dict[str, Any]:
-        """Converte para dicionário."""
-        return asdict(self)
+        """
+        Converte para dicionário.
+
+        Ao contrário de dataclasses.asdict, não faz cópia profunda de
+        details: o dicionário passado não deve ser alterado depois de
+        registrado.
+        """
+        return {
+            "timestamp": self.timestamp,
+            "error_type": self.error_type,
+            "severity": self.severity,
+            "message": self.message,
+            "details": self.details,
+            "ok_ssl": self.ok_ssl,
+            "ok_http": self.ok_http,
+            "ok_playwright": self.ok_playwright,
+        }
 
 
 class ErrorHistory:
@@ -87,12 +220,224 @@ class ErrorHistory:
         # Garante que os diretórios existem
         self.history_file.parent.mkdir(parents=True, exist_ok=True)
         
+        # Serializa escritas concorrentes (verificações rodam em paralelo)
+        self._lock = threading.Lock()
+        
+        # Handle de escrita reaproveitado entre registros (ver _get_writer)
+        self._fh: Optional[BinaryIO] = None
+        
+        # Fila de linhas serializadas consumida pela thread de escrita (ver
+        # _run_writer): record_error só enfileira, sem esperar pelo disco
+        self._queue: "queue.SimpleQueue[_WriteItem]" = queue.SimpleQueue()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._writer_start_lock = threading.Lock()
+        self._closed = False
+        
+        # Descritor de leitura de longa duração (ver open_reader)
+        self._reader_enabled = False
+        self._reader_fd: Optional[int] = None
+        self._reader_lock = threading.Lock()
+        
+        # Registros já lidos do arquivo, em colunas paralelas: timestamp Unix,
+        # hora local e sucesso de todos os componentes, calculados uma única
+        # vez (ver _sync_records) e guardados em arrays tipados compactos;
+        # protegidos por self._reader_lock
+        self._records: List[Dict[str, Any]] = []
+        self._times = array("d")
+        self._hours = array("B")
+        self._oks = array("B")
+        self._records_offset = 0
+        self._records_ino: Optional[int] = None
+        # Posição no arquivo do início da linha de cada registro
+        self._offsets = array("q")
+        # Tipo de erro de cada registro como id inteiro: contagens e filtros
+        # comparam inteiros e só convertem para texto na saída
+        self._type_ids = array("H")
+        self._type_id_by_name: Dict[str, int] = dict(_ERROR_TYPE_IDS)
+        self._type_names: List[str] = list(_ERROR_TYPE_IDS)
+        # Máximo acumulado dos timestamps (não decrescente): o início de cada
+        # janela é encontrado por busca binária mesmo que escritas
+        # concorrentes gravem alguns registros fora de ordem
+        self._max_times = array("d")
+        # Se os timestamps estão em ordem cronológica estrita (ver
+        # _ensure_chronological)
+        self._times_sorted = True
+        
+        # Resultados das análises por (método, parâmetros): (versão do
+        # cache de registros, instante monotônico do cálculo, resultado)
+        self._analytics_cache: Dict[Tuple, Tuple[Tuple, float, Any]] = {}
+        self._analytics_lock = threading.Lock()
+        
         logger.debug(
             f"ErrorHistory inicializado: "
             f"history_file={self.history_file}, "
             f"patterns_file={self.patterns_file}"
         )
 
+    def __enter__(self) -> "ErrorHistory":
+        """Permite usar o histórico em um bloco with."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Fecha os arquivos do histórico ao sair do bloco with."""
+        self.close()
+
+    def close(self) -> None:
+        """
+        Grava os registros pendentes e fecha o handle de escrita e o
+        descritor de leitura do histórico.
+        """
+        with self._writer_start_lock:
+            self._closed = True
+            writer = self._writer_thread
+            self._writer_thread = None
+        if writer is not None:
+            self._queue.put(None)
+            if writer is not threading.current_thread():
+                writer.join()
+        
+        with self._lock:
+            self._close_writer()
+        self.close_reader()
+
+    def flush(self) -> None:
+        """
+        Aguarda a gravação de todos os registros já enfileirados.
+
+        Usado antes das leituras, para que elas vejam os registros feitos
+        por esta instância. Retorna também se a thread de escrita terminar
+        antes de liberar o marcador (por close() concorrente ou por erro).
+        """
+        writer = self._writer_thread
+        if writer is None or writer is threading.current_thread():
+            return
+        
+        done = threading.Event()
+        self._queue.put(done)
+        while not done.wait(FLUSH_POLL_SECONDS):
+            if not writer.is_alive():
+                return
+
+    def _write_lines(self, lines: List[bytes]) -> None:
+        """
+        Grava um lote de linhas no arquivo com uma única escrita.
+
+        Onde os.writev existe (POSIX), as linhas são entregues ao kernel em
+        uma única chamada de escrita vetorizada, sem concatená-las antes;
+        nos demais sistemas, são concatenadas e gravadas de uma vez.
+
+        Em caso de erro, o lote é descartado e o handle fechado (a próxima
+        escrita reabre o arquivo).
+
+        Args:
+            lines: Linhas JSONL serializadas.
+        """
+        with self._lock:
+            try:
+                fh = self._get_writer()
+                if hasattr(os, "writev"):
+                    fd = fh.fileno()
+                    for i in range(0, len(lines), WRITEV_MAX_BUFFERS):
+                        chunk = lines[i:i + WRITEV_MAX_BUFFERS]
+                        written = os.writev(fd, chunk)
+                        if written < sum(map(len, chunk)):
+                            # Escrita parcial: completa o restante do lote
+                            self._write_all(fh, memoryview(b"".join(chunk))[written:])
+                else:
+                    self._write_all(fh, memoryview(b"".join(lines)))
+            except OSError as e:
+                self._close_writer()
+                logger.error(f"Erro ao registrar erro no histórico: {e}", exc_info=True)
+
+    @staticmethod
+    def _write_all(fh: BinaryIO, data: memoryview) -> None:
+        """Grava data por completo no handle sem buffer (repete escritas parciais)."""
+        while data:
+            data = data[fh.write(data):]
+
+    def _enqueue(self, line: bytes) -> bool:
+        """
+        Enfileira uma linha para a thread de escrita, iniciando-a se necessário.
+
+        Args:
+            line: Linha JSONL serializada.
+
+        Returns:
+            False se o histórico já foi fechado (a linha não foi enfileirada).
+        """
+        with self._writer_start_lock:
+            if self._closed:
+                return False
+            if self._writer_thread is None:
+                self._writer_thread = threading.Thread(
+                    target=self._run_writer,
+                    name="error-history-writer",
+                    daemon=True
+                )
+                self._writer_thread.start()
+            self._queue.put(line)
+        return True
+
+    def _run_writer(self) -> None:
+        """
+        Consome a fila de escrita até receber None (enviado por close()).
+
+        A cada despertar, esvazia a fila e grava todas as linhas pendentes
+        com uma única escrita; em rajadas de erros os registros são
+        agrupados naturalmente. Marcadores de flush são liberados depois
+        que as linhas enfileiradas antes deles foram gravadas.
+        """
+        while True:
+            item = self._queue.get()
+            lines: List[bytes] = []
+            markers: List[threading.Event] = []
+            stop = False
+            
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    markers.append(item)
+                else:
+                    lines.append(item)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            
+            try:
+                if lines:
+                    self._write_lines(lines)
+            finally:
+                for marker in markers:
+                    marker.set()
+            if stop:
+                return
+
+    def _get_writer(self) -> BinaryIO:
+        """
+        Retorna o handle de escrita do histórico, abrindo-o se necessário.
+
+        O arquivo é aberto uma única vez em modo append, sem o custo de
+        abrir e fechar o arquivo a cada lote, e sem buffer: cada lote já
+        chega inteiro a _write_lines. Deve ser chamado com self._lock.
+
+        Returns:
+            Handle binário aberto em modo append.
+        """
+        if self._fh is None or self._fh.closed:
+            self._fh = open(self.history_file, "ab", buffering=0)
+        return self._fh
+
+    def _close_writer(self) -> None:
+        """Fecha o handle de escrita, se aberto. Deve ser chamado com self._lock."""
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            except OSError as e:
+                logger.warning(f"Erro ao fechar arquivo de histórico: {e}")
+            self._fh = None
+
     def record_error(
         self,
         error_type: ErrorType,
@@ -116,10 +461,11 @@ class ErrorHistory:
             ok_playwright: Se verificação Playwright passou.
         """
         try:
+            error_type_value = _ERROR_TYPE_VALUES[error_type]
             record = ErrorRecord(
                 timestamp=datetime.now(self.settings.tz).isoformat(),
-                error_type=error_type.value,
-                severity=severity.value,
+                error_type=error_type_value,
+                severity=_SEVERITY_VALUES[severity],
                 message=message,
                 details=details,
                 ok_ssl=ok_ssl,
@@ -127,14 +473,14 @@ class ErrorHistory:
                 ok_playwright=ok_playwright
             )
 
-            # Escreve no arquivo JSONL
-            try:
-                with open(self.history_file, "a", encoding="utf-8") as f:
-                    f.write(json.dumps(record.to_dict(), ensure_ascii=False) + "\n")
-                
-                logger.debug(f"Erro registrado: {error_type.value}")
-            except OSError as e:
-                logger.error(f"Erro ao registrar erro no histórico: {e}", exc_info=True)
+            # Enfileira para a thread de escrita, que grava o arquivo JSONL em
+            # lote (após close(), cada registro é gravado imediatamente)
+            line = _dumps_line(record.to_dict())
+            if not self._enqueue(line):
+                self._write_lines([line])
+            self._invalidate_analytics()
+            
+            logger.debug("Erro registrado: %s", error_type_value)
 
         except Exception as e:
             logger.error(f"Erro inesperado ao registrar erro: {e}", exc_info=True)
@@ -149,9 +495,18 @@ class ErrorHistory:
         Returns:
             Dict com padrões detectados.
         """
+        return self._cached(
+            ("detect_patterns", days_lookback),
+            lambda: self._detect_patterns(days_lookback)
+        )
+
+    def _detect_patterns(self, days_lookback: int = 7) -> Dict[str, Any]:
+        """Implementação de detect_patterns (sem o cache de análises)."""
         try:
-            # Lê histórico
-            records = self._read_history(days_lookback)
+            # Lê histórico (timestamps já convertidos no cache)
+            cutoff_time = datetime.now(self.settings.tz) - timedelta(days=days_lookback)
+            entries = self._read_history_since(cutoff_time)
+            records = [entry[4] for entry in entries]
             
             if not records:
                 logger.info("Nenhum erro nos últimos dias para análise de padrões")
@@ -161,14 +516,35 @@ class ErrorHistory:
                     "error_types": {},
                     "recurring_errors": [],
                     "time_patterns": {},
+                    "hourly_error_rate": [0.0] * 24,
                     "severity_distribution": {},
                 }
 
-            # Análise de tipo de erro
-            error_types = Counter([r["error_type"] for r in records])
+            # Tipos de erro contados pelos ids inteiros do cache (a ordem de
+            # primeira ocorrência é preservada) e convertidos para texto
+            type_names = self._type_names
+            error_types = {
+                type_names[type_id]: count
+                for type_id, count in Counter(map(itemgetter(3), entries)).items()
+            }
             
-            # Análise de severidade
-            severity_dist = Counter([r["severity"] for r in records])
+            # Uma única passada sobre os registros alimenta os contadores de
+            # severidade e falhas por componente
+            severity_dist: Counter = Counter()
+            ssl_failures = http_failures = playwright_failures = 0
+            
+            for record in records:
+                severity_dist[record["severity"]] += 1
+                
+                ssl_failures += not record["ok_ssl"]
+                http_failures += not record["ok_http"]
+                playwright_failures += not record["ok_playwright"]
+            
+            # Contagem por hora do dia direto das colunas do cache (hora local
+            # e sucesso), feita em C por Counter/compress, sem laço Python
+            hours = list(map(itemgetter(2), entries))
+            hourly_total = Counter(hours)
+            hourly_errors = Counter(compress(hours, map(not_, map(itemgetter(1), entries))))
             
             # Identifica erros recorrentes (3+ ocorrências)
             recurring_errors = [
@@ -182,12 +558,7 @@ class ErrorHistory:
             ]
             
             # Padrões de horário (agrupa por hora do dia)
-            time_patterns = self._analyze_time_patterns(records)
-            
-            # Padrão SSL
-            ssl_failures = sum(1 for r in records if not r["ok_ssl"])
-            http_failures = sum(1 for r in records if not r["ok_http"])
-            playwright_failures = sum(1 for r in records if not r["ok_playwright"])
+            time_patterns = self._analyze_time_patterns(hourly_total, hourly_errors)
             
             # Calcula confiabilidade
             reliability = {
@@ -200,9 +571,10 @@ class ErrorHistory:
                 "analysis_timestamp": datetime.now(self.settings.tz).isoformat(),
                 "period_days": days_lookback,
                 "total_errors": len(records),
-                "error_types": dict(error_types),
+                "error_types": error_types,
                 "recurring_errors": recurring_errors,
                 "time_patterns": time_patterns,
+                "hourly_error_rate": self._hourly_error_rate(time_patterns),
                 "severity_distribution": dict(severity_dist),
                 "component_reliability": reliability,
                 "last_error": records[-1] if records else None,
@@ -228,19 +600,30 @@ class ErrorHistory:
         Returns:
             Score de confiabilidade em percentual.
         """
+        return self._cached(
+            ("get_reliability_score", days_lookback),
+            lambda: self._get_reliability_score(days_lookback)
+        )
+
+    def _get_reliability_score(self, days_lookback: int = 30) -> float:
+        """Implementação de get_reliability_score (sem o cache de análises)."""
         try:
-            records = self._read_history(days_lookback)
+            cutoff = (datetime.now(self.settings.tz) - timedelta(days=days_lookback)).timestamp()
+            self._sync_history()
             
-            if not records:
+            # Só as colunas de timestamp e sucesso: os registros não são lidos
+            with self._reader_lock:
+                start = self._window_start(cutoff)
+                oks = [
+                    ok for ts, ok in zip(self._times[start:], self._oks[start:])
+                    if ts >= cutoff
+                ]
+            
+            if not oks:
                 return 100.0  # Sem erros = 100% confiável
             
             # Contar sucessos (todos os componentes OK)
-            successes = sum(
-                1 for r in records
-                if r["ok_ssl"] and r["ok_http"] and r["ok_playwright"]
-            )
-            
-            reliability = (successes / len(records)) * 100
+            reliability = (sum(oks) / len(oks)) * 100
             return round(reliability, 2)
             
         except Exception as e:
@@ -258,47 +641,86 @@ class ErrorHistory:
         Returns:
             MTTR em minutos.
         """
+        return self._cached(
+            ("get_mttr", error_type, days_lookback),
+            lambda: self._get_mttr(error_type, days_lookback)
+        )
+
+    def _get_mttr(self, error_type: Optional[str] = None, days_lookback: int = 30) -> float:
+        """Implementação de get_mttr (sem o cache de análises)."""
         try:
-            records = self._read_history(days_lookback)
+            cutoff_time = datetime.now(self.settings.tz) - timedelta(days=days_lookback)
+            entries = self._read_history_since(cutoff_time)
             
             if error_type:
-                records = [r for r in records if r["error_type"] == error_type]
+                type_id = self._type_id_by_name.get(error_type)
+                entries = [e for e in entries if e[3] == type_id]
             
-            if not records or len(records) < 2:
+            if not entries or len(entries) < 2:
                 return 0.0  # Não há dados suficientes
             
-            # Agrupa por tipo de erro, encontra períodos de falha
-            failures: List[Tuple[datetime, datetime]] = []
-            in_failure = False
-            failure_start = None
-            
-            for record in sorted(records, key=lambda x: x["timestamp"]):
-                has_error = not (record["ok_ssl"] and record["ok_http"] and record["ok_playwright"])
-                
-                if has_error and not in_failure:
-                    failure_start = datetime.fromisoformat(record["timestamp"])
-                    in_failure = True
-                elif not has_error and in_failure:
-                    failure_end = datetime.fromisoformat(record["timestamp"])
-                    failures.append((failure_start, failure_end))
-                    in_failure = False
-            
-            if not failures:
-                return 0.0
-            
-            # Calcula média de tempo de recuperação
-            recovery_times = [
-                (end - start).total_seconds() / 60
-                for start, end in failures
-            ]
-            
-            mttr = sum(recovery_times) / len(recovery_times)
-            return round(mttr, 2)
+            self._ensure_chronological(entries)
+            return self._mttr_from_sorted(entries)
             
         except Exception as e:
             logger.error(f"Erro ao calcular MTTR: {e}")
             return 0.0
 
+    def _ensure_chronological(self, entries: List[HistoryEntry]) -> None:
+        """
+        Garante que entradas do cache estejam em ordem cronológica.
+
+        O arquivo só recebe acréscimos em ordem de tempo, então a ordem do
+        cache normalmente já é cronológica e nada é feito. Se algum registro
+        fora de ordem tiver sido lido, ordena (de forma estável, preservando
+        a ordem do arquivo em timestamps iguais).
+
+        Args:
+            entries: Entradas extraídas do cache, na ordem do arquivo.
+        """
+        if not self._times_sorted:
+            entries.sort(key=lambda entry: entry[0])
+
+    @staticmethod
+    def _mttr_from_sorted(entries: List[HistoryEntry]) -> float:
+        """
+        Calcula o MTTR em minutos a partir de registros ordenados.
+
+        Os registros são percorridos em blocos consecutivos de mesmo estado
+        (itertools.groupby, em C): o laço Python roda uma vez por transição
+        falha/recuperação, não uma vez por registro.
+
+        Args:
+            entries: Registros do cache (HistoryEntry) em ordem cronológica.
+
+        Returns:
+            MTTR em minutos (0.0 se não houver recuperação registrada).
+        """
+        if len(entries) < 2:
+            return 0.0  # Não há dados suficientes
+        
+        # Períodos de falha: do primeiro registro de um bloco com erro ao
+        # primeiro registro do bloco de sucesso seguinte
+        total_minutes = 0.0
+        recoveries = 0
+        failure_start: Optional[float] = None
+        
+        for ok, run in groupby(entries, key=itemgetter(1)):
+            ts = next(run)[0]
+            if not ok:
+                failure_start = ts
+            elif failure_start is not None:
+                total_minutes += (ts - failure_start) / 60
+                recoveries += 1
+                failure_start = None
+        
+        if not recoveries:
+            return 0.0
+        
+        # Calcula média de tempo de recuperação
+        mttr = total_minutes / recoveries
+        return round(mttr, 2)
+
     def get_error_summary(self, hours_lookback: int = 24) -> Dict[str, Any]:
         """
         Retorna resumo de erros das últimas N horas.
@@ -309,93 +731,422 @@ class ErrorHistory:
         Returns:
             Dict com resumo de erros.
         """
+        return self._cached(
+            ("get_error_summary", hours_lookback),
+            lambda: self._get_error_summary(hours_lookback)
+        )
+
+    def _get_error_summary(self, hours_lookback: int = 24) -> Dict[str, Any]:
+        """Implementação de get_error_summary (sem o cache de análises)."""
         try:
             cutoff_time = datetime.now(self.settings.tz) - timedelta(hours=hours_lookback)
-            records = self._read_history_from_file()
-            
             recent_records = [
-                r for r in records
-                if datetime.fromisoformat(r["timestamp"]) >= cutoff_time
+                entry[4] for entry in self._read_history_since(cutoff_time)
             ]
             
-            if not recent_records:
-                return {
-                    "period_hours": hours_lookback,
-                    "total_errors": 0,
-                    "errors": [],
-                    "most_common_error": None,
-                }
-            
-            # Agrupa por tipo de erro
-            error_groups = defaultdict(list)
-            for record in recent_records:
-                error_groups[record["error_type"]].append(record)
-            
-            # Encontra erro mais comum
-            most_common = max(error_groups.items(), key=lambda x: len(x[1]))
-            
-            return {
-                "period_hours": hours_lookback,
-                "total_errors": len(recent_records),
-                "errors_by_type": {k: len(v) for k, v in error_groups.items()},
-                "most_common_error": {
-                    "type": most_common[0],
-                    "count": len(most_common[1]),
-                },
-                "recent_errors": recent_records[-5:],  # Últimos 5
-            }
+            return self._summarize_errors(recent_records, hours_lookback)
             
         except Exception as e:
             logger.error(f"Erro ao gerar resumo: {e}")
             return {"error": str(e)}
 
+    @staticmethod
+    def _summarize_errors(
+        recent_records: List[Dict[str, Any]],
+        hours_lookback: int
+    ) -> Dict[str, Any]:
+        """
+        Monta o resumo de erros a partir dos registros do período.
+
+        Args:
+            recent_records: Registros do período, na ordem do arquivo.
+            hours_lookback: Número de horas consideradas.
+
+        Returns:
+            Dict com resumo de erros.
+        """
+        if not recent_records:
+            return {
+                "period_hours": hours_lookback,
+                "total_errors": 0,
+                "errors": [],
+                "most_common_error": None,
+            }
+        
+        # Conta por tipo de erro (sem guardar os registros de cada grupo)
+        error_counts = Counter(map(itemgetter("error_type"), recent_records))
+        
+        # Encontra erro mais comum
+        most_common_type, most_common_count = error_counts.most_common(1)[0]
+        
+        return {
+            "period_hours": hours_lookback,
+            "total_errors": len(recent_records),
+            "errors_by_type": dict(error_counts),
+            "most_common_error": {
+                "type": most_common_type,
+                "count": most_common_count,
+            },
+            "recent_errors": recent_records[-5:],  # Últimos 5
+        }
+
+    def compute_health_bundle(self) -> Dict[str, Any]:
+        """
+        Calcula, em uma única leitura do histórico, os números de saúde
+        usados pelo dashboard.
+
+        Equivale a chamar get_reliability_score(1/7/30), get_mttr(1/7) e
+        get_error_summary(24), mas filtrando os registros uma única vez.
+
+        Returns:
+            Dict com "reliability" (24h/7d/30d), "mttr_minutes" (24h/7d) e
+            "error_summary" (últimas 24h).
+        """
+        return self._cached(("compute_health_bundle",), self._compute_health_bundle)
+
+    def _compute_health_bundle(self) -> Dict[str, Any]:
+        """Implementação de compute_health_bundle (sem o cache de análises)."""
+        now = datetime.now(self.settings.tz)
+        cutoff_1d = (now - timedelta(days=1)).timestamp()
+        cutoff_7d = (now - timedelta(days=7)).timestamp()
+        cutoff_30d = now - timedelta(days=30)
+        
+        entries = self._read_history_since(cutoff_30d)
+        
+        totals = {"24h": 0, "7d": 0, "30d": 0}
+        successes = {"24h": 0, "7d": 0, "30d": 0}
+        entries_7d = []
+        for entry in entries:
+            ts, ok = entry[0], entry[1]
+            totals["30d"] += 1
+            successes["30d"] += ok
+            if ts >= cutoff_7d:
+                entries_7d.append(entry)
+                totals["7d"] += 1
+                successes["7d"] += ok
+                if ts >= cutoff_1d:
+                    totals["24h"] += 1
+                    successes["24h"] += ok
+        
+        reliability = {
+            period: round((successes[period] / total) * 100, 2) if total else 100.0
+            for period, total in totals.items()
+        }
+        
+        # MTTR exige ordem cronológica
+        self._ensure_chronological(entries_7d)
+        mttr = {
+            "24h": self._mttr_from_sorted([e for e in entries_7d if e[0] >= cutoff_1d]),
+            "7d": self._mttr_from_sorted(entries_7d),
+        }
+        
+        # O resumo mantém a ordem do arquivo (últimos 5 registros)
+        error_summary = self._summarize_errors(
+            [entry[4] for entry in entries if entry[0] >= cutoff_1d],
+            hours_lookback=24
+        )
+        
+        return {
+            "reliability": reliability,
+            "mttr_minutes": mttr,
+            "error_summary": error_summary,
+        }
+
+    def open_reader(self) -> None:
+        """
+        Passa a manter um descritor de leitura aberto para o histórico.
+
+        Indicado para leitores frequentes (como o dashboard): cada leitura
+        usa os.pread no mesmo descritor em vez de abrir e fechar o arquivo.
+        O descritor é aberto quando o arquivo existir e reaberto se ele for
+        substituído. Use close_reader() para liberá-lo.
+        """
+        with self._reader_lock:
+            self._reader_enabled = True
+
+    def close_reader(self) -> None:
+        """Fecha o descritor de leitura aberto por open_reader()."""
+        with self._reader_lock:
+            self._reader_enabled = False
+            if self._reader_fd is not None:
+                os.close(self._reader_fd)
+                self._reader_fd = None
+
+    def _read_history_bytes(self, offset: int) -> bytes:
+        """
+        Lê o arquivo de histórico a partir de offset até o fim.
+
+        Deve ser chamado com self._reader_lock.
+
+        Args:
+            offset: Posição inicial da leitura, em bytes.
+
+        Returns:
+            Bytes lidos (b"" se o arquivo não existir).
+        """
+        if not self._reader_enabled:
+            try:
+                with open(self.history_file, "rb") as f:
+                    f.seek(offset)
+                    return f.read()
+            except FileNotFoundError:
+                return b""
+        
+        try:
+            path_stat = os.stat(self.history_file)
+        except FileNotFoundError:
+            return b""
+        
+        fd = self._reader_fd
+        if fd is not None and os.fstat(fd).st_ino != path_stat.st_ino:
+            # Arquivo substituído: reabre
+            os.close(fd)
+            fd = self._reader_fd = None
+        if fd is None:
+            fd = self._reader_fd = os.open(self.history_file, os.O_RDONLY)
+        
+        size = os.fstat(fd).st_size
+        return os.pread(fd, max(size - offset, 0), offset)
+
+    def get_history_version(self) -> Optional[Tuple[int, int]]:
+        """
+        Retorna um identificador barato do estado atual do histórico.
+
+        O valor muda sempre que o arquivo é escrito (por esta ou por outra
+        instância/processo), servindo para invalidar caches derivados.
+
+        Returns:
+            Tupla (mtime_ns, tamanho) do arquivo, ou None se ele não existir.
+        """
+        self.flush()
+        try:
+            stat = self.history_file.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
     def _read_history(self, days_lookback: int) -> List[Dict[str, Any]]:
         """Lê histórico dos últimos N dias."""
         cutoff_time = datetime.now(self.settings.tz) - timedelta(days=days_lookback)
-        records = self._read_history_from_file()
-        
-        return [
-            r for r in records
-            if datetime.fromisoformat(r["timestamp"]) >= cutoff_time
-        ]
+        return [entry[4] for entry in self._read_history_since(cutoff_time)]
+
+    def _read_history_since(self, cutoff_time: datetime) -> List[HistoryEntry]:
+        """
+        Retorna os registros com timestamp a partir de cutoff_time.
+
+        Os registros vêm do cache em memória, atualizado antes da consulta
+        apenas com as linhas acrescentadas ao arquivo desde a última leitura.
 
-    def _read_history_from_file(self) -> List[Dict[str, Any]]:
-        """Lê todos os registros de erro do arquivo."""
+        Args:
+            cutoff_time: Instante mínimo (inclusive) dos registros.
+
+        Returns:
+            Lista de HistoryEntry, na ordem do arquivo.
+        """
+        cutoff = cutoff_time.timestamp()
+        self._sync_history()
+        with self._reader_lock:
+            start = self._window_start(cutoff)
+            return [
+                entry
+                for entry in zip(
+                    self._times[start:],
+                    self._oks[start:],
+                    self._hours[start:],
+                    self._type_ids[start:],
+                    self._records[start:]
+                )
+                if entry[0] >= cutoff
+            ]
+
+    def _window_start(self, cutoff: float) -> int:
+        """
+        Retorna o índice do primeiro registro do cache que pode estar na
+        janela iniciada em cutoff. Deve ser chamado com self._reader_lock.
+
+        A busca binária é feita sobre o máximo acumulado dos timestamps:
+        nenhum registro antes do índice retornado pode ser >= cutoff, então
+        os registros antigos são descartados sem serem percorridos. Registros
+        fora de ordem depois dele são filtrados pelo chamador.
+
+        Args:
+            cutoff: Timestamp Unix mínimo da janela.
+
+        Returns:
+            Índice inicial da janela nas colunas do cache.
+        """
+        return bisect_left(self._max_times, cutoff)
+
+    def _sync_history(self) -> None:
+        """
+        Aguarda as escritas pendentes e atualiza o cache de registros,
+        registrando (sem propagar) erros de leitura.
+        """
+        self.flush()
         try:
-            if not self.history_file.exists():
-                return []
-            
-            records = []
-            with open(self.history_file, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            records.append(json.loads(line))
-                        except json.JSONDecodeError:
-                            logger.warning(f"Linha JSON inválida: {line}")
-            
-            return records
+            self._sync_records()
         except Exception as e:
             logger.error(f"Erro ao ler histórico: {e}")
-            return []
 
-    def _analyze_time_patterns(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Analisa padrões de falha por hora do dia."""
-        hourly_errors = defaultdict(int)
-        hourly_total = defaultdict(int)
-        
-        for record in records:
+    def _sync_records(self) -> None:
+        """
+        Atualiza o cache de registros com o que foi gravado no arquivo.
+
+        O arquivo só recebe acréscimos, então basta ler a partir do último
+        byte processado. Se ele for substituído ou encolher (por exemplo,
+        após clear_old_records), o cache é reconstruído do início. Escritas
+        de outros processos (o monitor e o dashboard usam instâncias
+        separadas) também são incorporadas.
+        """
+        with self._reader_lock:
             try:
-                ts = datetime.fromisoformat(record["timestamp"])
-                hour = ts.hour
-                hourly_total[hour] += 1
+                path_stat = os.stat(self.history_file)
+            except FileNotFoundError:
+                self._reset_records(None)
+                return
+            
+            if (path_stat.st_ino != self._records_ino
+                    or path_stat.st_size < self._records_offset):
+                self._reset_records(path_stat.st_ino)
+            if path_stat.st_size == self._records_offset:
+                return
+            
+            data = self._read_history_bytes(self._records_offset)
+            # Uma escrita concorrente pode deixar a última linha incompleta:
+            # ela fica para a próxima leitura
+            end = data.rfind(b"\n") + 1
+            if not end:
+                return
+            line_start = self._records_offset
+            self._records_offset += end
+            
+            for raw_line in data[:end].split(b"\n"):
+                offset = line_start
+                line_start += len(raw_line) + 1
+                line = raw_line.strip()
+                if not line:
+                    continue
                 
-                if not (record["ok_ssl"] and record["ok_http"] and record["ok_playwright"]):
-                    hourly_errors[hour] += 1
-            except Exception:
-                pass
+                record = self._parse_line(line)
+                if record is None:
+                    continue
+                try:
+                    ts = datetime.fromisoformat(record["timestamp"])
+                    ok = bool(record["ok_ssl"] and record["ok_http"] and record["ok_playwright"])
+                    timestamp = ts.timestamp()
+                    type_id = self._intern_error_type(record["error_type"])
+                except (KeyError, TypeError, ValueError):
+                    logger.warning(f"Registro inválido no histórico: {line!r}")
+                    continue
+                
+                max_times = self._max_times
+                if max_times and timestamp < max_times[-1]:
+                    self._times_sorted = False
+                    max_times.append(max_times[-1])
+                else:
+                    max_times.append(timestamp)
+                self._records.append(record)
+                self._times.append(timestamp)
+                self._hours.append(ts.hour)
+                self._oks.append(ok)
+                self._offsets.append(offset)
+                self._type_ids.append(type_id)
+
+    def _intern_error_type(self, error_type: str) -> int:
+        """
+        Retorna o id inteiro de um tipo de erro, registrando-o se for novo.
+
+        Deve ser chamado com self._reader_lock.
+
+        Raises:
+            TypeError: Se error_type não for hashable.
+        """
+        type_id = self._type_id_by_name.get(error_type)
+        if type_id is None:
+            type_id = self._type_id_by_name[error_type] = len(self._type_names)
+            self._type_names.append(error_type)
+        return type_id
+
+    def _reset_records(self, inode: Optional[int]) -> None:
+        """Esvazia o cache de registros. Deve ser chamado com self._reader_lock."""
+        self._records = []
+        self._times = array("d")
+        self._hours = array("B")
+        self._oks = array("B")
+        self._records_offset = 0
+        self._records_ino = inode
+        self._offsets = array("q")
+        self._type_ids = array("H")
+        self._max_times = array("d")
+        self._times_sorted = True
+
+    def _cached(self, key: Tuple, compute: Callable[[], Any]) -> Any:
+        """
+        Memoriza o resultado de uma análise por até
+        ANALYTICS_CACHE_TTL_SECONDS.
+
+        O resultado é reaproveitado enquanto o cache de registros não mudar
+        (mesmo inode e mesma posição lida no arquivo), de modo que novos
+        registros, inclusive gravados por outro processo, e a limpeza do
+        histórico invalidam a entrada. Os resultados são compartilhados
+        entre chamadas e não devem ser alterados.
+
+        Args:
+            key: Método e parâmetros da análise.
+            compute: Função que calcula o resultado sem cache.
+
+        Returns:
+            Resultado memorizado ou recém-calculado.
+        """
+        self._sync_history()
+        with self._reader_lock:
+            version = (self._records_ino, self._records_offset)
+        now = time.monotonic()
+        
+        with self._analytics_lock:
+            hit = self._analytics_cache.get(key)
+        if (
+            hit is not None
+            and hit[0] == version
+            and now - hit[1] < ANALYTICS_CACHE_TTL_SECONDS
+        ):
+            return hit[2]
         
+        value = compute()
+        with self._analytics_lock:
+            self._analytics_cache[key] = (version, now, value)
+        return value
+
+    def _invalidate_analytics(self) -> None:
+        """Descarta os resultados de análise memorizados (ver _cached)."""
+        with self._analytics_lock:
+            self._analytics_cache.clear()
+
+    @staticmethod
+    def _parse_line(line: bytes) -> Optional[Dict[str, Any]]:
+        """Desserializa uma linha do histórico (None se for inválida)."""
+        try:
+            return _loads_line(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            logger.warning(f"Linha JSON inválida: {line!r}")
+            return None
+
+    @staticmethod
+    def _analyze_time_patterns(
+        hourly_total: Mapping[int, int],
+        hourly_errors: Mapping[int, int]
+    ) -> Dict[str, Any]:
+        """
+        Analisa padrões de falha por hora do dia.
+
+        Args:
+            hourly_total: Verificações registradas por hora (0-23); horas
+                sem registro podem faltar (contagem zero).
+            hourly_errors: Verificações com falha por hora (0-23), idem.
+
+        Returns:
+            Dict com as taxas de erro por hora e a pior hora.
+        """
         # Calcula taxa de erro por hora
         patterns = {}
         for hour in range(24):
@@ -417,13 +1168,46 @@ class ErrorHistory:
         
         return patterns
 
+    @staticmethod
+    def _hourly_error_rate(time_patterns: Dict[str, Any]) -> List[float]:
+        """Converte time_patterns em uma lista de 24 taxas de erro (0-23h)."""
+        return [
+            time_patterns.get(f"hour_{hour:02d}", {}).get("error_rate", 0.0)
+            for hour in range(24)
+        ]
+
+    def _replace_with_tail(self, offset: int) -> None:
+        """
+        Substitui o histórico pelo seu conteúdo a partir de offset.
+
+        Args:
+            offset: Posição da primeira linha a manter.
+        """
+        directory = self.history_file.parent
+        fd, tmp_name = tempfile.mkstemp(
+            prefix=f".{self.history_file.name}.", suffix=".tmp", dir=directory
+        )
+        try:
+            with open(fd, "wb", buffering=0) as dst, \
+                    open(self.history_file, "rb", buffering=0) as src:
+                os.chmod(tmp_name, os.fstat(src.fileno()).st_mode & 0o777)
+                _copy_tail(src, dst, offset)
+                os.fsync(dst.fileno())
+            os.replace(tmp_name, self.history_file)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+
     def _save_patterns(self, patterns: Dict[str, Any]) -> None:
         """Salva padrões em arquivo JSON."""
         try:
             with open(self.patterns_file, "w", encoding="utf-8") as f:
                 json.dump(patterns, f, ensure_ascii=False, indent=2, default=str)
             
-            logger.debug(f"Padrões salvos em {self.patterns_file}")
+            logger.debug("Padrões salvos em %s", self.patterns_file)
         except Exception as e:
             logger.error(f"Erro ao salvar padrões: {e}")
 
@@ -431,6 +1215,14 @@ class ErrorHistory:
         """
         Remove registros mais antigos que N dias.
 
+        Como o arquivo é gravado em ordem cronológica, os registros a manter
+        formam um sufixo dele: a posição do primeiro é obtida do cache e esse
+        trecho é copiado, sem desserializar, para um arquivo temporário no
+        mesmo diretório, que substitui o histórico com os.replace. A troca é
+        atômica (uma interrupção no meio da cópia preserva o arquivo
+        original), e o novo inode faz as outras instâncias (como a do
+        dashboard) reconstruírem seus caches na próxima leitura.
+
         Args:
             days_to_keep: Número de dias a manter.
 
@@ -441,20 +1233,32 @@ class ErrorHistory:
             if not self.history_file.exists():
                 return 0
             
-            cutoff_time = datetime.now(self.settings.tz) - timedelta(days=days_to_keep)
-            records = self._read_history_from_file()
-            
-            recent_records = [
-                r for r in records
-                if datetime.fromisoformat(r["timestamp"]) >= cutoff_time
-            ]
-            
-            removed_count = len(records) - len(recent_records)
+            cutoff = (datetime.now(self.settings.tz) - timedelta(days=days_to_keep)).timestamp()
+            self.flush()
             
-            # Reescreve arquivo com apenas registros recentes
-            with open(self.history_file, "w", encoding="utf-8") as f:
-                for record in recent_records:
-                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            # Com self._lock, novos registros aguardam na fila de escrita e
+            # são acrescentados depois da limpeza
+            with self._lock:
+                self._sync_records()
+                
+                with self._reader_lock:
+                    # Registros antes de start são todos anteriores ao corte
+                    removed_count = self._window_start(cutoff)
+                    if removed_count < len(self._offsets):
+                        keep_from = self._offsets[removed_count]
+                    else:
+                        keep_from = self._records_offset
+                
+                if not removed_count:
+                    # Nada expirou: evita reescrever o arquivo inteiro
+                    logger.debug("Limpeza de histórico: nenhum registro expirado")
+                    return 0
+                
+                # O handle de escrita é fechado e reaberto na próxima escrita
+                self._close_writer()
+                self._replace_with_tail(keep_from)
+                with self._reader_lock:
+                    self._reset_records(None)
             
             logger.info(f"Limpeza de histórico: {removed_count} registros removidos")
             return removed_count
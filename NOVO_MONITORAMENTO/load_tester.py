@@ -3,32 +3,130 @@ Módulo de testes de carga para simular múltiplos usuários.
 
 Simula múltiplos usuários acessando o site concorrentemente, gerando
 padrões realistas de carga e coletando métricas de latência.
+
+O número de requisições simultâneas é limitado por
+settings.LOAD_TEST_MAX_WORKERS (variável de ambiente de mesmo nome),
+independente do número de usuários simulados: no caminho assíncrono, um
+semáforo limita as requisições em andamento sem alterar o ramp-up; no
+caminho com threads, o pool tem no máximo esse número de threads e os
+usuários excedentes aguardam uma thread livre.
 """
 import asyncio
 import json
 import logging
+import math
+import os
+import queue
+import random
+import ssl
+import threading
 import time
+from array import array
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass, asdict
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, tzinfo
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Any, Callable, Coroutine, Dict, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException, Timeout, ConnectionError as RequestsConnectionError
 
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - fallback para threads com requests
+    aiohttp = None
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - event loop padrão do asyncio
+    uvloop = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fallback para o json da stdlib
+    orjson = None
+
 from config import Settings
 from check import SiteChecker
 
 logger = logging.getLogger(__name__)
 
+# Erro relativo máximo dos percentis sem reservatório (ver LatencyHistogram)
+HISTOGRAM_RELATIVE_ACCURACY = 0.01
+
+# Validade (segundos) das resoluções DNS em cache no conector do aiohttp
+DNS_CACHE_TTL_SECONDS = 300
+
+# Ramp-up e think time de cada nível do teste de stress
+STRESS_RAMP_UP_SECONDS = 10
+STRESS_THINK_TIME_MS = 200
+
+# Contexto TLS compartilhado pelos testes assíncronos: certificados da CA
+# carregados uma única vez e cache de sessões TLS reaproveitado entre as
+# conexões dos usuários simulados
+_SSL_CONTEXT = ssl.create_default_context()
 
-@dataclass
+# Conexões keep-alive mantidas pela sessão requests de cada usuário (site e
+# eventual host de redirecionamento)
+USER_HTTP_POOL_SIZE = 2
+
+# Página do relatório de testes de carga (chaves do CSS escapadas para
+# str.format)
+LOAD_REPORT_TEMPLATE = """
+        <html>
+        <head>
+            <title>Relatório de Teste de Carga</title>
+            <style>
+                body {{ font-family: Arial, sans-serif; margin: 20px; }}
+                table {{ border-collapse: collapse; width: 100%; }}
+                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
+                th {{ background-color: #f2f2f2; }}
+                .good {{ color: green; }}
+                .warning {{ color: orange; }}
+                .critical {{ color: red; }}
+            </style>
+        </head>
+        <body>
+            <h1>Relatório de Teste de Carga</h1>
+            <p>Gerado em: {timestamp}</p>
+            
+            <h2>Testes Realizados</h2>
+            <table>
+                <tr>
+                    <th>Arquivo</th>
+                    <th>Requisições</th>
+                    <th>Taxa de Sucesso</th>
+                    <th>Latência Média</th>
+                    <th>Throughput</th>
+                </tr>
+                {rows}
+            </table>
+        </body>
+        </html>
+        """
+
+# Linha da tabela do relatório para um arquivo de estatísticas
+LOAD_REPORT_ROW_TEMPLATE = (
+    "<tr><td>{name}</td><td>{total_requests}</td>"
+    "<td class=\"{status_class}\">{success_rate:.1f}%</td>"
+    "<td>{avg_ms:.2f}ms</td><td>{throughput_rps:.2f} req/s</td></tr>\n"
+)
+LOAD_REPORT_EMPTY_ROW = "<tr><td colspan='5'>Nenhum teste encontrado</td></tr>"
+
+
+@dataclass(slots=True)
 class LoadTestResult:
-    """Resultado de um teste de carga."""
+    """
+    Resultado de um teste de carga.
+    
+    timestamp é o instante da requisição em nanossegundos desde a época
+    Unix (time.time_ns()); a conversão para ISO 8601 só acontece na
+    gravação do arquivo de resultados.
+    """
     user_id: int
     request_number: int
-    timestamp: str
+    timestamp: int
     url: str
     status_code: Optional[int]
     response_time_ms: float
@@ -37,16 +135,372 @@ class LoadTestResult:
     success: bool
 
     def to_dict(self) -> Dict[str, Any]:
-        """Converte para dicionário."""
-        return asdict(self)
+        """Converte para dicionário (campos simples: sem a cópia recursiva de asdict)."""
+        return {
+            "user_id": self.user_id,
+            "request_number": self.request_number,
+            "timestamp": self.timestamp,
+            "url": self.url,
+            "status_code": self.status_code,
+            "response_time_ms": self.response_time_ms,
+            "ttfb_ms": self.ttfb_ms,
+            "error": self.error,
+            "success": self.success,
+        }
+
+
+class LatencyHistogram:
+    """
+    Histograma de latências com buckets em escala logarítmica, para
+    percentis em memória constante.
+    
+    Cada bucket cobre um intervalo [g^(i-1), g^i), com
+    g = (1 + a) / (1 - a) e a = HISTOGRAM_RELATIVE_ACCURACY, e é
+    representado por um valor a no máximo a (relativo) de qualquer
+    latência do intervalo. Assim, o erro relativo de cada percentil é
+    limitado por a qualquer que seja a forma da distribuição (inclusive
+    bimodal) e a ordem de chegada das latências. O número de buckets
+    cresce só com o logaritmo da razão entre a maior e a menor latência.
+    """
+    
+    __slots__ = ("count", "_counts", "_zero_count", "_min", "_max")
+    
+    _GAMMA = (1 + HISTOGRAM_RELATIVE_ACCURACY) / (1 - HISTOGRAM_RELATIVE_ACCURACY)
+    _LOG_GAMMA = math.log(_GAMMA)
+    
+    def __init__(self):
+        self.count = 0
+        self._counts: Dict[int, int] = {}
+        self._zero_count = 0  # Latências <= 0 (fora da escala logarítmica)
+        self._min = float("inf")
+        self._max = float("-inf")
+    
+    def add(self, x: float) -> None:
+        """Acrescenta uma observação."""
+        self.count += 1
+        if x < self._min:
+            self._min = x
+        if x > self._max:
+            self._max = x
+        if x <= 0:
+            self._zero_count += 1
+            return
+        index = math.ceil(math.log(x) / self._LOG_GAMMA)
+        self._counts[index] = self._counts.get(index, 0) + 1
+    
+    def quantile(self, p: float) -> float:
+        """
+        Retorna o quantil p (0 a 1) das observações (0.0 sem observações).
+        
+        Usa a mesma posição que o percentil sobre a amostra ordenada
+        (ordered[int(count * p)]), limitada ao mínimo e ao máximo vistos.
+        """
+        if not self.count:
+            return 0.0
+        
+        rank = min(int(self.count * p), self.count - 1)
+        if rank < self._zero_count:
+            return self._min
+        
+        seen = self._zero_count
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen > rank:
+                value = 2 * self._GAMMA ** index / (self._GAMMA + 1)
+                return min(max(value, self._min), self._max)
+        return self._max
+
+
+class _RunningStats:
+    """Contagem, média, variância (Welford), mínimo e máximo incrementais."""
+    
+    __slots__ = ("count", "mean", "_m2", "min", "max")
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+    
+    def add(self, x: float) -> None:
+        """Acrescenta uma observação."""
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+    
+    @property
+    def stddev(self) -> float:
+        """Desvio padrão amostral (0.0 com menos de duas observações)."""
+        if self.count < 2:
+            return 0.0
+        return (self._m2 / (self.count - 1)) ** 0.5
+
+
+class StatsAccumulator:
+    """
+    Estatísticas de um teste de carga acumuladas à medida que os
+    resultados chegam, em memória limitada.
+    
+    Média e desvio padrão usam o algoritmo de Welford. Os percentis são
+    calculados sobre uma amostra de reservatório (Algoritmo R) de até
+    reservoir_size latências: exatos enquanto o teste não passar desse
+    tamanho e, acima dele, com erro da ordem de 1/sqrt(reservoir_size).
+    Com reservoir_size=0, vêm de um histograma logarítmico (ver
+    LatencyHistogram), sem guardar latência alguma.
+    """
+    
+    # Percentis reportados: nome -> quantil
+    PERCENTILES = {"p50_ms": 0.50, "p95_ms": 0.95, "p99_ms": 0.99}
+    
+    def __init__(self, reservoir_size: int = 0):
+        """
+        Inicializa os acumuladores vazios.
+        
+        Args:
+            reservoir_size: Máximo de latências amostradas para os percentis
+                           (0 usa o histograma logarítmico).
+        """
+        self.total = 0
+        self.successes = 0
+        self.error_types: Dict[str, int] = {}
+        self._latency = _RunningStats()
+        self._ttfb = _RunningStats()
+        self._reservoir_size = reservoir_size
+        self._reservoir = array("d")
+        self._histogram = LatencyHistogram() if reservoir_size <= 0 else None
+    
+    def add(self, result: LoadTestResult) -> None:
+        """
+        Acrescenta o resultado de uma requisição.
+        
+        Args:
+            result: Resultado da requisição.
+        """
+        self.total += 1
+        latency = result.response_time_ms
+        self._latency.add(latency)
+        if self._reservoir_size > 0:
+            self._sample(latency)
+        else:
+            self._histogram.add(latency)
+        
+        if result.success:
+            self.successes += 1
+            self._ttfb.add(result.ttfb_ms)
+        else:
+            # Agrupados por tipo de erro
+            error_msg = result.error or "Unknown"
+            self.error_types[error_msg] = self.error_types.get(error_msg, 0) + 1
+    
+    def _sample(self, latency: float) -> None:
+        """Mantém a amostra uniforme do reservatório (Algoritmo R)."""
+        if len(self._reservoir) < self._reservoir_size:
+            self._reservoir.append(latency)
+            return
+        
+        # A i-ésima latência substitui uma posição com probabilidade k/i
+        slot = random.randrange(self.total)
+        if slot < self._reservoir_size:
+            self._reservoir[slot] = latency
+    
+    def _percentile_values(self) -> Dict[str, float]:
+        """Calcula os percentis de PERCENTILES (reservatório ou histograma)."""
+        if self._histogram is not None:
+            return {
+                name: self._histogram.quantile(p)
+                for name, p in self.PERCENTILES.items()
+            }
+        
+        ordered = sorted(self._reservoir)
+        return {
+            name: ordered[int(len(ordered) * p)]
+            for name, p in self.PERCENTILES.items()
+        }
+    
+    def finalize(self, start_time: datetime, end_time: datetime) -> Dict[str, Any]:
+        """
+        Calcula as estatísticas finais do teste.
+        
+        Args:
+            start_time: Início do teste.
+            end_time: Fim do teste.
+        
+        Returns:
+            Dict com as estatísticas agregadas.
+        """
+        if not self.total:
+            return {"error": "No results"}
+        
+        failures = self.total - self.successes
+        success_rate = (self.successes / self.total) * 100
+        error_rate = (failures / self.total) * 100
+        
+        # Calcula throughput (requisições por segundo)
+        duration_seconds = (end_time - start_time).total_seconds()
+        throughput = self.total / duration_seconds if duration_seconds > 0 else 0
+        
+        latency = self._latency
+        ttfb = self._ttfb
+        
+        return {
+            "test_type": "load",
+            "start_time": start_time.isoformat(),
+            "end_time": end_time.isoformat(),
+            "duration_seconds": round(duration_seconds, 2),
+            "total_requests": self.total,
+            "successful_requests": self.successes,
+            "failed_requests": failures,
+            "success_rate": round(success_rate, 2),
+            "error_rate": round(error_rate, 2),
+            "throughput_rps": round(throughput, 2),
+            "latency": {
+                "min_ms": round(latency.min, 2),
+                "max_ms": round(latency.max, 2),
+                "avg_ms": round(latency.mean, 2),
+                "stddev_ms": round(latency.stddev, 2),
+                **{
+                    name: round(value, 2)
+                    for name, value in self._percentile_values().items()
+                },
+            },
+            "ttfb": {
+                "avg_ms": round(ttfb.mean, 2) if ttfb.count else 0,
+                "min_ms": round(ttfb.min, 2) if ttfb.count else 0,
+                "max_ms": round(ttfb.max, 2) if ttfb.count else 0,
+            },
+            "error_breakdown": dict(self.error_types),
+        }
+
+
+def _loads_json(data: bytes) -> Any:
+    """Desserializa um documento JSON (orjson, se disponível)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps_line(data: Dict[str, Any]) -> bytes:
+    """Serializa um dicionário como uma linha JSONL (orjson, se disponível)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(data, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
+def _dumps_document(data: Dict[str, Any]) -> bytes:
+    """Serializa um documento JSON indentado (orjson, se disponível)."""
+    if orjson is not None:
+        return orjson.dumps(
+            data,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(data, ensure_ascii=False, indent=2, default=str).encode("utf-8")
+
+
+class _ResultsWriter:
+    """
+    Grava os resultados de um teste de carga em JSONL à medida que chegam.
+    
+    put() apenas enfileira o resultado; uma thread dedicada serializa e
+    grava as linhas, sem bloquear os usuários simulados.
+    """
+    
+    def __init__(self, path: Path, tz: tzinfo):
+        """
+        Abre o arquivo de resultados e inicia a thread de escrita.
+        
+        Args:
+            path: Caminho do arquivo JSONL (sobrescrito se existir).
+            tz: Fuso horário dos timestamps gravados.
+        """
+        self.path = path
+        self.tz = tz
+        self._file = open(path, "wb")
+        self._queue: "queue.SimpleQueue[Optional[LoadTestResult]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="load-test-writer",
+            daemon=True
+        )
+        self._thread.start()
+    
+    def put(self, result: LoadTestResult) -> None:
+        """Enfileira um resultado para gravação."""
+        self._queue.put(result)
+    
+    def close(self) -> None:
+        """Grava os resultados pendentes e fecha o arquivo."""
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+    
+    def _run(self) -> None:
+        """Laço da thread de escrita: consome a fila até receber None."""
+        while True:
+            result = self._queue.get()
+            if result is None:
+                return
+            
+            try:
+                data = result.to_dict()
+                data["timestamp"] = datetime.fromtimestamp(
+                    result.timestamp / 1_000_000_000, self.tz
+                ).isoformat()
+                self._file.write(_dumps_line(data))
+            except Exception as e:
+                logger.error(f"Erro ao gravar resultado em {self.path}: {e}")
+
+
+class _LoadTestRun:
+    """
+    Uma execução de teste de carga (ou um nível do teste de stress): agrega
+    e grava em JSONL os resultados à medida que chegam.
+    """
+    
+    def __init__(self, settings: Settings, results_dir: Path):
+        """
+        Inicia a execução e abre o arquivo de resultados.
+        
+        Args:
+            settings: Configurações do sistema.
+            results_dir: Diretório dos arquivos de resultados.
+        """
+        self.start_time = datetime.now(settings.tz)
+        self.timestamp = self.start_time.strftime("%Y%m%d_%H%M%S")
+        self.accumulator = StatsAccumulator(settings.LOAD_TEST_RESERVOIR_SIZE)
+        self._lock = threading.Lock()
+        self._writer = _ResultsWriter(
+            results_dir / f"load_test_{self.timestamp}_results.jsonl",
+            settings.tz
+        )
+    
+    def record(self, result: LoadTestResult) -> None:
+        """Agrega um resultado e o enfileira para gravação (thread-safe)."""
+        with self._lock:
+            self.accumulator.add(result)
+        self._writer.put(result)
+    
+    def close(self) -> None:
+        """Grava os resultados pendentes e fecha o arquivo."""
+        self._writer.close()
 
 
 class LoadTester:
     """
     Executor de testes de carga e testes de stress.
     
-    Simula múltiplos usuários (threads) fazendo requisições concorrentes
-    ao site, coletando métricas de latência, erro e performance.
+    Simula múltiplos usuários fazendo requisições concorrentes ao site,
+    coletando métricas de latência, erro e performance.
+    
+    Com aiohttp instalado, cada usuário é uma corrotina e todos compartilham
+    um único event loop e uma única ClientSession; sem aiohttp, cada usuário
+    roda em uma thread com requests.
     """
 
     def __init__(self, settings: Settings, results_dir: Optional[Path] = None):
@@ -61,6 +515,10 @@ class LoadTester:
         self.results_dir = results_dir or (settings.BASE_DIR / "load_tests")
         self.results_dir.mkdir(parents=True, exist_ok=True)
         
+        # Linhas já montadas por generate_load_report:
+        # nome do arquivo -> (st_mtime_ns, HTML da linha)
+        self._report_cache: Dict[str, Tuple[int, str]] = {}
+        
         logger.info(f"LoadTester inicializado: results_dir={self.results_dir}")
 
     def run_load_test(
@@ -70,6 +528,7 @@ class LoadTester:
         ramp_up_seconds: int = 30,
         think_time_ms: int = 500,
         timeout_seconds: int = 30,
+        download_body: bool = True,
     ) -> Dict[str, Any]:
         """
         Executa um teste de carga com múltiplos usuários simulados.
@@ -80,55 +539,115 @@ class LoadTester:
             ramp_up_seconds: Tempo para ramp-up dos usuários (padrão: 30s).
             think_time_ms: Tempo de espera entre requisições por usuário (padrão: 500ms).
             timeout_seconds: Timeout para cada requisição (padrão: 30s).
+            download_body: Se o corpo da resposta é baixado (padrão: True).
+                          Só com o corpo lido por inteiro a conexão volta ao
+                          pool e é reaproveitada (keep-alive). Com False, a
+                          conexão é fechada logo após o primeiro byte: cada
+                          requisição abre uma conexão nova (TCP + TLS) e o
+                          tempo de resposta mede conexões frias.
+
+        Returns:
+            Dict com resultados agregados do teste.
+        
+        Note:
+            Com aiohttp, o teste roda em um event loop próprio (ver
+            _run_async): não chame este método de dentro de um event loop em execução.
+        """
+        run = self._start_load_test(num_users, requests_per_user, ramp_up_seconds)
+        
+        # Calcula intervalo de ramp-up entre usuários
+        ramp_up_interval = ramp_up_seconds / num_users if num_users > 0 else 0
+        
+        try:
+            self._run_users(
+                run.record,
+                num_users,
+                requests_per_user,
+                ramp_up_interval,
+                think_time_ms,
+                timeout_seconds,
+                download_body,
+            )
+        finally:
+            run.close()
+        
+        return self._finish_load_test(run)
+
+    async def _run_load_test_async(
+        self,
+        session: "aiohttp.ClientSession",
+        num_users: int,
+        requests_per_user: int,
+        ramp_up_seconds: int,
+        think_time_ms: int,
+        timeout_seconds: int,
+        download_body: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Versão assíncrona de run_load_test sobre uma sessão HTTP existente.
+
+        Args:
+            session: Sessão HTTP reaproveitada (ver _new_client_session).
+            num_users: Número de usuários simultâneos.
+            requests_per_user: Requisições por usuário.
+            ramp_up_seconds: Tempo para ramp-up dos usuários.
+            think_time_ms: Tempo de espera entre requisições por usuário.
+            timeout_seconds: Timeout para cada requisição.
+            download_body: Se o corpo da resposta é baixado.
 
         Returns:
             Dict com resultados agregados do teste.
         """
+        run = self._start_load_test(num_users, requests_per_user, ramp_up_seconds)
+        ramp_up_interval = ramp_up_seconds / num_users if num_users > 0 else 0
+        
+        try:
+            await self._run_users_async(
+                run.record,
+                num_users,
+                requests_per_user,
+                ramp_up_interval,
+                think_time_ms,
+                timeout_seconds,
+                download_body,
+                session=session,
+            )
+        finally:
+            run.close()
+        
+        return self._finish_load_test(run)
+
+    def _start_load_test(
+        self,
+        num_users: int,
+        requests_per_user: int,
+        ramp_up_seconds: int,
+    ) -> _LoadTestRun:
+        """Registra o início de um teste de carga e prepara a agregação."""
         logger.info(
             f"Iniciando teste de carga: "
             f"users={num_users}, requests={requests_per_user}, "
             f"ramp_up={ramp_up_seconds}s"
         )
-
-        start_time = datetime.now(self.settings.tz)
-        results: List[LoadTestResult] = []
-        
-        # Calcula intervalo de ramp-up entre usuários
-        ramp_up_interval = ramp_up_seconds / num_users if num_users > 0 else 0
-        
-        with ThreadPoolExecutor(max_workers=num_users) as executor:
-            futures = []
-            
-            # Submete tasks para cada usuário
-            for user_id in range(num_users):
-                delay = user_id * ramp_up_interval
-                future = executor.submit(
-                    self._user_session,
-                    user_id,
-                    requests_per_user,
-                    delay,
-                    think_time_ms,
-                    timeout_seconds,
-                )
-                futures.append(future)
-            
-            # Coleta resultados
-            for future in as_completed(futures):
-                user_results = future.result()
-                results.extend(user_results)
         
+        # Resultados agregados e gravados em JSONL à medida que chegam, sem
+        # manter a lista em memória
+        return _LoadTestRun(self.settings, self.results_dir)
+
+    def _finish_load_test(self, run: _LoadTestRun) -> Dict[str, Any]:
+        """Calcula e salva as estatísticas de um teste de carga encerrado."""
         # Calcula estatísticas
         end_time = datetime.now(self.settings.tz)
-        stats = self._calculate_stats(results, start_time, end_time)
+        stats = run.accumulator.finalize(run.start_time, end_time)
         
-        # Salva resultados
-        self._save_results(results, stats)
+        # Salva estatísticas
+        self._save_results(stats, run.timestamp)
         
         logger.info(
             f"Teste de carga concluído: "
-            f"total_requests={len(results)}, "
+            f"total_requests={run.accumulator.total}, "
             f"success_rate={stats['success_rate']:.2f}%, "
-            f"avg_latency={stats['avg_latency_ms']:.2f}ms"
+            f"avg_latency={stats['latency']['avg_ms']:.2f}ms"
         )
         
         return stats
@@ -151,6 +670,11 @@ class LoadTester:
 
         Returns:
             Dict com resultados por nível de carga.
+        
+        Note:
+            Com aiohttp, todos os níveis rodam em um único event loop e
+            reaproveitam a mesma sessão HTTP (pool de conexões, DNS e
+            sessões TLS) do primeiro ao último nível.
         """
         logger.info(
             f"Iniciando teste de stress: "
@@ -163,105 +687,401 @@ class LoadTester:
             "levels": [],
         }
         
-        current_users = increment_users
-        
-        while current_users <= max_users:
-            logger.info(f"Teste de stress com {current_users} usuários")
-            
-            level_result = self.run_load_test(
-                num_users=current_users,
-                requests_per_user=requests_per_increment,
-                ramp_up_seconds=10,
-                think_time_ms=200,
-                timeout_seconds=timeout_seconds,
+        if aiohttp is not None:
+            self._run_async(
+                self._run_stress_levels_async(
+                    stress_results,
+                    max_users,
+                    increment_users,
+                    requests_per_increment,
+                    timeout_seconds,
+                )
             )
+        else:
+            current_users = increment_users
             
-            level_result["user_count"] = current_users
-            stress_results["levels"].append(level_result)
-            
-            # Para se a taxa de erro ficar muito alta
-            if level_result["error_rate"] > 50:
-                logger.warning(
-                    f"Teste de stress parado: "
-                    f"taxa de erro {level_result['error_rate']:.2f}% com {current_users} usuários"
+            while current_users <= max_users:
+                logger.info(f"Teste de stress com {current_users} usuários")
+                
+                level_result = self.run_load_test(
+                    num_users=current_users,
+                    requests_per_user=requests_per_increment,
+                    ramp_up_seconds=STRESS_RAMP_UP_SECONDS,
+                    think_time_ms=STRESS_THINK_TIME_MS,
+                    timeout_seconds=timeout_seconds,
                 )
-                break
-            
-            current_users += increment_users
+                
+                if self._add_stress_level(stress_results, level_result, current_users):
+                    break
+                
+                current_users += increment_users
         
         stress_results["end_time"] = datetime.now(self.settings.tz).isoformat()
         
         # Salva resultados
         stress_file = self.results_dir / f"stress_test_{datetime.now(self.settings.tz).strftime('%Y%m%d_%H%M%S')}.json"
-        with open(stress_file, "w", encoding="utf-8") as f:
-            json.dump(stress_results, f, ensure_ascii=False, indent=2, default=str)
+        with open(stress_file, "wb") as f:
+            f.write(_dumps_document(stress_results))
         
         logger.info(f"Resultados de stress test salvos em {stress_file}")
         return stress_results
 
-    def _user_session(
+    async def _run_stress_levels_async(
+        self,
+        stress_results: Dict[str, Any],
+        max_users: int,
+        increment_users: int,
+        requests_per_increment: int,
+        timeout_seconds: int,
+    ) -> None:
+        """
+        Executa os níveis do teste de stress em sequência, todos sobre uma
+        única sessão HTTP.
+
+        Args:
+            stress_results: Resultados do teste de stress (níveis acrescentados).
+            max_users: Número máximo de usuários a atingir.
+            increment_users: Incremento de usuários por rodada.
+            requests_per_increment: Requisições por rodada.
+            timeout_seconds: Timeout para cada requisição.
+        """
+        async with self._new_client_session(max_users, timeout_seconds) as session:
+            current_users = increment_users
+            
+            while current_users <= max_users:
+                logger.info(f"Teste de stress com {current_users} usuários")
+                
+                level_result = await self._run_load_test_async(
+                    session,
+                    num_users=current_users,
+                    requests_per_user=requests_per_increment,
+                    ramp_up_seconds=STRESS_RAMP_UP_SECONDS,
+                    think_time_ms=STRESS_THINK_TIME_MS,
+                    timeout_seconds=timeout_seconds,
+                )
+                
+                if self._add_stress_level(stress_results, level_result, current_users):
+                    break
+                
+                current_users += increment_users
+
+    @staticmethod
+    def _add_stress_level(
+        stress_results: Dict[str, Any],
+        level_result: Dict[str, Any],
+        current_users: int,
+    ) -> bool:
+        """
+        Acrescenta o resultado de um nível ao teste de stress.
+
+        Args:
+            stress_results: Resultados do teste de stress.
+            level_result: Estatísticas do nível (ver run_load_test).
+            current_users: Número de usuários do nível.
+
+        Returns:
+            True se o teste de stress deve parar.
+        """
+        level_result["user_count"] = current_users
+        stress_results["levels"].append(level_result)
+        
+        # Para se a taxa de erro ficar muito alta
+        if level_result["error_rate"] > 50:
+            logger.warning(
+                f"Teste de stress parado: "
+                f"taxa de erro {level_result['error_rate']:.2f}% com {current_users} usuários"
+            )
+            return True
+        
+        return False
+
+    def _run_users(
         self,
+        record: Callable[[LoadTestResult], None],
+        num_users: int,
+        requests_per_user: int,
+        ramp_up_interval: float,
+        think_time_ms: int,
+        timeout_seconds: int,
+        download_body: bool,
+    ) -> None:
+        """
+        Executa as sessões de todos os usuários (corrotinas com aiohttp ou,
+        sem ele, threads com requests).
+
+        Args:
+            record: Função chamada com o resultado de cada requisição.
+            num_users: Número de usuários simultâneos.
+            requests_per_user: Requisições por usuário.
+            ramp_up_interval: Intervalo entre o início de cada usuário (s).
+            think_time_ms: Tempo de espera entre requisições.
+            timeout_seconds: Timeout para cada requisição.
+            download_body: Se o corpo da resposta é baixado.
+        """
+        if aiohttp is not None:
+            self._run_async(
+                self._run_users_async(
+                    record,
+                    num_users,
+                    requests_per_user,
+                    ramp_up_interval,
+                    think_time_ms,
+                    timeout_seconds,
+                    download_body,
+                )
+            )
+        elif num_users > 0:
+            max_workers = min(num_users, self.settings.LOAD_TEST_MAX_WORKERS)
+            # Instante de início de cada usuário medido a partir de um único
+            # relógio monotônico: o atraso na submissão não desloca o ramp-up
+            ramp_up_start = time.monotonic()
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = []
+                
+                # Submete tasks para cada usuário
+                for user_id in range(num_users):
+                    future = executor.submit(
+                        self._user_session,
+                        record,
+                        user_id,
+                        requests_per_user,
+                        ramp_up_start + user_id * ramp_up_interval,
+                        think_time_ms,
+                        timeout_seconds,
+                        download_body,
+                    )
+                    futures.append(future)
+                
+                # Propaga exceções das sessões
+                for future in as_completed(futures):
+                    future.result()
+
+    def _run_async(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """
+        Executa uma corrotina em um event loop novo, usando o uvloop
+        quando instalado e habilitado em settings.USE_UVLOOP.
+
+        Args:
+            coro: Corrotina a executar.
+
+        Returns:
+            Resultado da corrotina.
+        """
+        if uvloop is not None and self.settings.USE_UVLOOP:
+            return uvloop.run(coro)
+        return asyncio.run(coro)
+
+    async def _run_users_async(
+        self,
+        record: Callable[[LoadTestResult], None],
+        num_users: int,
+        requests_per_user: int,
+        ramp_up_interval: float,
+        think_time_ms: int,
+        timeout_seconds: int,
+        download_body: bool,
+        session: Optional["aiohttp.ClientSession"] = None,
+    ) -> None:
+        """
+        Executa as sessões de todos os usuários em um único event loop.
+
+        Args:
+            record: Função chamada com o resultado de cada requisição.
+            num_users: Número de usuários simultâneos.
+            requests_per_user: Requisições por usuário.
+            ramp_up_interval: Intervalo entre o início de cada usuário (s).
+            think_time_ms: Tempo de espera entre requisições.
+            timeout_seconds: Timeout para cada requisição.
+            download_body: Se o corpo da resposta é baixado.
+            session: Sessão HTTP a reaproveitar; se None, uma sessão é
+                     criada e fechada ao final.
+        """
+        if session is None:
+            async with self._new_client_session(num_users, timeout_seconds) as session:
+                await self._run_users_async(
+                    record,
+                    num_users,
+                    requests_per_user,
+                    ramp_up_interval,
+                    think_time_ms,
+                    timeout_seconds,
+                    download_body,
+                    session=session,
+                )
+            return
+        
+        max_workers = max(1, min(num_users, self.settings.LOAD_TEST_MAX_WORKERS))
+        
+        # Limita as requisições em andamento; o ramp-up e o think time dos
+        # usuários continuam independentes do limite
+        concurrency = asyncio.Semaphore(max_workers)
+        
+        # Instantes de início no relógio monotônico do event loop
+        ramp_up_start = asyncio.get_running_loop().time()
+        
+        await asyncio.gather(*(
+            self._user_session_async(
+                session,
+                concurrency,
+                record,
+                user_id,
+                requests_per_user,
+                ramp_up_start + user_id * ramp_up_interval,
+                think_time_ms,
+                timeout_seconds,
+                download_body,
+            )
+            for user_id in range(num_users)
+        ))
+
+    def _new_client_session(
+        self,
+        max_users: int,
+        timeout_seconds: int,
+    ) -> "aiohttp.ClientSession":
+        """
+        Cria a sessão HTTP assíncrona dos testes de carga.
+
+        Args:
+            max_users: Maior número de usuários simultâneos que usarão a sessão.
+            timeout_seconds: Timeout para cada requisição.
+
+        Returns:
+            aiohttp.ClientSession: Sessão com pool de conexões, DNS e TLS
+            compartilhados (deve ser usada como context manager).
+        """
+        max_workers = max(1, min(max_users, self.settings.LOAD_TEST_MAX_WORKERS))
+        connector = aiohttp.TCPConnector(
+            ssl=_SSL_CONTEXT,
+            limit=max_workers,
+            limit_per_host=max_workers,
+            use_dns_cache=True,
+            ttl_dns_cache=DNS_CACHE_TTL_SECONDS,
+            force_close=False,
+        )
+        timeout = aiohttp.ClientTimeout(total=timeout_seconds)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    async def _user_session_async(
+        self,
+        session: "aiohttp.ClientSession",
+        concurrency: asyncio.Semaphore,
+        record: Callable[[LoadTestResult], None],
         user_id: int,
         num_requests: int,
-        initial_delay_seconds: float,
+        start_at: float,
         think_time_ms: int,
         timeout_seconds: int,
-    ) -> List[LoadTestResult]:
+        download_body: bool,
+    ) -> None:
         """
-        Simula uma sessão de usuário com múltiplas requisições.
+        Versão assíncrona de _user_session.
 
         Args:
+            session: Sessão HTTP compartilhada entre os usuários.
+            concurrency: Semáforo que limita as requisições simultâneas.
+            record: Função chamada com o resultado de cada requisição.
             user_id: ID do usuário.
             num_requests: Número de requisições a fazer.
-            initial_delay_seconds: Delay inicial (ramp-up).
+            start_at: Instante de início do usuário (ramp-up), no relógio
+                     do event loop (loop.time()).
             think_time_ms: Tempo de espera entre requisições.
             timeout_seconds: Timeout para requisições.
-
-        Returns:
-            Lista de resultados das requisições.
+            download_body: Se o corpo da resposta é baixado.
         """
-        # Aguarda ramp-up
-        if initial_delay_seconds > 0:
-            time.sleep(initial_delay_seconds)
+        # Aguarda ramp-up (só o tempo que falta até o instante de início)
+        delay = start_at - asyncio.get_running_loop().time()
+        if delay > 0:
+            await asyncio.sleep(delay)
         
-        results: List[LoadTestResult] = []
         think_time_s = think_time_ms / 1000
         
         for request_num in range(num_requests):
-            result = self._make_request(
-                user_id,
-                request_num,
-                timeout_seconds,
-            )
-            results.append(result)
+            async with concurrency:
+                result = await self._make_request_async(
+                    session,
+                    user_id,
+                    request_num,
+                    timeout_seconds,
+                    download_body,
+                )
+            record(result)
             
             # Think time (espera entre requisições)
             if request_num < num_requests - 1:
-                time.sleep(think_time_s)
-        
-        return results
+                await asyncio.sleep(think_time_s)
 
-    def _make_request(
+    async def _make_request_async(
         self,
+        session: "aiohttp.ClientSession",
         user_id: int,
         request_number: int,
         timeout_seconds: int,
+        download_body: bool,
     ) -> LoadTestResult:
         """
-        Faz uma requisição HTTP e coleta métricas.
+        Versão assíncrona de _make_request, sobre a sessão do aiohttp.
 
         Args:
+            session: Sessão HTTP compartilhada entre os usuários.
             user_id: ID do usuário.
             request_number: Número da requisição.
             timeout_seconds: Timeout.
+            download_body: Se o corpo da resposta é baixado.
 
         Returns:
             Resultado da requisição.
         """
-        result = LoadTestResult(
+        result = self._new_result(user_id, request_number)
+        # perf_counter: relógio monotônico de alta resolução, imune a ajustes
+        # do relógio do sistema (NTP, horário de verão)
+        start_time = time.perf_counter()
+        
+        try:
+            async with session.get(self.settings.SITE_URL, allow_redirects=True) as response:
+                # TTFB (Time To First Byte): get() retorna assim que a resposta
+                # começa a chegar (status + cabeçalhos), como em check.py
+                ttfb_ms = (time.perf_counter() - start_time) * 1000
+                
+                if download_body:
+                    # Lê resto da resposta de uma só vez; a conexão volta ao
+                    # pool ao sair do bloco
+                    await response.content.read()
+                else:
+                    # Corpo descartado: fecha a conexão (não reaproveitada)
+                    response.close()
+                
+                elapsed_time = (time.perf_counter() - start_time) * 1000
+                
+                result.status_code = response.status
+                result.response_time_ms = elapsed_time
+                result.ttfb_ms = ttfb_ms
+                result.success = response.status == 200
+            
+        except asyncio.TimeoutError:
+            result.error = f"Timeout ({self.settings.SITE_URL})"
+            result.response_time_ms = timeout_seconds * 1000
+            
+        except aiohttp.ClientConnectionError as e:
+            result.error = f"Connection error: {str(e)[:50]}"
+            result.response_time_ms = (time.perf_counter() - start_time) * 1000
+            
+        except aiohttp.ClientError as e:
+            result.error = f"Request error: {str(e)[:50]}"
+            result.response_time_ms = (time.perf_counter() - start_time) * 1000
+            
+        except Exception as e:
+            result.error = f"Unexpected error: {str(e)[:50]}"
+            result.response_time_ms = (time.perf_counter() - start_time) * 1000
+        
+        return result
+
+    def _new_result(self, user_id: int, request_number: int) -> LoadTestResult:
+        """Cria o resultado de uma requisição ainda não concluída."""
+        return LoadTestResult(
             user_id=user_id,
             request_number=request_number,
-            timestamp=datetime.now(self.settings.tz).isoformat(),
+            timestamp=time.time_ns(),
             url=self.settings.SITE_URL,
             status_code=None,
             response_time_ms=0.0,
@@ -269,143 +1089,155 @@ class LoadTester:
             error=None,
             success=False,
         )
+
+    def _user_session(
+        self,
+        record: Callable[[LoadTestResult], None],
+        user_id: int,
+        num_requests: int,
+        start_at: float,
+        think_time_ms: int,
+        timeout_seconds: int,
+        download_body: bool,
+    ) -> None:
+        """
+        Simula uma sessão de usuário com múltiplas requisições.
+
+        Args:
+            record: Função chamada com o resultado de cada requisição.
+            user_id: ID do usuário.
+            num_requests: Número de requisições a fazer.
+            start_at: Instante de início do usuário (ramp-up), no relógio
+                     de time.monotonic().
+            think_time_ms: Tempo de espera entre requisições.
+            timeout_seconds: Timeout para requisições.
+            download_body: Se o corpo da resposta é baixado.
+        """
+        # Aguarda ramp-up (só o tempo que falta até o instante de início)
+        delay = start_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        
+        think_time_s = think_time_ms / 1000
+        
+        # Sessão própria do usuário: conexões keep-alive reaproveitadas entre
+        # as requisições, sem disputa pelo pool com as outras threads
+        with self._new_session() as session:
+            for request_num in range(num_requests):
+                result = self._make_request(
+                    session,
+                    user_id,
+                    request_num,
+                    timeout_seconds,
+                    download_body,
+                )
+                record(result)
+                
+                # Think time (espera entre requisições)
+                if request_num < num_requests - 1:
+                    time.sleep(think_time_s)
+
+    @staticmethod
+    def _new_session() -> requests.Session:
+        """Cria a sessão HTTP de um usuário simulado (caminho com threads)."""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=USER_HTTP_POOL_SIZE,
+            pool_maxsize=USER_HTTP_POOL_SIZE
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _make_request(
+        self,
+        session: requests.Session,
+        user_id: int,
+        request_number: int,
+        timeout_seconds: int,
+        download_body: bool,
+    ) -> LoadTestResult:
+        """
+        Faz uma requisição HTTP e coleta métricas.
+
+        Args:
+            session: Sessão HTTP do usuário.
+            user_id: ID do usuário.
+            request_number: Número da requisição.
+            timeout_seconds: Timeout.
+            download_body: Se o corpo da resposta é baixado.
+
+        Returns:
+            Resultado da requisição.
+        """
+        result = self._new_result(user_id, request_number)
+        start_time = time.perf_counter()
         
         try:
-            start_time = time.time()
-            
-            response = requests.get(
+            response = session.get(
                 self.settings.SITE_URL,
                 timeout=timeout_seconds,
                 allow_redirects=True,
                 stream=True,
             )
             
-            # TTFB (Time To First Byte)
-            ttfb_start = time.time()
-            first_byte = False
-            ttfb_ms = 0.0
+            # TTFB (Time To First Byte): com stream=True, get() retorna assim
+            # que a resposta começa a chegar (status + cabeçalhos), como em
+            # check.py
+            ttfb_ms = (time.perf_counter() - start_time) * 1000
             
-            for chunk in response.iter_content(chunk_size=1):
-                if not first_byte:
-                    ttfb_ms = (time.time() - ttfb_start) * 1000
-                    first_byte = True
-                break
+            if download_body:
+                # Lê resto da resposta de uma só vez (leitura em C, sem o
+                # gerador de iter_content por bloco); a conexão volta ao pool
+                response.content
+            else:
+                # Corpo descartado: fecha a conexão sem baixá-lo (não
+                # reaproveitada)
+                response.close()
             
-            # Lê resto da resposta
-            for chunk in response.iter_content(chunk_size=8192):
-                pass
-            
-            elapsed_time = (time.time() - start_time) * 1000
+            elapsed_time = (time.perf_counter() - start_time) * 1000
             
             result.status_code = response.status_code
             result.response_time_ms = elapsed_time
             result.ttfb_ms = ttfb_ms
             result.success = response.status_code == 200
             
-        except Timeout as e:
+        except Timeout:
             result.error = f"Timeout ({self.settings.SITE_URL})"
             result.response_time_ms = timeout_seconds * 1000
             
         except RequestsConnectionError as e:
             result.error = f"Connection error: {str(e)[:50]}"
-            result.response_time_ms = (time.time() - start_time) * 1000
+            result.response_time_ms = (time.perf_counter() - start_time) * 1000
             
         except RequestException as e:
             result.error = f"Request error: {str(e)[:50]}"
-            result.response_time_ms = (time.time() - start_time) * 1000
+            result.response_time_ms = (time.perf_counter() - start_time) * 1000
             
         except Exception as e:
             result.error = f"Unexpected error: {str(e)[:50]}"
-            result.response_time_ms = (time.time() - start_time) * 1000
+            result.response_time_ms = (time.perf_counter() - start_time) * 1000
         
         return result
 
-    def _calculate_stats(
-        self,
-        results: List[LoadTestResult],
-        start_time: datetime,
-        end_time: datetime,
-    ) -> Dict[str, Any]:
-        """Calcula estatísticas dos resultados."""
-        if not results:
-            return {"error": "No results"}
-        
-        # Separar sucessos e erros
-        successes = [r for r in results if r.success]
-        errors = [r for r in results if not r.success]
-        
-        # Calcular latências
-        response_times = [r.response_time_ms for r in results]
-        ttfb_times = [r.ttfb_ms for r in successes] if successes else [0]
-        
-        # Ordena para percentis
-        response_times_sorted = sorted(response_times)
-        
-        success_rate = (len(successes) / len(results)) * 100 if results else 0
-        error_rate = (len(errors) / len(results)) * 100 if results else 0
-        
-        # Calcula throughput (requisições por segundo)
-        duration_seconds = (end_time - start_time).total_seconds()
-        throughput = len(results) / duration_seconds if duration_seconds > 0 else 0
-        
-        # Agrupados por tipo de erro
-        error_types = {}
-        for error in errors:
-            error_msg = error.error or "Unknown"
-            error_types[error_msg] = error_types.get(error_msg, 0) + 1
-        
-        stats = {
-            "test_type": "load",
-            "start_time": start_time.isoformat(),
-            "end_time": end_time.isoformat(),
-            "duration_seconds": round(duration_seconds, 2),
-            "total_requests": len(results),
-            "successful_requests": len(successes),
-            "failed_requests": len(errors),
-            "success_rate": round(success_rate, 2),
-            "error_rate": round(error_rate, 2),
-            "throughput_rps": round(throughput, 2),
-            "latency": {
-                "min_ms": round(min(response_times), 2),
-                "max_ms": round(max(response_times), 2),
-                "avg_ms": round(sum(response_times) / len(response_times), 2),
-                "p50_ms": round(response_times_sorted[len(response_times_sorted) // 2], 2),
-                "p95_ms": round(
-                    response_times_sorted[int(len(response_times_sorted) * 0.95)], 2
-                ),
-                "p99_ms": round(
-                    response_times_sorted[int(len(response_times_sorted) * 0.99)], 2
-                ),
-            },
-            "ttfb": {
-                "avg_ms": round(sum(ttfb_times) / len(ttfb_times), 2) if ttfb_times else 0,
-                "min_ms": round(min(ttfb_times), 2) if ttfb_times else 0,
-                "max_ms": round(max(ttfb_times), 2) if ttfb_times else 0,
-            },
-            "error_breakdown": error_types,
-        }
-        
-        return stats
-
     def _save_results(
         self,
-        results: List[LoadTestResult],
         stats: Dict[str, Any],
+        timestamp: str,
     ) -> None:
-        """Salva resultados em arquivo JSON."""
+        """
+        Salva as estatísticas em arquivo JSON.
+
+        Os resultados detalhados já foram gravados durante o teste (ver
+        _ResultsWriter) em load_test_{timestamp}_results.jsonl.
+        """
         try:
-            timestamp = datetime.now(self.settings.tz).strftime("%Y%m%d_%H%M%S")
-            
-            # Arquivo de resultados detalhados
             results_file = self.results_dir / f"load_test_{timestamp}_results.jsonl"
-            with open(results_file, "w", encoding="utf-8") as f:
-                for result in results:
-                    f.write(json.dumps(result.to_dict(), ensure_ascii=False, default=str) + "\n")
             
             # Arquivo de estatísticas
             stats_file = self.results_dir / f"load_test_{timestamp}_stats.json"
-            with open(stats_file, "w", encoding="utf-8") as f:
-                json.dump(stats, f, ensure_ascii=False, indent=2, default=str)
+            with open(stats_file, "wb") as f:
+                f.write(_dumps_document(stats))
             
             logger.info(
                 f"Resultados salvos: {results_file} e {stats_file}"
@@ -421,62 +1253,56 @@ class LoadTester:
         Returns:
             HTML do relatório.
         """
-        html = """
-        <html>
-        <head>
-            <title>Relatório de Teste de Carga</title>
-            <style>
-                body { font-family: Arial, sans-serif; margin: 20px; }
-                table { border-collapse: collapse; width: 100%; }
-                th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
-                th { background-color: #f2f2f2; }
-                .good { color: green; }
-                .warning { color: orange; }
-                .critical { color: red; }
-            </style>
-        </head>
-        <body>
-            <h1>Relatório de Teste de Carga</h1>
-            <p>Gerado em: {timestamp}</p>
-            
-            <h2>Testes Realizados</h2>
-            <table>
-                <tr>
-                    <th>Arquivo</th>
-                    <th>Requisições</th>
-                    <th>Taxa de Sucesso</th>
-                    <th>Latência Média</th>
-                    <th>Throughput</th>
-                </tr>
-                {rows}
-            </table>
-        </body>
-        </html>
-        """
+        # Só relê os arquivos novos ou modificados desde o último relatório;
+        # arquivos removidos saem do cache
+        with os.scandir(self.results_dir) as it:
+            stats_entries = sorted(
+                (entry for entry in it if entry.name.endswith("_stats.json")),
+                key=lambda entry: entry.name
+            )
         
-        rows = []
-        for stats_file in sorted(self.results_dir.glob("*_stats.json")):
+        report_cache: Dict[str, Tuple[int, str]] = {}
+        for stats_file in stats_entries:
             try:
-                with open(stats_file, "r") as f:
-                    stats = json.load(f)
-                
-                success_rate = stats.get("success_rate", 0)
-                status_class = "good" if success_rate >= 95 else "warning" if success_rate >= 80 else "critical"
-                
-                row = f"""
-                <tr>
-                    <td>{stats_file.name}</td>
-                    <td>{stats.get('total_requests', 'N/A')}</td>
-                    <td class="{status_class}">{success_rate:.1f}%</td>
-                    <td>{stats.get('latency', {}).get('avg_ms', 'N/A'):.2f}ms</td>
-                    <td>{stats.get('throughput_rps', 'N/A'):.2f} req/s</td>
-                </tr>
-                """
-                rows.append(row)
+                mtime_ns = stats_file.stat().st_mtime_ns
+                cached = self._report_cache.get(stats_file.name)
+                if cached is not None and cached[0] == mtime_ns:
+                    row = cached[1]
+                else:
+                    with open(stats_file.path, "rb") as f:
+                        stats = _loads_json(f.read())
+                    row = self._format_report_row(stats_file.name, stats)
+                report_cache[stats_file.name] = (mtime_ns, row)
             except Exception as e:
-                logger.warning(f"Erro ao ler {stats_file}: {e}")
+                logger.warning(f"Erro ao ler {stats_file.path}: {e}")
         
-        return html.format(
+        self._report_cache = report_cache
+        
+        return LOAD_REPORT_TEMPLATE.format(
             timestamp=datetime.now(self.settings.tz).isoformat(),
-            rows="\n".join(rows) if rows else "<tr><td colspan='5'>Nenhum teste encontrado</td></tr>",
+            rows="".join(row for _, row in report_cache.values()) or LOAD_REPORT_EMPTY_ROW,
         )
+
+    @staticmethod
+    def _format_report_row(name: str, stats: Dict[str, Any]) -> str:
+        """
+        Monta a linha do relatório para um arquivo de estatísticas.
+
+        Args:
+            name: Nome do arquivo de estatísticas.
+            stats: Estatísticas lidas do arquivo.
+
+        Returns:
+            HTML da linha da tabela.
+        """
+        success_rate = stats.get("success_rate", 0)
+        status_class = "good" if success_rate >= 95 else "warning" if success_rate >= 80 else "critical"
+        
+        return LOAD_REPORT_ROW_TEMPLATE.format_map({
+            "name": name,
+            "total_requests": stats.get("total_requests", "N/A"),
+            "status_class": status_class,
+            "success_rate": success_rate,
+            "avg_ms": stats.get("latency", {}).get("avg_ms", "N/A"),
+            "throughput_rps": stats.get("throughput_rps", "N/A"),
+        })
@@ -398,6 +398,14 @@ class MonitoringService:
             except Exception as e:
                 logger.error(f"Erro ao encerrar scheduler: {e}", exc_info=True)
         
+        # Libera o browser mantido pelo verificador entre checagens
+        if self.checker:
+            try:
+                self.checker.close()
+            except Exception as e:
+                logger.error(f"Erro ao encerrar verificador: {e}", exc_info=True)
+            self.checker = None
+        
         logger.info("Serviço encerrado")
     
     @contextmanager
@@ -431,6 +439,7 @@ def main() -> int:
         # Carrega configurações
         logger.info("Carregando configurações...")
         settings = load_settings()
+        settings.ensure_dirs()
         logger.info("Configurações carregadas com sucesso")
         
         # Cria e inicia serviço
@@ -325,6 +325,7 @@ def run_check(
     
     logger.info("Inicializando verificador...")
     try:
+        settings.ensure_dirs()
         checker = SiteChecker(settings)
         logger.info("Verificador inicializado com sucesso")
     except Exception as e:
@@ -333,7 +334,10 @@ def run_check(
     
     logger.info("Executando verificação...")
     try:
-        result = checker.perform_check()
+        try:
+            result = checker.perform_check()
+        finally:
+            checker.close()
         logger.info("Verificação concluída")
         
         # Formata e exibe o resultado
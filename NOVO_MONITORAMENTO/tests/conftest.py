@@ -94,8 +94,7 @@ def mock_requests(monkeypatch):
     mock_response.status_code = 200
     mock_response.elapsed.total_seconds.return_value = 0.5
     mock_response.url = "https://example.com"
-    mock_response.headers = {"Content-Type": "text/html"}
-    mock_response.iter_content.return_value = [b"<html>test</html>"]
+    mock_response.headers = {"Content-Type": "text/html", "Content-Length": "17"}
     mock_response.__enter__ = Mock(return_value=mock_response)
     mock_response.__exit__ = Mock(return_value=False)
     
@@ -130,17 +129,17 @@ def mock_playwright(monkeypatch):
     }
     mock_page.screenshot.return_value = None
     
-    mock_browser = Mock()
-    mock_browser.new_page.return_value = mock_page
-    mock_browser.close.return_value = None
+    mock_context = Mock()
+    mock_context.pages = []
+    mock_context.new_page.return_value = mock_page
+    mock_context.close.return_value = None
     
     mock_playwright_instance = Mock()
-    mock_playwright_instance.chromium.launch.return_value = mock_browser
+    mock_playwright_instance.chromium.launch_persistent_context.return_value = mock_context
     
     def mock_sync_playwright():
         context_manager = Mock()
-        context_manager.__enter__ = Mock(return_value=mock_playwright_instance)
-        context_manager.__exit__ = Mock(return_value=False)
+        context_manager.start = Mock(return_value=mock_playwright_instance)
         return context_manager
     
     monkeypatch.setattr("playwright.sync_api.sync_playwright", mock_sync_playwright)
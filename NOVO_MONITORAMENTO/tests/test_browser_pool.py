@@ -0,0 +1,90 @@
+"""
+Testes para o módulo browser_pool.py.
+
+Testa aluguel, devolução e reciclagem de páginas do browser.
+"""
+import os
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from browser_pool import BrowserPool, PROFILE_MARKER, PROFILE_MAX_AGE_SECONDS
+
+
+@pytest.fixture
+def mock_context() -> Mock:
+    """Contexto persistente simulado cujas páginas nunca estão fechadas."""
+    context = Mock()
+    context.pages = []
+    context.new_page.side_effect = lambda: Mock(**{"is_closed.return_value": False})
+    return context
+
+
+@pytest.fixture
+def mock_playwright(mock_context: Mock):
+    """Substitui sync_playwright por um mock que devolve mock_context."""
+    with patch('browser_pool.sync_playwright') as mock_sync_playwright:
+        instance = mock_sync_playwright.return_value.start.return_value
+        instance.chromium.launch_persistent_context.return_value = mock_context
+        yield instance
+
+
+class TestBrowserPool:
+    """Testes para a classe BrowserPool."""
+    
+    def test_rent_reuses_released_pages(self, temp_dir: Path, mock_playwright, mock_context):
+        """Testa que páginas devolvidas são reaproveitadas."""
+        setup = Mock()
+        pool = BrowserPool(temp_dir / "profile", size=2, context_setup=setup)
+        
+        page = pool.rent()
+        pool.release(page)
+        pool.rent()
+        
+        mock_playwright.chromium.launch_persistent_context.assert_called_once()
+        setup.assert_called_once_with(mock_context)
+        assert mock_context.new_page.call_count == 2
+        page.close.assert_not_called()
+    
+    def test_release_closes_page_when_pool_full(self, temp_dir: Path, mock_playwright, mock_context):
+        """Testa que páginas excedentes são fechadas na devolução."""
+        pool = BrowserPool(temp_dir / "profile", size=1)
+        
+        first = pool.rent()
+        second = pool.rent()  # Pool vazio: abre uma página extra
+        pool.release(first)
+        pool.release(second)
+        
+        first.close.assert_not_called()
+        second.close.assert_called_once()
+    
+    def test_recycle_after_uses(self, temp_dir: Path, mock_playwright, mock_context):
+        """Testa que o browser é relançado após o limite de usos."""
+        pool = BrowserPool(temp_dir / "profile", size=1, recycle_after_uses=2)
+        
+        for _ in range(3):
+            pool.release(pool.rent())
+        
+        assert mock_playwright.chromium.launch_persistent_context.call_count == 2
+        mock_context.close.assert_called_once()
+        
+        pool.close()
+        mock_playwright.stop.assert_called_once()
+    
+    def test_stale_profile_is_reset(self, temp_dir: Path, mock_playwright):
+        """Testa que perfis mais antigos que o limite são recriados."""
+        profile_dir = temp_dir / "profile"
+        profile_dir.mkdir()
+        (profile_dir / "Cache").write_text("dados antigos")
+        marker = profile_dir / PROFILE_MARKER
+        marker.touch()
+        old_time = time.time() - PROFILE_MAX_AGE_SECONDS - 1
+        os.utime(marker, (old_time, old_time))
+        
+        pool = BrowserPool(profile_dir)
+        pool.rent()
+        
+        assert not (profile_dir / "Cache").exists()
+        assert marker.exists()
@@ -3,7 +3,10 @@ Testes para o módulo check.py.
 
 Testa verificações HTTP, SSL e Playwright.
 """
-from unittest.mock import Mock, patch, MagicMock
+import base64
+import ssl
+import time
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 import requests
@@ -11,10 +14,42 @@ from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
 from pathlib import Path
 
-from check import SiteChecker
+from browser_pool import DEFAULT_POOL_SIZE
+from check import (
+    DEFAULT_RETRY_ATTEMPTS,
+    SiteChecker,
+    HTTP_BODY_SAMPLE_BYTES,
+    PERF_SCRIPT,
+    PERF_COLLECT_EXPRESSION,
+    SELECTOR_DOC_LINK,
+    SELECTOR_DOC_LINK_FALLBACK,
+    SLACK_BACKOFF_MAX_SECONDS,
+)
 from config import Settings
 
 
+@pytest.fixture(autouse=True)
+def close_checkers(temp_dir: Path):
+    """
+    Fecha os SiteChecker criados no teste antes de apagar temp_dir.
+    
+    A thread de escrita do histórico de erros ainda pode estar gravando no
+    diretório temporário quando o teste termina.
+    """
+    checkers = []
+    original_init = SiteChecker.__init__
+    
+    def tracking_init(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        checkers.append(self)
+    
+    with patch.object(SiteChecker, "__init__", tracking_init):
+        yield
+    
+    for checker in checkers:
+        checker.close()
+
+
 class TestSiteChecker:
     """Testes para a classe SiteChecker."""
     
@@ -36,12 +71,12 @@ class TestSiteChecker:
             )
     
     @patch('check.SSLChecker.check_ssl_certificate')
-    @patch('check.requests.get')
-    @patch('check.sync_playwright')
-    @patch('check.time.time')
+    @patch('check.requests.Session.get')
+    @patch('browser_pool.sync_playwright')
+    @patch('check.time.perf_counter')
     def test_perform_check_success(
         self,
-        mock_time,
+        mock_perf_counter,
         mock_playwright,
         mock_requests_get,
         mock_ssl_check,
@@ -49,7 +84,7 @@ class TestSiteChecker:
     ):
         """Testa verificação completa bem-sucedida."""
         # Mock time
-        mock_time.side_effect = [0.0, 0.1, 0.5, 0.0, 1.5, 2.0]  # HTTP: start, ttfb, end; Playwright: nav_start, nav_end, interaction_end
+        mock_perf_counter.side_effect = [0.0, 0.1, 0.5, 0.0, 1.5, 1.5, 2.0]  # HTTP: start, ttfb, end; Playwright: nav_start, nav_end, interaction_start, interaction_end
         
         # Mock SSL
         mock_ssl_check.return_value = {
@@ -62,8 +97,7 @@ class TestSiteChecker:
         mock_response.status_code = 200
         mock_response.elapsed.total_seconds.return_value = 0.5
         mock_response.url = "https://example.com"
-        mock_response.headers = {"Content-Type": "text/html"}
-        mock_response.iter_content.return_value = iter([b"<html>test</html>"])
+        mock_response.headers = {"Content-Type": "text/html", "Content-Length": "17"}
         mock_requests_get.return_value = mock_response
         
         # Mock Playwright
@@ -73,6 +107,8 @@ class TestSiteChecker:
         mock_locator.wait_for.return_value = None
         mock_locator.select_option.return_value = None
         mock_locator.first = mock_locator
+        mock_locator.count.return_value = 1
+        mock_locator.nth.return_value = mock_locator
         mock_locator.click.return_value = None
         mock_page.locator.return_value = mock_locator
         mock_page.evaluate.return_value = {
@@ -84,16 +120,13 @@ class TestSiteChecker:
             "total_resource_size": 100000
         }
         
-        mock_browser = Mock()
-        mock_browser.new_page.return_value = mock_page
+        mock_context = Mock()
+        mock_context.pages = []
+        mock_context.new_page.return_value = mock_page
         
         mock_playwright_instance = Mock()
-        mock_playwright_instance.chromium.launch.return_value = mock_browser
-        
-        mock_context = MagicMock()
-        mock_context.__enter__ = Mock(return_value=mock_playwright_instance)
-        mock_context.__exit__ = Mock(return_value=False)
-        mock_playwright.return_value = mock_context
+        mock_playwright_instance.chromium.launch_persistent_context.return_value = mock_context
+        mock_playwright.return_value.start.return_value = mock_playwright_instance
         
         checker = SiteChecker(sample_settings)
         result = checker.perform_check()
@@ -103,25 +136,166 @@ class TestSiteChecker:
         assert "ok_playwright" in result
         assert result["timestamp"] is not None
     
-    @patch('check.requests.get')
+    @patch('check.socket.create_connection')
+    @patch('check.SSLChecker.check_ssl_certificate')
+    def test_do_ssl_check_uses_cache(
+        self,
+        mock_ssl_check,
+        mock_connection,
+        sample_settings: Settings
+    ):
+        """Testa reaproveitamento da validação SSL quando o certificado não muda."""
+        now = time.time()
+        mock_ssl_check.return_value = {
+            "ok_ssl": True,
+            "ssl_detail": {
+                "certificate": {
+                    "not_before_timestamp": now - 86400,
+                    "not_after_timestamp": now + 86400 * 90,
+                },
+            },
+        }
+        
+        checker = SiteChecker(sample_settings)
+        checker._ssl_context = MagicMock()
+        ssock = checker._ssl_context.wrap_socket.return_value.__enter__.return_value
+        ssock.getpeercert.return_value = b"DER"
+        first = checker._do_ssl_check()
+        second = checker._do_ssl_check()
+        
+        mock_ssl_check.assert_called_once()
+        assert first["ok_ssl"] is True
+        assert second["ok_ssl"] is True
+        assert second["ssl_detail"]["cached"] is True
+        ssock.getpeercert.assert_called_with(binary_form=True)
+        assert checker._ssl_context.wrap_socket.call_args[1]["server_hostname"] == "example.com"
+        
+        # Certificado diferente invalida o cache
+        ssock.getpeercert.return_value = b"OTHER"
+        checker._do_ssl_check()
+        assert mock_ssl_check.call_count == 2
+        
+        # Falha na verificação do certificado também não usa o cache
+        checker._ssl_context.wrap_socket.side_effect = ssl.SSLCertVerificationError("falha")
+        checker._do_ssl_check()
+        assert mock_ssl_check.call_count == 3
+    
+    @patch.object(SiteChecker, '_do_playwright_check', return_value={"ok_playwright": True})
+    @patch.object(SiteChecker, '_do_http_check', return_value={"ok_http": True})
+    @patch.object(SiteChecker, '_do_ssl_check', side_effect=ValueError("erro permanente"))
+    def test_perform_check_does_not_retry_permanent_errors(
+        self,
+        mock_ssl_check,
+        mock_http_check,
+        mock_playwright_check,
+        sample_settings: Settings
+    ):
+        """Testa que erros não transitórios não são repetidos pelo @retry."""
+        checker = SiteChecker(sample_settings)
+        
+        with pytest.raises(ValueError):
+            checker.perform_check()
+        
+        mock_ssl_check.assert_called_once()
+    
+    @patch.object(SiteChecker._run_check.retry, 'sleep', lambda seconds: None)
+    def test_run_check_retries_transient_failures(self, sample_settings: Settings):
+        """Testa que falhas transitórias devolvidas pelos _do_* são repetidas."""
+        transient = {"ok_http": False, "http_detail": {"error": "Connection error", "transient": True}}
+        check = Mock(side_effect=[transient, {"ok_http": True, "http_detail": {}}])
+        
+        checker = SiteChecker(sample_settings)
+        
+        assert checker._run_check(check)["ok_http"] is True
+        assert check.call_count == 2
+        
+        # Esgotadas as tentativas, o último resultado de falha é devolvido
+        check = Mock(return_value=transient)
+        assert checker._run_check(check) == transient
+        assert check.call_count == DEFAULT_RETRY_ATTEMPTS
+    
+    def test_run_check_does_not_retry_permanent_failures(self, sample_settings: Settings):
+        """Testa que falhas sem a marca "transient" não são repetidas."""
+        failure = {"ok_http": False, "http_detail": {"error": "HTTPError"}}
+        check = Mock(return_value=failure)
+        
+        checker = SiteChecker(sample_settings)
+        
+        assert checker._run_check(check) == failure
+        check.assert_called_once()
+    
+    @patch('check.requests.Session.get')
     def test_do_http_check_success(self, mock_get, sample_settings: Settings):
-        """Testa verificação HTTP bem-sucedida."""
+        """Testa verificação HTTP bem-sucedida com corpo pequeno lido por inteiro."""
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.elapsed.total_seconds.return_value = 0.5
         mock_response.url = "https://example.com"
-        mock_response.iter_content.return_value = [b"<html>test</html>"]
+        mock_response.headers = {"Content-Type": "text/html", "Content-Length": "17"}
+        mock_response.iter_content.return_value = iter([b"<html>test</html>"])
         mock_get.return_value = mock_response
         
         checker = SiteChecker(sample_settings)
         result = checker._do_http_check()
         
+        performance = result["http_detail"]["performance"]
         assert result["ok_http"] is True
         assert result["http_detail"]["status_code"] == 200
-        assert "performance" in result["http_detail"]
-        assert "ttfb" in result["http_detail"]["performance"]
+        assert "ttfb" in performance
+        assert performance["content_length"] == 17
+        # "Content-Type: text/html\r\n" (25) + "Content-Length: 17\r\n" (20)
+        assert performance["total_size"] == 17 + 45
+        assert performance["body_downloaded"] is True
+        assert "download_speed_mbps" in performance
+        # Corpo lido por inteiro: a conexão volta ao pool, sem close()
+        mock_response.close.assert_not_called()
     
-    @patch('check.requests.get')
+    @patch('check.requests.Session.get')
+    def test_do_http_check_large_body_not_downloaded(self, mock_get, sample_settings: Settings):
+        """Testa que um corpo grande não é baixado nem gera métricas de velocidade."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.elapsed.total_seconds.return_value = 0.5
+        mock_response.url = "https://example.com"
+        mock_response.headers = {"Content-Length": str(HTTP_BODY_SAMPLE_BYTES + 1)}
+        mock_get.return_value = mock_response
+        
+        checker = SiteChecker(sample_settings)
+        result = checker._do_http_check()
+        
+        performance = result["http_detail"]["performance"]
+        assert performance["content_length"] == HTTP_BODY_SAMPLE_BYTES + 1
+        assert performance["body_downloaded"] is False
+        assert "download_speed" not in performance
+        assert "download_speed_mbps" not in performance
+        mock_response.iter_content.assert_not_called()
+        mock_response.close.assert_called_once()
+    
+    @patch('check.requests.Session.get')
+    def test_do_http_check_without_content_length(self, mock_get, sample_settings: Settings):
+        """Testa leitura limitada do corpo quando não há Content-Length."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.elapsed.total_seconds.return_value = 0.5
+        mock_response.url = "https://example.com"
+        mock_response.headers = {"Content-Type": "text/html"}
+        mock_response.iter_content.return_value = iter(
+            [b"x" * HTTP_BODY_SAMPLE_BYTES, b"x" * HTTP_BODY_SAMPLE_BYTES]
+        )
+        mock_get.return_value = mock_response
+        
+        checker = SiteChecker(sample_settings)
+        result = checker._do_http_check()
+        
+        performance = result["http_detail"]["performance"]
+        assert result["ok_http"] is True
+        assert performance["content_length"] == HTTP_BODY_SAMPLE_BYTES
+        assert performance["body_downloaded"] is False
+        assert "download_speed_mbps" not in performance
+        mock_response.iter_content.assert_called_once_with(HTTP_BODY_SAMPLE_BYTES)
+        mock_response.close.assert_called_once()
+    
+    @patch('check.requests.Session.get')
     def test_do_http_check_timeout(self, mock_get, sample_settings: Settings):
         """Testa tratamento de timeout HTTP."""
         mock_get.side_effect = requests.exceptions.Timeout("Request timeout")
@@ -132,7 +306,7 @@ class TestSiteChecker:
         assert result["ok_http"] is False
         assert "error" in result["http_detail"]
     
-    @patch('check.requests.get')
+    @patch('check.requests.Session.get')
     def test_do_http_check_connection_error(self, mock_get, sample_settings: Settings):
         """Testa tratamento de erro de conexão HTTP."""
         mock_get.side_effect = requests.exceptions.ConnectionError("Connection failed")
@@ -143,7 +317,7 @@ class TestSiteChecker:
         assert result["ok_http"] is False
         assert result["http_detail"]["error"] == "Connection error"
     
-    @patch('check.sync_playwright')
+    @patch('browser_pool.sync_playwright')
     def test_do_playwright_check_success(self, mock_playwright, sample_settings: Settings):
         """Testa verificação Playwright bem-sucedida."""
         
@@ -153,6 +327,8 @@ class TestSiteChecker:
         mock_locator.wait_for.return_value = None
         mock_locator.select_option.return_value = None
         mock_locator.first = mock_locator
+        mock_locator.count.return_value = 1
+        mock_locator.nth.return_value = mock_locator
         mock_locator.click.return_value = None
         mock_page.locator.return_value = mock_locator
         mock_page.evaluate.return_value = {
@@ -164,16 +340,13 @@ class TestSiteChecker:
             "total_resource_size": 100000
         }
         
-        mock_browser = Mock()
-        mock_browser.new_page.return_value = mock_page
+        mock_context = Mock()
+        mock_context.pages = []
+        mock_context.new_page.return_value = mock_page
         
         mock_playwright_instance = Mock()
-        mock_playwright_instance.chromium.launch.return_value = mock_browser
-        
-        mock_context = MagicMock()
-        mock_context.__enter__ = Mock(return_value=mock_playwright_instance)
-        mock_context.__exit__ = Mock(return_value=False)
-        mock_playwright.return_value = mock_context
+        mock_playwright_instance.chromium.launch_persistent_context.return_value = mock_context
+        mock_playwright.return_value.start.return_value = mock_playwright_instance
         
         checker = SiteChecker(sample_settings)
         result = checker._do_playwright_check()
@@ -182,22 +355,59 @@ class TestSiteChecker:
         assert "playwright_detail" in result
         assert "performance" in result["playwright_detail"]
     
-    @patch('check.sync_playwright')
+    @patch('browser_pool.sync_playwright')
+    def test_do_playwright_check_reuses_browser(self, mock_playwright, sample_settings: Settings):
+        """Testa que o browser e as páginas do pool são reaproveitados."""
+        mock_context = Mock()
+        mock_context.pages = []
+        mock_context.new_page.return_value.is_closed.return_value = False
+        
+        mock_playwright_instance = Mock()
+        mock_playwright_instance.chromium.launch_persistent_context.return_value = mock_context
+        mock_playwright.return_value.start.return_value = mock_playwright_instance
+        
+        checker = SiteChecker(sample_settings)
+        checker._do_playwright_check()
+        checker._do_playwright_check()
+        checker.close()
+        
+        mock_playwright_instance.chromium.launch_persistent_context.assert_called_once()
+        _, launch_kwargs = mock_playwright_instance.chromium.launch_persistent_context.call_args
+        assert launch_kwargs["user_data_dir"] == str(sample_settings.BASE_DIR / "pw_profile")
+        # Páginas pré-abertas na inicialização do pool e reutilizadas depois
+        assert mock_context.new_page.call_count == DEFAULT_POOL_SIZE
+        mock_context.new_page.return_value.close.assert_not_called()
+        mock_context.add_init_script.assert_called_once_with(PERF_SCRIPT)
+        mock_context.new_page.return_value.evaluate.assert_called_with(PERF_COLLECT_EXPRESSION)
+        mock_context.close.assert_called_once()
+        mock_playwright_instance.stop.assert_called_once()
+    
+    def test_interact_with_page_doc_link_fallback(self, sample_settings: Settings):
+        """Testa que o seletor por texto só é usado quando não há testid."""
+        mock_page = Mock()
+        mock_page.locator.return_value.count.return_value = 0
+        
+        checker = SiteChecker(sample_settings)
+        detail_messages = []
+        assert checker._interact_with_page(mock_page, detail_messages) is True
+        
+        mock_page.locator.assert_any_call(SELECTOR_DOC_LINK)
+        mock_page.locator.assert_called_with(SELECTOR_DOC_LINK_FALLBACK)
+        mock_page.locator.return_value.nth.assert_called_once_with(0)
+    
+    @patch('browser_pool.sync_playwright')
     def test_do_playwright_check_timeout(self, mock_playwright, sample_settings: Settings):
         """Testa tratamento de timeout no Playwright."""
         mock_page = Mock()
         mock_page.goto.side_effect = PlaywrightTimeoutError("Page load timeout")
         
-        mock_browser = Mock()
-        mock_browser.new_page.return_value = mock_page
+        mock_context = Mock()
+        mock_context.pages = []
+        mock_context.new_page.return_value = mock_page
         
         mock_playwright_instance = Mock()
-        mock_playwright_instance.chromium.launch.return_value = mock_browser
-        
-        mock_context = MagicMock()
-        mock_context.__enter__ = Mock(return_value=mock_playwright_instance)
-        mock_context.__exit__ = Mock(return_value=False)
-        mock_playwright.return_value = mock_context
+        mock_playwright_instance.chromium.launch_persistent_context.return_value = mock_context
+        mock_playwright.return_value.start.return_value = mock_playwright_instance
         
         checker = SiteChecker(sample_settings)
         result = checker._do_playwright_check()
@@ -205,11 +415,38 @@ class TestSiteChecker:
         assert result["ok_playwright"] is False
         assert "error" in result["playwright_detail"]
     
-    @patch('check.send_slack')
-    def test_notify_failure(self, mock_send_slack, sample_settings: Settings):
-        """Testa notificação de falha via Slack."""
-        mock_send_slack.return_value = True
+    def test_take_failure_screenshot_jpeg(self, sample_settings: Settings):
+        """Testa screenshot de falha em JPEG via CDP."""
+        mock_page = Mock()
+        mock_cdp = mock_page.context.new_cdp_session.return_value
+        mock_cdp.send.return_value = {"data": base64.b64encode(b"jpeg-bytes").decode()}
+        
+        checker = SiteChecker(sample_settings)
+        screenshot = checker._take_failure_screenshot(mock_page)
+        
+        assert screenshot.endswith(".jpg")
+        assert Path(screenshot).read_bytes() == b"jpeg-bytes"
+        mock_cdp.detach.assert_called_once()
+        mock_page.screenshot.assert_not_called()
         
+        # Screenshots no mesmo segundo não colidem
+        assert checker._take_failure_screenshot(mock_page) != screenshot
+    
+    def test_take_failure_screenshot_fallback(self, sample_settings: Settings):
+        """Testa fallback para o screenshot do Playwright quando o CDP não está disponível."""
+        mock_page = Mock()
+        mock_page.context.new_cdp_session.side_effect = Exception("CDP indisponível")
+        mock_page.screenshot.return_value = b"fallback-bytes"
+        
+        checker = SiteChecker(sample_settings)
+        screenshot = checker._take_failure_screenshot(mock_page)
+        
+        assert screenshot.endswith(".jpg")
+        assert Path(screenshot).read_bytes() == b"fallback-bytes"
+        mock_page.screenshot.assert_called_once_with(full_page=True, type="jpeg", quality=80)
+    
+    def test_notify_failure(self, sample_settings: Settings):
+        """Testa notificação de falha via Slack."""
         result = {
             "site_url": "https://example.com",
             "timestamp": "2024-01-15 10:30:00",
@@ -220,11 +457,76 @@ class TestSiteChecker:
         }
         
         checker = SiteChecker(sample_settings)
+        checker._slack_session = Mock(**{"post.return_value.status_code": 200})
         checker._notify_failure(result)
+        checker._slack_queue.join()  # Envio ocorre na thread de notificações
+        
+        checker._slack_session.post.assert_called_once()
+        call_args = checker._slack_session.post.call_args
+        assert call_args[0][0] == sample_settings.SLACK_WEBHOOK
+        assert "Problema detectado" in call_args[1]["json"]["text"]
+    
+    @patch('check.SLACK_MIN_INTERVAL_SECONDS', 0)
+    def test_notify_failure_retries_rate_limited(self, sample_settings: Settings):
+        """Testa que notificações recusadas com 429 voltam para a fila."""
+        rate_limited = Mock(status_code=429, headers={"Retry-After": "0"})
+        delivered = Mock(status_code=200)
+        
+        checker = SiteChecker(sample_settings)
+        checker._slack_session = Mock(**{"post.side_effect": [rate_limited, delivered]})
+        checker._notify_failure({
+            "site_url": "https://example.com",
+            "timestamp": "2024-01-15 10:30:00",
+            "ok_http": False,
+            "ok_playwright": True,
+        })
+        checker._slack_queue.join()
+        
+        assert checker._slack_session.post.call_count == 2
+        first, second = checker._slack_session.post.call_args_list
+        assert first[1]["json"] == second[1]["json"]
+    
+    @patch('check.SLACK_MIN_INTERVAL_SECONDS', 0)
+    def test_rate_limited_retry_does_not_block_queue(self, sample_settings: Settings):
+        """Testa que uma retentativa pendente não atrasa as demais notificações."""
+        rate_limited = Mock(status_code=429, headers={"Retry-After": "3600"})
+        delivered = Mock(status_code=200)
+        
+        checker = SiteChecker(sample_settings)
+        checker._slack_session = Mock(**{"post.side_effect": [rate_limited, delivered]})
+        checker._slack_queue.put(("primeira", 0))
+        checker._slack_queue.put(("segunda", 0))
+        
+        deadline = time.monotonic() + 5
+        while checker._slack_session.post.call_count < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        
+        assert checker._slack_session.post.call_count == 2
+        second = checker._slack_session.post.call_args_list[1]
+        assert second[1]["json"]["text"] == "segunda"
+    
+    def test_post_slack_caps_retry_after(self, sample_settings: Settings):
+        """Testa que Retry-After é limitado a SLACK_BACKOFF_MAX_SECONDS."""
+        checker = SiteChecker(sample_settings)
+        checker._slack_session = Mock(**{
+            "post.return_value": Mock(status_code=429, headers={"Retry-After": "3600"})
+        })
+        
+        assert checker._post_slack("mensagem", 1) == SLACK_BACKOFF_MAX_SECONDS
+    
+    def test_notify_failure_without_webhook(self, temp_dir: Path):
+        """Testa que nada é enfileirado quando o Slack não está configurado."""
+        settings = Settings(
+            SITE_URL="https://example.com",
+            PORTAL_URL="https://portal.example.com",
+            BASE_DIR=temp_dir / "relatorio"
+        )
+        
+        checker = SiteChecker(settings)
+        checker._slack_session = Mock()
+        checker._notify_failure({"site_url": "https://example.com"})
+        checker._slack_queue.join()
         
-        mock_send_slack.assert_called_once()
-        call_args = mock_send_slack.call_args[0]
-        assert call_args[0] == sample_settings
-        assert isinstance(call_args[1], str)
-        assert "Problema detectado" in call_args[1]
+        assert checker._slack_queue.empty()
+        checker._slack_session.post.assert_not_called()
 
@@ -14,8 +14,10 @@ from config import (
     load_settings,
     DEFAULT_TIMEZONE,
     DEFAULT_CHECK_INTERVAL_HOURS,
+    DEFAULT_LOAD_TEST_MAX_WORKERS,
     MIN_CHECK_INTERVAL_HOURS,
     MAX_CHECK_INTERVAL_HOURS,
+    _DOTENV_CACHE,
 )
 
 
@@ -45,6 +47,7 @@ class TestSettings:
         assert settings.SUCCESS_ORG_LABEL == "PREFEITURA MUNICIPAL DE JAPERI"
         assert settings.CHECK_INTERVAL_HOURS == DEFAULT_CHECK_INTERVAL_HOURS
         assert settings.TIMEZONE == DEFAULT_TIMEZONE
+        assert settings.LOAD_TEST_MAX_WORKERS == DEFAULT_LOAD_TEST_MAX_WORKERS
     
     def test_settings_immutable(self, temp_dir: Path):
         """Testa que Settings é imutável (frozen)."""
@@ -57,19 +60,53 @@ class TestSettings:
         with pytest.raises(Exception):  # frozen=True causa AttributeError
             settings.SITE_URL = "https://changed.com"
     
+    def test_settings_uses_slots(self, temp_dir: Path):
+        """Testa que Settings não tem __dict__ e mantém os campos derivados."""
+        settings = Settings(
+            SITE_URL="https://example.com",
+            PORTAL_URL="https://portal.example.com",
+            BASE_DIR=temp_dir / "relatorio"
+        )
+        
+        assert not hasattr(settings, "__dict__")
+        assert settings.FAIL_DIR == settings.BASE_DIR / "failures"
+        assert settings.tz.key == DEFAULT_TIMEZONE
+    
     def test_settings_directory_creation(self, temp_dir: Path):
-        """Testa criação automática de diretórios."""
+        """Testa criação de diretórios via ensure_dirs."""
         settings = Settings(
             SITE_URL="https://example.com",
             PORTAL_URL="https://portal.example.com",
             BASE_DIR=temp_dir / "relatorio"
         )
         
+        # A instanciação não toca o disco
+        assert not settings.BASE_DIR.exists()
+        
+        settings.ensure_dirs()
+        
         assert settings.FAIL_DIR.exists()
         assert settings.DAILY_DIR.exists()
         assert settings.MONTHLY_DIR.exists()
         assert settings.LOG_FILE.parent.exists()
     
+    def test_ensure_dirs_creates_only_missing(self, temp_dir: Path):
+        """Testa que ensure_dirs completa uma estrutura parcialmente criada."""
+        base_dir = temp_dir / "relatorio"
+        (base_dir / "daily").mkdir(parents=True)
+        settings = Settings(
+            SITE_URL="https://example.com",
+            PORTAL_URL="https://portal.example.com",
+            BASE_DIR=base_dir
+        )
+        
+        settings.ensure_dirs()
+        settings.ensure_dirs()  # Idempotente
+        
+        assert settings.FAIL_DIR.is_dir()
+        assert settings.DAILY_DIR.is_dir()
+        assert settings.MONTHLY_DIR.is_dir()
+    
     def test_settings_invalid_url(self, temp_dir: Path):
         """Testa validação de URL inválida."""
         with pytest.raises(ValueError, match="URL inválida"):
@@ -109,6 +146,20 @@ class TestSettings:
         )
         
         assert settings.SSL_EXPIRATION_WARNING_DAYS == 15
+    
+    def test_utc_offset_seconds_across_dst(self, temp_dir: Path):
+        """Testa que o offset em cache acompanha a mudança de horário de verão."""
+        settings = Settings(
+            SITE_URL="https://example.com",
+            PORTAL_URL="https://portal.example.com",
+            TIMEZONE="America/New_York",
+            BASE_DIR=temp_dir / "relatorio"
+        )
+        dst_start = 1710054000  # 2024-03-10 07:00 UTC (02:00 EST -> 03:00 EDT)
+        
+        assert settings.utc_offset_seconds(dst_start - 1) == -5 * 3600
+        assert settings.utc_offset_seconds(dst_start) == -4 * 3600
+        assert settings.utc_offset_seconds(dst_start - 1) == -5 * 3600
 
 
 class TestLoadSettings:
@@ -185,6 +236,61 @@ class TestLoadSettings:
         
         assert settings.CHECK_INTERVAL_HOURS == DEFAULT_CHECK_INTERVAL_HOURS
     
+    @patch('config.load_dotenv')
+    def test_load_settings_caches_dotenv(self, mock_load_dotenv, sample_env_file: Path):
+        """Testa que o .env só é relido quando o arquivo é modificado."""
+        mock_load_dotenv.return_value = True
+        os.environ["SITE_URL"] = "https://example.com"
+        os.environ["PORTAL_URL"] = "https://portal.example.com"
+        
+        load_settings(env_file=str(sample_env_file))
+        load_settings(env_file=str(sample_env_file))
+        assert mock_load_dotenv.call_count == 1
+        
+        stat = sample_env_file.stat()
+        os.utime(sample_env_file, (stat.st_atime, stat.st_mtime + 10))
+        load_settings(env_file=str(sample_env_file))
+        assert mock_load_dotenv.call_count == 2
+    
+    @patch('config.find_dotenv')
+    @patch('config.load_dotenv')
+    def test_load_settings_reloads_found_dotenv(
+        self,
+        mock_load_dotenv,
+        mock_find_dotenv,
+        sample_env_file: Path
+    ):
+        """Testa que o .env encontrado por find_dotenv é recarregado ao mudar."""
+        mock_load_dotenv.return_value = True
+        mock_find_dotenv.return_value = str(sample_env_file)
+        os.environ["SITE_URL"] = "https://example.com"
+        os.environ["PORTAL_URL"] = "https://portal.example.com"
+        
+        with patch.dict(_DOTENV_CACHE, clear=True):
+            load_settings()
+            load_settings()
+            assert mock_load_dotenv.call_count == 1
+            mock_load_dotenv.assert_called_with(str(sample_env_file))
+            
+            stat = sample_env_file.stat()
+            os.utime(sample_env_file, (stat.st_atime, stat.st_mtime + 10))
+            load_settings()
+            assert mock_load_dotenv.call_count == 2
+            assert list(_DOTENV_CACHE) == [None]
+    
+    def test_load_settings_use_uvloop(self, sample_env_file: Path):
+        """Testa a leitura da variável booleana USE_UVLOOP."""
+        settings = load_settings(env_file=str(sample_env_file))
+        assert settings.USE_UVLOOP is True
+        
+        with patch.dict(os.environ, {"USE_UVLOOP": "false"}):
+            settings = load_settings(env_file=str(sample_env_file))
+            assert settings.USE_UVLOOP is False
+        
+        with patch.dict(os.environ, {"USE_UVLOOP": "talvez"}):
+            with pytest.raises(ValueError, match=r"USE_UVLOOP"):
+                load_settings(env_file=str(sample_env_file))
+    
     def test_load_settings_invalid_file(self, temp_dir: Path):
         """Testa comportamento com arquivo .env inválido."""
         invalid_file = temp_dir / "invalid.env"
@@ -0,0 +1,120 @@
+"""
+Testes para o módulo dashboard.py.
+
+Testa o ciclo de vida do servidor, as rotas da API (ETag, gzip) e o
+streaming SSE do dashboard.
+"""
+import gzip
+import socket
+import urllib.request
+from unittest.mock import Mock, patch
+
+import pytest
+
+from config import Settings
+from dashboard import SSE_HEARTBEAT_EVENT, SSE_MAX_CLIENTS, HealthDashboard
+
+
+def _free_port() -> int:
+    """Retorna uma porta TCP livre na interface local."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def dashboard(sample_settings: Settings):
+    """Dashboard sobre um diretório temporário, parado ao fim do teste."""
+    instance = HealthDashboard(sample_settings, port=_free_port())
+    yield instance
+    instance.stop()
+
+
+class TestServerLifecycle:
+    """Testes para HealthDashboard.start e HealthDashboard.stop."""
+
+    def test_restart_on_same_port(self, dashboard: HealthDashboard):
+        """Testa que stop() libera a porta e encerra a thread do servidor."""
+        for _ in range(2):
+            dashboard.start()
+            url = f"http://127.0.0.1:{dashboard.port}/api/all"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                assert response.status == 200
+
+            thread = dashboard.thread
+            dashboard.stop()
+
+            assert not thread.is_alive()
+            assert dashboard.server is None
+
+
+class TestApiRoutes:
+    """Testes para as rotas da API."""
+
+    def test_api_all_before_start(self, dashboard: HealthDashboard):
+        """Testa /api/all sem start() (sem pool de agregação)."""
+        response = dashboard.app.test_client().get("/api/all")
+
+        assert response.status_code == 200
+        assert set(response.get_json()) == {"health", "history", "patterns"}
+
+    def test_etag_revalidation(self, dashboard: HealthDashboard):
+        """Testa que If-None-Match com o ETag atual responde 304 sem corpo."""
+        client = dashboard.app.test_client()
+        for path in ("/api/health", "/api/all"):
+            first = client.get(path)
+            etag = first.headers["ETag"]
+
+            revalidated = client.get(path, headers={"If-None-Match": etag})
+            assert revalidated.status_code == 304
+            assert revalidated.data == b""
+            assert revalidated.headers["ETag"] == etag
+
+            changed = client.get(path, headers={"If-None-Match": '"outro"'})
+            assert changed.status_code == 200
+            assert changed.data == first.data
+
+    def test_index_gzip_negotiation(self, dashboard: HealthDashboard):
+        """Testa que a página só é enviada comprimida quando o cliente aceita."""
+        client = dashboard.app.test_client()
+        plain = client.get("/")
+        compressed = client.get("/", headers={"Accept-Encoding": "gzip, br"})
+
+        assert "Content-Encoding" not in plain.headers
+        assert compressed.headers["Content-Encoding"] == "gzip"
+        assert compressed.headers["Vary"] == "Accept-Encoding"
+        assert gzip.decompress(compressed.data) == plain.data
+
+
+class TestEventStream:
+    """Testes para /api/stream (Server-Sent Events)."""
+
+    def test_stream_limit(self, dashboard: HealthDashboard):
+        """Testa o limite de streams simultâneos e a liberação das vagas."""
+        client = dashboard.app.test_client()
+        streams = [
+            client.get("/api/stream", buffered=False) for _ in range(SSE_MAX_CLIENTS)
+        ]
+        try:
+            assert all(stream.status_code == 200 for stream in streams)
+            assert client.get("/api/stream").status_code == 503
+
+            streams.pop().close()
+            streams.append(client.get("/api/stream", buffered=False))
+            assert streams[-1].status_code == 200
+        finally:
+            for stream in streams:
+                stream.close()
+
+    @patch('dashboard.SSE_POLL_INTERVAL_SECONDS', 0)
+    @patch('dashboard.SSE_HEARTBEAT_SECONDS', 0)
+    def test_heartbeat_is_comment(self, dashboard: HealthDashboard):
+        """Testa que, sem mudanças, o heartbeat é um comentário e não o estado."""
+        on_close = Mock()
+        events = dashboard._stream_events(on_close)
+
+        assert next(events).startswith(b"data: {")
+        assert next(events) == SSE_HEARTBEAT_EVENT
+
+        events.close()  # Cliente desconectado: o servidor fecha o gerador
+        on_close.assert_called_once()
@@ -0,0 +1,166 @@
+"""
+Testes para o módulo error_history.py.
+
+Testa gravação, leitura incremental e limpeza do histórico de erros.
+"""
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from config import Settings
+from error_history import ErrorHistory, ErrorSeverity, ErrorType
+
+
+def _write_records(path: Path, timestamps: List[datetime], ok: bool) -> None:
+    """Acrescenta registros com os timestamps dados diretamente ao arquivo."""
+    with open(path, "a", encoding="utf-8") as f:
+        for ts in timestamps:
+            f.write(json.dumps({
+                "timestamp": ts.isoformat(),
+                "error_type": ErrorType.HTTP_ERROR.value,
+                "severity": ErrorSeverity.WARNING.value,
+                "message": "falha",
+                "details": {},
+                "ok_ssl": ok,
+                "ok_http": ok,
+                "ok_playwright": ok,
+            }) + "\n")
+
+
+@pytest.fixture
+def history(sample_settings: Settings):
+    """Histórico de erros sobre um diretório temporário."""
+    with ErrorHistory(sample_settings) as instance:
+        yield instance
+
+
+class TestHistoryWrites:
+    """Testes para a gravação em segundo plano e a leitura incremental."""
+    
+    def test_record_then_read_through_flush(self, history: ErrorHistory):
+        """Testa que registros enfileirados são lidos em ordem após flush()."""
+        for i in range(50):
+            history.record_error(
+                ErrorType.HTTP_TIMEOUT, ErrorSeverity.WARNING, f"erro {i}", {"i": i}
+            )
+        history.flush()
+        
+        records = history._read_history(days_lookback=1)
+        assert [record["details"]["i"] for record in records] == list(range(50))
+    
+    def test_close_drains_queue(self, sample_settings: Settings):
+        """Testa que close() grava todos os registros ainda na fila."""
+        history = ErrorHistory(sample_settings)
+        for i in range(200):
+            history.record_error(ErrorType.HTTP_ERROR, ErrorSeverity.INFO, f"erro {i}", {})
+        history.close()
+        
+        lines = history.history_file.read_bytes().splitlines()
+        assert len(lines) == 200
+        assert json.loads(lines[-1])["message"] == "erro 199"
+    
+    def test_record_after_close_is_written(self, history: ErrorHistory):
+        """Testa que registros feitos após close() são gravados de imediato."""
+        history.record_error(ErrorType.HTTP_ERROR, ErrorSeverity.INFO, "antes", {})
+        history.close()
+        history.record_error(ErrorType.HTTP_ERROR, ErrorSeverity.INFO, "depois", {})
+        
+        lines = history.history_file.read_bytes().splitlines()
+        assert [json.loads(line)["message"] for line in lines] == ["antes", "depois"]
+    
+    def test_flush_returns_when_writer_exits(self, history: ErrorHistory):
+        """Testa que flush() não trava se a thread de escrita já terminou."""
+        history.record_error(ErrorType.HTTP_ERROR, ErrorSeverity.INFO, "antes", {})
+        writer = history._writer_thread
+        history._queue.put(None)
+        writer.join()
+        
+        # Marcador enfileirado depois do None: ninguém mais o libera
+        flusher = threading.Thread(target=history.flush)
+        flusher.start()
+        flusher.join(timeout=5)
+        
+        assert not flusher.is_alive()
+    
+    def test_torn_last_line_left_for_next_sync(self, history: ErrorHistory):
+        """Testa que uma linha incompleta só é lida quando terminar."""
+        now = datetime.now(history.settings.tz)
+        _write_records(history.history_file, [now], ok=False)
+        line = history.history_file.read_bytes()
+        with open(history.history_file, "ab") as f:
+            f.write(line[:20])
+        
+        assert len(history._read_history(days_lookback=1)) == 1
+        assert history._records_offset == len(line)
+        
+        with open(history.history_file, "ab") as f:
+            f.write(line[20:])
+        
+        assert len(history._read_history(days_lookback=1)) == 2
+        assert history._records_offset == 2 * len(line)
+    
+    def test_reset_on_inode_change(self, history: ErrorHistory):
+        """Testa que um arquivo substituído é relido do início."""
+        now = datetime.now(history.settings.tz)
+        _write_records(history.history_file, [now] * 3, ok=False)
+        assert history.get_reliability_score(days_lookback=1) == 0.0
+        
+        # Novo arquivo, maior que a posição já lida e com outro conteúdo
+        replacement = history.history_file.with_name("substituto.jsonl")
+        _write_records(replacement, [now] * 4, ok=True)
+        os.replace(replacement, history.history_file)
+        
+        assert history.get_reliability_score(days_lookback=1) == 100.0
+        assert len(history._read_history(days_lookback=1)) == 4
+
+
+class TestClearOldRecords:
+    """Testes para ErrorHistory.clear_old_records."""
+    
+    def test_removes_expired_records(self, history: ErrorHistory):
+        """Testa que só os registros anteriores ao corte são removidos."""
+        now = datetime.now(history.settings.tz)
+        _write_records(history.history_file, [now - timedelta(days=100)] * 3, ok=False)
+        _write_records(history.history_file, [now - timedelta(days=1)] * 2, ok=True)
+        
+        assert history.clear_old_records(days_to_keep=90) == 3
+        
+        lines = history.history_file.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 2
+        assert all(json.loads(line)["ok_http"] for line in lines)
+        assert history.clear_old_records(days_to_keep=90) == 0
+    
+    def test_compaction_replaces_file_for_other_readers(
+        self,
+        history: ErrorHistory,
+        sample_settings: Settings
+    ):
+        """Testa que outra instância (como a do dashboard) vê a limpeza."""
+        now = datetime.now(history.settings.tz)
+        _write_records(history.history_file, [now - timedelta(days=100)] * 101, ok=False)
+        _write_records(history.history_file, [now - timedelta(hours=2)] * 99, ok=True)
+        
+        with ErrorHistory(sample_settings) as reader:
+            reader.open_reader()
+            reader.get_reliability_score(days_lookback=365)
+            inode = history.history_file.stat().st_ino
+            
+            assert history.clear_old_records(days_to_keep=90) == 101
+            assert history.history_file.stat().st_ino != inode
+            assert not list(history.history_file.parent.glob("*.tmp"))
+            
+            # Novos registros deixam o arquivo maior que a posição já lida
+            # pelo leitor
+            _write_records(history.history_file, [now - timedelta(hours=1)] * 200, ok=False)
+            
+            with ErrorHistory(sample_settings) as fresh:
+                expected = fresh.get_reliability_score(days_lookback=365)
+            
+            assert expected == pytest.approx(99 / 299 * 100, abs=0.01)
+            assert reader.get_reliability_score(days_lookback=365) == expected
+            assert len(reader._read_history(365)) == 299
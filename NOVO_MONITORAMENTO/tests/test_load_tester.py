@@ -0,0 +1,166 @@
+"""
+Testes para o módulo load_tester.py.
+
+Testa a agregação das estatísticas do teste de carga (média, desvio
+padrão, percentis e erros).
+"""
+import random
+import statistics
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pytest
+
+from load_tester import (
+    HISTOGRAM_RELATIVE_ACCURACY,
+    LatencyHistogram,
+    LoadTestResult,
+    StatsAccumulator,
+)
+
+
+def _result(
+    response_time_ms: float,
+    success: bool = True,
+    error: Optional[str] = None,
+    ttfb_ms: float = 1.0
+) -> LoadTestResult:
+    """Cria o resultado de uma requisição com a latência dada."""
+    return LoadTestResult(
+        user_id=0,
+        request_number=0,
+        timestamp=0,
+        url="https://example.com",
+        status_code=200 if success else 500,
+        response_time_ms=response_time_ms,
+        ttfb_ms=ttfb_ms,
+        error=error,
+        success=success,
+    )
+
+
+def _finalize(accumulator: StatsAccumulator) -> dict:
+    """Finaliza o acumulador para um teste de 10 segundos."""
+    start = datetime(2024, 1, 15, 10, 0, 0)
+    return accumulator.finalize(start, start + timedelta(seconds=10))
+
+
+class TestStatsAccumulator:
+    """Testes para a classe StatsAccumulator."""
+    
+    def test_mean_and_stddev(self):
+        """Testa média e desvio padrão (Welford) contra o módulo statistics."""
+        rng = random.Random(42)
+        latencies = [rng.uniform(5, 500) for _ in range(1000)]
+        accumulator = StatsAccumulator(reservoir_size=100)
+        for latency in latencies:
+            accumulator.add(_result(latency))
+        
+        latency_stats = _finalize(accumulator)["latency"]
+        
+        assert latency_stats["avg_ms"] == round(statistics.mean(latencies), 2)
+        assert latency_stats["stddev_ms"] == round(statistics.stdev(latencies), 2)
+        assert latency_stats["min_ms"] == round(min(latencies), 2)
+        assert latency_stats["max_ms"] == round(max(latencies), 2)
+    
+    def test_reservoir_percentiles_exact_below_size(self):
+        """Testa que os percentis são exatos enquanto cabem no reservatório."""
+        rng = random.Random(7)
+        latencies = [rng.expovariate(1 / 80) for _ in range(500)]
+        accumulator = StatsAccumulator(reservoir_size=1000)
+        for latency in latencies:
+            accumulator.add(_result(latency))
+        
+        latency_stats = _finalize(accumulator)["latency"]
+        ordered = sorted(latencies)
+        
+        for name, p in StatsAccumulator.PERCENTILES.items():
+            assert latency_stats[name] == round(ordered[int(len(ordered) * p)], 2)
+    
+    def test_reservoir_keeps_bounded_sample(self):
+        """Testa que o reservatório não passa do tamanho configurado."""
+        accumulator = StatsAccumulator(reservoir_size=50)
+        for i in range(1000):
+            accumulator.add(_result(float(i)))
+        
+        assert len(accumulator._reservoir) == 50
+        assert accumulator.total == 1000
+    
+    def test_histogram_percentiles_bimodal(self):
+        """Testa percentis sem reservatório em uma mistura bimodal 11/1000 ms."""
+        latencies = [1000.0] * 300 + [11.0] * 700  # Lentas primeiro (aquecimento)
+        accumulator = StatsAccumulator(reservoir_size=0)
+        for latency in latencies:
+            accumulator.add(_result(latency))
+        
+        latency_stats = _finalize(accumulator)["latency"]
+        
+        assert latency_stats["p50_ms"] == pytest.approx(11.0, rel=HISTOGRAM_RELATIVE_ACCURACY)
+        assert latency_stats["p95_ms"] == pytest.approx(1000.0, rel=HISTOGRAM_RELATIVE_ACCURACY)
+        assert latency_stats["p99_ms"] == pytest.approx(1000.0, rel=HISTOGRAM_RELATIVE_ACCURACY)
+    
+    def test_error_breakdown(self):
+        """Testa a contagem de falhas por mensagem de erro."""
+        accumulator = StatsAccumulator()
+        accumulator.add(_result(10.0))
+        accumulator.add(_result(30_000.0, success=False, error="Timeout (https://example.com)"))
+        accumulator.add(_result(30_000.0, success=False, error="Timeout (https://example.com)"))
+        accumulator.add(_result(5.0, success=False))
+        
+        stats = _finalize(accumulator)
+        
+        assert stats["error_breakdown"] == {"Timeout (https://example.com)": 2, "Unknown": 1}
+        assert stats["failed_requests"] == 3
+        assert stats["error_rate"] == 75.0
+    
+    def test_finalize_schema(self):
+        """Testa as chaves e valores agregados do resultado final."""
+        accumulator = StatsAccumulator(reservoir_size=10)
+        accumulator.add(_result(10.0, ttfb_ms=2.0))
+        accumulator.add(_result(30.0, ttfb_ms=4.0))
+        
+        stats = _finalize(accumulator)
+        
+        assert stats["test_type"] == "load"
+        assert stats["total_requests"] == 2
+        assert stats["successful_requests"] == 2
+        assert stats["success_rate"] == 100.0
+        assert stats["duration_seconds"] == 10.0
+        assert stats["throughput_rps"] == 0.2
+        assert set(stats["latency"]) == {
+            "min_ms", "max_ms", "avg_ms", "stddev_ms", "p50_ms", "p95_ms", "p99_ms"
+        }
+        assert stats["latency"]["avg_ms"] == 20.0
+        assert stats["ttfb"] == {"avg_ms": 3.0, "min_ms": 2.0, "max_ms": 4.0}
+    
+    def test_finalize_without_results(self):
+        """Testa o resultado de um teste sem requisições."""
+        assert _finalize(StatsAccumulator()) == {"error": "No results"}
+
+
+class TestLatencyHistogram:
+    """Testes para a classe LatencyHistogram."""
+    
+    def test_quantiles_within_relative_accuracy(self):
+        """Testa o erro relativo dos quantis em uma distribuição contínua."""
+        rng = random.Random(3)
+        latencies = [rng.lognormvariate(4, 1) for _ in range(10_000)]
+        histogram = LatencyHistogram()
+        for latency in latencies:
+            histogram.add(latency)
+        
+        ordered = sorted(latencies)
+        for p in (0.5, 0.9, 0.95, 0.99):
+            exact = ordered[int(len(ordered) * p)]
+            assert histogram.quantile(p) == pytest.approx(exact, rel=HISTOGRAM_RELATIVE_ACCURACY)
+    
+    def test_zero_and_empty(self):
+        """Testa latências nulas e o histograma vazio."""
+        histogram = LatencyHistogram()
+        assert histogram.quantile(0.5) == 0.0
+        
+        for latency in (0.0, 0.0, 0.0, 50.0):
+            histogram.add(latency)
+        
+        assert histogram.quantile(0.5) == 0.0
+        assert histogram.quantile(0.99) == pytest.approx(50.0, rel=HISTOGRAM_RELATIVE_ACCURACY)